@@ -1,3 +1,5 @@
 """Database Package"""
 from .db_manager import db
-__all__ = ['db']
+from .async_db import adb
+from .auksion_store import auksion_store
+__all__ = ['db', 'adb', 'auksion_store']
@@ -0,0 +1,203 @@
+"""
+Async Database Manager
+DatabaseManager metodlarini alohida thread'larda bajaradi —
+aiogram event loop SQLite so'rovlari vaqtida to'xtab qolmaydi.
+Yozish amallari bitta navbat orqali yagona writer thread'ga yuboriladi
+va guruhlab commit qilinadi (group commit).
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, List, Dict, Any
+
+from .config import DB_WRITE_BATCH_SIZE, DB_WRITE_BATCH_DELAY
+from .db_manager import DatabaseManager, Page, db
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabaseManager:
+    """DatabaseManager API'sining async ko'rinishi (await bilan chaqiriladi)"""
+
+    def __init__(
+        self,
+        manager: DatabaseManager,
+        write_batch_size: int = DB_WRITE_BATCH_SIZE,
+        write_batch_delay: float = DB_WRITE_BATCH_DELAY,
+    ):
+        self.manager = manager
+        self.write_batch_size = max(1, write_batch_size)
+        self.write_batch_delay = write_batch_delay
+        # O'qish: thread soni pool o'lchamiga teng — har bir thread bitta connection ishlatadi
+        self._executor = ThreadPoolExecutor(
+            max_workers=manager.pool.size,
+            thread_name_prefix="db",
+        )
+        # Yozish: yagona writer thread (SQLite bir vaqtda bitta yozuvchiga ruxsat beradi)
+        self._writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+
+    async def _run(self, func, *args, **kwargs):
+        """Sinxron metodni executor thread'da bajarish"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def _write(self, func, *args, **kwargs):
+        """Yozish amalini navbatga qo'yish va commit bo'lishini kutish"""
+        if self._writer_task is None or self._writer_task.done():
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._writer_loop(), name="db-writer")
+        future = asyncio.get_running_loop().create_future()
+        await self._write_queue.put((partial(func, *args, **kwargs), future))
+        return await future
+
+    async def _writer_loop(self):
+        """Navbatdan amallarni yig'ib, bitta transaction bilan yozish"""
+        loop = asyncio.get_running_loop()
+        queue = self._write_queue
+        while True:
+            batch = [await queue.get()]
+            if self.write_batch_delay > 0:
+                # Qisqa oyna — bir vaqtda kelgan yozuvlar bitta commitga tushadi
+                await asyncio.sleep(self.write_batch_delay)
+            while len(batch) < self.write_batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            operations = [operation for operation, _ in batch]
+            try:
+                results = await loop.run_in_executor(
+                    self._writer_executor, self.manager.execute_batch, operations
+                )
+            except Exception as e:
+                logger.error(f"❌ Yozish navbatida xato ({len(batch)} ta amal): {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), (result, error) in zip(batch, results):
+                    if future.done():
+                        continue
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(result)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def close(self):
+        """Navbatdagi yozuvlarni yakunlab, executorlar va poolni yopish"""
+        if self._writer_task is not None:
+            await self._write_queue.join()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._writer_executor.shutdown)
+        await loop.run_in_executor(None, self._executor.shutdown)
+        self.manager.close()
+
+    # ============================================================================
+    # KO'CHMAS MULK METODLARI
+    # ============================================================================
+
+    async def add_kochmas_mulk(self, data: Dict[str, Any]) -> int:
+        return await self._write(self.manager.add_kochmas_mulk, data)
+
+    async def get_kochmas_mulk_list(self, **filters) -> List[Dict[str, Any]]:
+        return await self._run(self.manager.get_kochmas_mulk_list, **filters)
+
+    async def get_kochmas_mulk_page(self, **filters) -> Page:
+        return await self._run(self.manager.get_kochmas_mulk_page, **filters)
+
+    async def get_kochmas_mulk_by_id(self, object_id: int) -> Optional[Dict[str, Any]]:
+        return await self._run(self.manager.get_kochmas_mulk_by_id, object_id)
+
+    async def get_user_kochmas_mulk(self, user_id: int) -> List[Dict[str, Any]]:
+        return await self._run(self.manager.get_user_kochmas_mulk, user_id)
+
+    async def get_all_kochmas(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        return await self._run(self.manager.get_all_kochmas, limit, offset)
+
+    async def get_all_kochmas_page(self, **options) -> Page:
+        return await self._run(self.manager.get_all_kochmas_page, **options)
+
+    async def update_kochmas_mulk(self, object_id: int, data: Dict[str, Any]) -> bool:
+        return await self._write(self.manager.update_kochmas_mulk, object_id, data)
+
+    async def delete_kochmas_mulk(self, object_id: int) -> bool:
+        return await self._write(self.manager.delete_kochmas_mulk, object_id)
+
+    # ============================================================================
+    # IJARA METODLARI
+    # ============================================================================
+
+    async def add_ijara(self, data: Dict[str, Any]) -> int:
+        return await self._write(self.manager.add_ijara, data)
+
+    async def get_ijara_list(self, **filters) -> List[Dict[str, Any]]:
+        return await self._run(self.manager.get_ijara_list, **filters)
+
+    async def get_ijara_page(self, **filters) -> Page:
+        return await self._run(self.manager.get_ijara_page, **filters)
+
+    async def get_ijara_by_id(self, object_id: int) -> Optional[Dict[str, Any]]:
+        return await self._run(self.manager.get_ijara_by_id, object_id)
+
+    async def get_user_ijara(self, user_id: int) -> List[Dict[str, Any]]:
+        return await self._run(self.manager.get_user_ijara, user_id)
+
+    async def get_all_ijara(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        return await self._run(self.manager.get_all_ijara, limit, offset)
+
+    async def get_all_ijara_page(self, **options) -> Page:
+        return await self._run(self.manager.get_all_ijara_page, **options)
+
+    async def update_ijara(self, object_id: int, data: Dict[str, Any]) -> bool:
+        return await self._write(self.manager.update_ijara, object_id, data)
+
+    async def delete_ijara(self, object_id: int) -> bool:
+        return await self._write(self.manager.delete_ijara, object_id)
+
+    # ============================================================================
+    # UMUMIY METODLAR
+    # ============================================================================
+
+    async def search_property_by_id(self, object_id: int) -> Optional[Dict[str, Any]]:
+        return await self._run(self.manager.search_property_by_id, object_id)
+
+    async def deactivate_object(self, table: str, object_id: int) -> bool:
+        return await self._write(self.manager.deactivate_object, table, object_id)
+
+    async def get_total_users(self) -> int:
+        return await self._run(self.manager.get_total_users)
+
+    async def get_statistics(self) -> Dict[str, int]:
+        return await self._run(self.manager.get_statistics)
+
+    # ==========================================================================
+    # Favorites (sevimlilar) methods
+    # ==========================================================================
+
+    async def add_favorite(self, user_id: int, object_id: int, object_type: str) -> bool:
+        return await self._write(self.manager.add_favorite, user_id, object_id, object_type)
+
+    async def remove_favorite(self, user_id: int, object_id: int, object_type: str) -> bool:
+        return await self._write(self.manager.remove_favorite, user_id, object_id, object_type)
+
+    async def is_favorite(self, user_id: int, object_id: int, object_type: str) -> bool:
+        return await self._run(self.manager.is_favorite, user_id, object_id, object_type)
+
+    async def get_user_favorites(self, user_id: int, object_type: str) -> List[Dict[str, Any]]:
+        return await self._run(self.manager.get_user_favorites, user_id, object_type)
+
+
+# Global async database instance
+adb = AsyncDatabaseManager(db)
@@ -0,0 +1,542 @@
+"""
+Auksion foydalanuvchi ma'lumotlari uchun doimiy saqlash
+(sevimlilar, arizalar, bildirishnomalar).
+
+O'qish xotiradan (handlers/auksion_v2/models.py MemoryStorage) bajariladi,
+bu yerdagi jadvallar faqat ishga tushganda yuklanadi.
+Yozish — write-behind: amallar navbatga qo'yiladi va alohida thread
+ularni guruhlab, bitta transaction bilan SQLite ga yozadi.
+
+auksion_lots — katalog nusxasi (handlers/auksion_v2/sync.py to'ldiradi):
+ro'yxat sahifalari upstream o'rniga shu jadvaldan o'qiladi.
+
+auksion_file_ids — rasm file_hash -> Telegram file_id: bir marta yuborilgan
+rasm keyingi safar upstreamdan qayta yuklanmasdan file_id orqali yuboriladi.
+
+Bot olgan har bir lot FTS5 indeksiga ham yoziladi (nomi, tavsifi, manzili,
+xususiyatlari) — matn bo'yicha qidiruv upstreamga bormasdan bajariladi.
+"""
+import logging
+import queue
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .config import (
+    DB_PATH, DB_PRAGMAS, DB_WRITE_BATCH_SIZE, AUKSION_FLUSH_INTERVAL, AUKSION_INDEX_MAX_AGE,
+    AUKSION_INDEX_SIGNATURES,
+)
+from .pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS auksion_favorites (
+        user_id INTEGER NOT NULL,
+        lot_id INTEGER NOT NULL,
+        added_at TEXT NOT NULL,
+        notify_enabled INTEGER DEFAULT 1,
+        PRIMARY KEY (user_id, lot_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS auksion_applications (
+        user_id INTEGER NOT NULL,
+        lot_id INTEGER NOT NULL,
+        lot_name TEXT,
+        lot_price REAL,
+        current_price REAL,
+        name TEXT,
+        phone TEXT,
+        applied_at TEXT NOT NULL,
+        status TEXT DEFAULT 'pending',
+        PRIMARY KEY (user_id, lot_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS auksion_notifications (
+        user_id INTEGER NOT NULL,
+        lot_id INTEGER NOT NULL,
+        notify_start INTEGER DEFAULT 1,
+        notify_end INTEGER DEFAULT 1,
+        notify_outbid INTEGER DEFAULT 1,
+        notify_winner INTEGER DEFAULT 1,
+        PRIMARY KEY (user_id, lot_id)
+    )
+    """,
+    # PRIMARY KEY (user_id, lot_id) user_id bo'yicha qidiruvni qoplaydi,
+    # lot_id bo'yicha alohida indeks kerak
+    "CREATE INDEX IF NOT EXISTS idx_auksion_favorites_lot ON auksion_favorites(lot_id)",
+    "CREATE INDEX IF NOT EXISTS idx_auksion_applications_lot ON auksion_applications(lot_id)",
+    "CREATE INDEX IF NOT EXISTS idx_auksion_notifications_lot ON auksion_notifications(lot_id)",
+    # Katalog: bitta lot bir nechta (guruh, kategoriya) juftligida uchrashi mumkin
+    """
+    CREATE TABLE IF NOT EXISTS auksion_lots (
+        groups_id TEXT NOT NULL,
+        categories_id INTEGER NOT NULL,
+        lot_id INTEGER NOT NULL,
+        region_id INTEGER,
+        title TEXT,
+        lot_number TEXT,
+        category TEXT,
+        status TEXT,
+        start_price REAL,
+        current_price REAL,
+        fingerprint INTEGER NOT NULL,
+        sort_key INTEGER NOT NULL,
+        seen_at INTEGER NOT NULL,
+        auction_at INTEGER,
+        PRIMARY KEY (groups_id, categories_id, lot_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS auksion_sync_state (
+        groups_id TEXT NOT NULL,
+        categories_id INTEGER NOT NULL,
+        region_id INTEGER NOT NULL,
+        synced_at INTEGER NOT NULL,
+        full_synced_at INTEGER,
+        PRIMARY KEY (groups_id, categories_id, region_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS auksion_file_ids (
+        file_hash TEXT PRIMARY KEY,
+        file_id TEXT NOT NULL,
+        saved_at INTEGER NOT NULL
+    )
+    """,
+    # Ro'yxat sahifalari: viloyat bo'yicha va barcha viloyatlar — ikkalasi ham indeks tartibida
+    "CREATE INDEX IF NOT EXISTS idx_auksion_lots_region "
+    "ON auksion_lots(groups_id, categories_id, region_id, sort_key, lot_id)",
+    "CREATE INDEX IF NOT EXISTS idx_auksion_lots_sort ON auksion_lots(groups_id, categories_id, sort_key, lot_id)",
+]
+
+# Lotlar indeksi. rowid = lot_id; indekslangan ustunlar normallashtirilgan matn,
+# UNINDEXED ustunlar natijani ko'rsatish uchun (title — asl nomi)
+FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS auksion_lots_fts USING fts5(
+        name, description, location, properties,
+        title UNINDEXED, lot_number UNINDEXED, category UNINDEXED, status UNINDEXED,
+        start_price UNINDEXED, current_price UNINDEXED, indexed_at UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+"""
+
+# bm25 og'irliklari: nomidagi moslik tavsifdagidan muhimroq
+FTS_RANK = "bm25(auksion_lots_fts, 10.0, 2.0, 4.0, 1.0)"
+
+# O'zgarmagan lotning indexed_at qiymati max_age ning shu ulushidan eskirsa yangilanadi
+_INDEX_REFRESH_FRACTION = 0.25
+
+# O'zbek lotin yozuvidagi tutuq belgisi (o', g', ko'p) — so'zni bo'lmasligi uchun olib tashlanadi
+_APOSTROPHES = re.compile(r"['`ʻʼ‘’]")
+_MAX_QUERY_TERMS = 8
+
+
+def normalize_search_text(text: str) -> str:
+    """Indekslash va qidiruv uchun matnni bir xil ko'rinishga keltirish"""
+    return _APOSTROPHES.sub("", text or "").lower()
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Foydalanuvchi so'rovidan FTS5 MATCH ifodasi: har bir so'z prefiks bo'yicha, barchasi (AND)"""
+    terms = re.findall(r"\w+", normalize_search_text(query))[:_MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def lot_fingerprint(lot: Any) -> int:
+    """Ro'yxatda ko'rinadigan maydonlar imzosi (jarayonlar orasida barqaror)"""
+    key = (lot.name, lot.lot_number, lot.status, lot.category, lot.start_price, lot.current_price)
+    return zlib.crc32(repr(key).encode("utf-8"))
+
+
+# Navbat elementi: (sql, params); None — worker to'xtashi uchun signal
+_Write = Tuple[str, Tuple[Any, ...]]
+
+
+class AuksionStore:
+    """Auksion sevimlilar/arizalar/bildirishnomalar uchun SQLite backend (write-behind)"""
+
+    def __init__(
+        self,
+        db_path: str = DB_PATH,
+        batch_size: int = DB_WRITE_BATCH_SIZE,
+        flush_interval: float = AUKSION_FLUSH_INTERVAL,
+    ):
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.pool = ConnectionPool(db_path, size=2, pragmas=DB_PRAGMAS)
+        self._queue: "queue.Queue[Optional[_Write]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+        self.fts_enabled = False
+        # lot_id -> (oxirgi indekslangan matn imzosi, indexed_at); o'zgarmagan lot qayta yozilmaydi.
+        # AUKSION_INDEX_SIGNATURES bilan cheklangan LRU — chiqib ketgan lot keyingi safar qayta yoziladi xolos
+        self._indexed: "OrderedDict[int, Tuple[int, int]]" = OrderedDict()
+        self._init_tables()
+
+    def _init_tables(self):
+        with self.pool.connection() as conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+            self._migrate_catalog(conn)
+            try:
+                conn.execute(FTS_SCHEMA)
+                self.fts_enabled = True
+            except sqlite3.OperationalError as e:
+                # SQLite FTS5 siz yig'ilgan — lokal qidiruv o'chadi, upstream ishlaydi
+                logger.warning(f"⚠️ FTS5 mavjud emas, lokal qidiruv o'chirildi: {e}")
+        logger.info("✅ Auksion jadvallari tayyor")
+
+    @staticmethod
+    def _migrate_catalog(conn: sqlite3.Connection):
+        """auksion_lots.auction_at ustunini eski jadvalga qo'shish (migration)"""
+        try:
+            conn.execute("ALTER TABLE auksion_lots ADD COLUMN auction_at INTEGER")
+            logger.info("✅ Migration: auksion_lots.auction_at ustuni qo'shildi")
+        except sqlite3.OperationalError:
+            pass  # Ustun allaqachon mavjud
+
+    # ------------------------------------------------------------------
+    # Yuklash (ishga tushganda)
+    # ------------------------------------------------------------------
+
+    def _fetch_all(self, query: str) -> List[sqlite3.Row]:
+        with self.pool.connection() as conn:
+            conn.row_factory = sqlite3.Row
+            return conn.execute(query).fetchall()
+
+    def load_favorites(self) -> List[sqlite3.Row]:
+        return self._fetch_all("SELECT * FROM auksion_favorites ORDER BY added_at")
+
+    def load_applications(self) -> List[sqlite3.Row]:
+        return self._fetch_all("SELECT * FROM auksion_applications ORDER BY applied_at")
+
+    def load_notifications(self) -> List[sqlite3.Row]:
+        return self._fetch_all("SELECT * FROM auksion_notifications")
+
+    def load_file_ids(self) -> List[sqlite3.Row]:
+        return self._fetch_all("SELECT file_hash, file_id FROM auksion_file_ids")
+
+    # ------------------------------------------------------------------
+    # Yozish (navbatga)
+    # ------------------------------------------------------------------
+
+    def upsert_favorite(self, favorite):
+        self._enqueue(
+            "INSERT OR REPLACE INTO auksion_favorites (user_id, lot_id, added_at, notify_enabled) "
+            "VALUES (?, ?, ?, ?)",
+            (favorite.user_id, favorite.lot_id, favorite.added_at.isoformat(), int(favorite.notify_enabled)),
+        )
+
+    def delete_favorite(self, user_id: int, lot_id: int):
+        self._enqueue("DELETE FROM auksion_favorites WHERE user_id = ? AND lot_id = ?", (user_id, lot_id))
+
+    def upsert_application(self, app):
+        self._enqueue(
+            "INSERT OR REPLACE INTO auksion_applications "
+            "(user_id, lot_id, lot_name, lot_price, current_price, name, phone, applied_at, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (app.user_id, app.lot_id, app.lot_name, app.lot_price, app.current_price,
+             app.name, app.phone, app.applied_at.isoformat(), app.status),
+        )
+
+    def update_application_price(self, lot_id: int, current_price: float):
+        self._enqueue(
+            "UPDATE auksion_applications SET current_price = ? WHERE lot_id = ?",
+            (current_price, lot_id),
+        )
+
+    def upsert_notification(self, notification):
+        self._enqueue(
+            "INSERT OR REPLACE INTO auksion_notifications "
+            "(user_id, lot_id, notify_start, notify_end, notify_outbid, notify_winner) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (notification.user_id, notification.lot_id, int(notification.notify_start),
+             int(notification.notify_end), int(notification.notify_outbid), int(notification.notify_winner)),
+        )
+
+    def upsert_file_id(self, file_hash: str, file_id: str):
+        self._enqueue(
+            "INSERT OR REPLACE INTO auksion_file_ids (file_hash, file_id, saved_at) VALUES (?, ?, ?)",
+            (file_hash, file_id, int(time.time())),
+        )
+
+    def delete_file_id(self, file_hash: str):
+        self._enqueue("DELETE FROM auksion_file_ids WHERE file_hash = ?", (file_hash,))
+
+    def index_lots(self, lots: Iterable[Any], max_age: float = AUKSION_INDEX_MAX_AGE):
+        """
+        Lotlarni qidiruv indeksiga qo'shish/yangilash. O'zgarmagan lot qayta yozilmaydi,
+        lekin indexed_at max_age ning bir qismidan eskirsa yangilanadi — hali faol lot
+        qidiruvdan (search_lots, indexed_at filtri) tushib qolmaydi.
+        """
+        if not self.fts_enabled:
+            return
+        now = int(time.time())
+        refresh_before = now - int(max_age * _INDEX_REFRESH_FRACTION)
+        for lot in lots:
+            properties = " ".join(lot.property_values())
+            row = (
+                normalize_search_text(lot.name), normalize_search_text(lot.description),
+                normalize_search_text(lot.location), normalize_search_text(properties),
+                lot.name, lot.lot_number, lot.category, lot.status, lot.start_price, lot.current_price,
+            )
+            signature = hash(row)
+            indexed = self._indexed.get(lot.id)
+            if indexed is not None and indexed[0] == signature:
+                self._indexed.move_to_end(lot.id)
+                if indexed[1] >= refresh_before:
+                    continue
+                self._indexed[lot.id] = (signature, now)
+                self._enqueue("UPDATE auksion_lots_fts SET indexed_at = ? WHERE rowid = ?", (now, lot.id))
+                continue
+            self._indexed[lot.id] = (signature, now)
+            self._indexed.move_to_end(lot.id)
+            if len(self._indexed) > AUKSION_INDEX_SIGNATURES:
+                self._indexed.popitem(last=False)
+            self._enqueue(
+                "INSERT OR REPLACE INTO auksion_lots_fts (rowid, name, description, location, properties, "
+                "title, lot_number, category, status, start_price, current_price, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (lot.id, *row, now),
+            )
+
+    def prune_lot_index(self, max_age: float = AUKSION_INDEX_MAX_AGE):
+        """Uzoq vaqt yangilanmagan (tugagan) lotlarni indeksdan o'chirish"""
+        if self.fts_enabled:
+            self._indexed.clear()
+            self._enqueue("DELETE FROM auksion_lots_fts WHERE indexed_at < ?", (int(time.time() - max_age),))
+
+    def _enqueue(self, sql: str, params: Tuple[Any, ...]):
+        self._ensure_worker()
+        self._queue.put((sql, params))
+
+    # ------------------------------------------------------------------
+    # Qidiruv (FTS5)
+    # ------------------------------------------------------------------
+
+    def search_lots(self, query: str, limit: int = 50, max_age: float = AUKSION_INDEX_MAX_AGE) -> List[sqlite3.Row]:
+        """
+        Indeksdan bm25 bo'yicha saralangan lotlar (eng mosi birinchi).
+        Yozilmagan navbat hisobga olinmaydi — yangi lot bir necha yuz ms dan keyin topiladi.
+        """
+        match = build_match_query(query)
+        if not self.fts_enabled or match is None:
+            return []
+        with self.pool.connection() as conn:
+            conn.row_factory = sqlite3.Row
+            return conn.execute(
+                f"SELECT rowid AS lot_id, * FROM auksion_lots_fts "
+                f"WHERE auksion_lots_fts MATCH ? AND indexed_at >= ? "
+                f"ORDER BY {FTS_RANK} LIMIT ?",
+                (match, int(time.time() - max_age), limit),
+            ).fetchall()
+
+    # ------------------------------------------------------------------
+    # Katalog (sinxronizatsiya fonda, executor thread'da chaqiriladi)
+    # ------------------------------------------------------------------
+
+    def save_catalog_page(
+        self, groups_id: str, categories_id: int, region_id: int, lots: List[Any], sort_base: int,
+    ) -> int:
+        """
+        Upstream sahifasini katalogga yozish (bitta transaction).
+        Yangi lotlar sort_key = sort_base - tartib raqami oladi (upstream tartibi saqlanadi),
+        mavjudlari o'z o'rnida qoladi. Yangi yoki o'zgargan lotlar sonini qaytaradi.
+        """
+        if not lots:
+            return 0
+        now = int(time.time())
+        placeholders = ",".join("?" * len(lots))
+        with self.pool.connection() as conn:
+            known = dict(conn.execute(
+                f"SELECT lot_id, fingerprint FROM auksion_lots "
+                f"WHERE groups_id = ? AND categories_id = ? AND lot_id IN ({placeholders})",
+                (groups_id, categories_id, *(lot.id for lot in lots)),
+            ).fetchall())
+            changed = 0
+            rows = []
+            for position, lot in enumerate(lots):
+                fingerprint = lot_fingerprint(lot)
+                if known.get(lot.id) != fingerprint:
+                    changed += 1
+                auction_time = lot.auction_end or lot.auction_start
+                rows.append((
+                    groups_id, categories_id, lot.id, region_id, lot.name, lot.lot_number, lot.category,
+                    lot.status, lot.start_price, lot.current_price, fingerprint, sort_base - position, now,
+                    int(auction_time.timestamp()) if auction_time else None,
+                ))
+            conn.executemany(
+                "INSERT INTO auksion_lots (groups_id, categories_id, lot_id, region_id, title, lot_number, "
+                "category, status, start_price, current_price, fingerprint, sort_key, seen_at, auction_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (groups_id, categories_id, lot_id) DO UPDATE SET "
+                "region_id = excluded.region_id, title = excluded.title, lot_number = excluded.lot_number, "
+                "category = excluded.category, status = excluded.status, start_price = excluded.start_price, "
+                "current_price = excluded.current_price, fingerprint = excluded.fingerprint, "
+                "seen_at = excluded.seen_at, auction_at = excluded.auction_at",
+                rows,
+            )
+        return changed
+
+    def finish_catalog_sync(
+        self, groups_id: str, categories_id: int, region_id: int, started_at: int, full: bool,
+        expire_before: int = 0,
+    ) -> int:
+        """
+        Bo'lim sinxronizatsiyasini yakunlash; o'chirilgan lotlar sonini qaytaradi.
+        To'liq aylanishda shu vaqt ichida ko'rinmagan (tugagan/o'chirilgan) lotlar o'chiriladi;
+        har qanday aylanishda — expire_before dan beri upstream ro'yxatida ko'rinmaganlar.
+        """
+        with self.pool.connection() as conn:
+            cutoff = max(started_at, expire_before) if full else expire_before
+            removed = conn.execute(
+                "DELETE FROM auksion_lots WHERE groups_id = ? AND categories_id = ? "
+                "AND region_id = ? AND seen_at < ?",
+                (groups_id, categories_id, region_id, cutoff),
+            ).rowcount
+            conn.execute(
+                "INSERT INTO auksion_sync_state (groups_id, categories_id, region_id, synced_at, full_synced_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (groups_id, categories_id, region_id) DO UPDATE SET "
+                "synced_at = excluded.synced_at, "
+                "full_synced_at = COALESCE(excluded.full_synced_at, full_synced_at)",
+                (groups_id, categories_id, region_id, int(time.time()), started_at if full else None),
+            )
+        return removed
+
+    def load_sync_state(self) -> List[sqlite3.Row]:
+        return self._fetch_all("SELECT * FROM auksion_sync_state")
+
+    def catalog_page(
+        self, groups_id: str, categories_id: int, region_id: Optional[int], limit: int, offset: int,
+        min_seen_at: int = 0, inactive_statuses: Iterable[str] = (),
+    ) -> List[sqlite3.Row]:
+        """
+        Katalogdan ro'yxat sahifasi (region_id=None — barcha viloyatlar).
+        Savdosi o'tgan, faol bo'lmagan (inactive_statuses, kichik harflarda) va
+        min_seen_at dan beri upstreamda ko'rinmagan lotlar chiqarilmaydi.
+        """
+        where = "groups_id = ? AND categories_id = ?"
+        params: list = [groups_id, categories_id]
+        if region_id is not None:
+            where += " AND region_id = ?"
+            params.append(region_id)
+        where += " AND seen_at >= ? AND (auction_at IS NULL OR auction_at >= ?)"
+        params += [min_seen_at, int(time.time())]
+        inactive_statuses = list(inactive_statuses)
+        if inactive_statuses:
+            where += f" AND lower(COALESCE(status, '')) NOT IN ({','.join('?' * len(inactive_statuses))})"
+            params += inactive_statuses
+        with self.pool.connection() as conn:
+            conn.row_factory = sqlite3.Row
+            return conn.execute(
+                f"SELECT * FROM auksion_lots WHERE {where} "
+                f"ORDER BY sort_key DESC, lot_id DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+
+    # ------------------------------------------------------------------
+    # Write-behind worker
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="auksion-writer", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            # Qisqa oyna — ketma-ket kelgan yozuvlar bitta commitga tushadi
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._write_batch(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[_Write]):
+        try:
+            with self.pool.connection() as conn:
+                for sql, params in batch:
+                    conn.execute(sql, params)
+            self.written += len(batch)
+            return
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Auksion yozuvlari guruhi bajarilmadi ({len(batch)} ta), bittalab: {e}")
+
+        # Guruh yiqilsa — har birini alohida, xatoli amal boshqalarga ta'sir qilmaydi
+        for sql, params in batch:
+            try:
+                with self.pool.connection() as conn:
+                    conn.execute(sql, params)
+                self.written += 1
+            except sqlite3.Error as e:
+                self.failed += 1
+                logger.error(f"❌ Auksion yozuvi saqlanmadi: {e} | {sql[:60]}")
+
+    def flush(self):
+        """Navbatdagi barcha yozuvlar diskka tushguncha kutish"""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Navbatni yakunlab, worker va poolni yopish"""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        self.pool.close()
+        logger.info(f"🔒 Auksion store yopildi (yozildi: {self.written}, xato: {self.failed})")
+
+    def stats(self) -> dict:
+        return {
+            'pending': self._queue.qsize(),
+            'indexed_lots': len(self._indexed),
+            'written': self.written,
+            'failed': self.failed,
+        }
+
+
+def parse_timestamp(value: Optional[str]) -> datetime:
+    """isoformat() da saqlangan vaqtni qayta o'qish"""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.now()
+
+
+# Global instance
+auksion_store = AuksionStore()
@@ -0,0 +1,54 @@
+"""
+Database sozlamalari
+Qiymatlar .env dan olinadi, bo'lmasa standart qiymatlar ishlatiladi
+"""
+from os import getenv
+
+from dotenv import load_dotenv
+
+# Paket qaysi kirish nuqtasidan import qilinmasin (main.py, tools/), .env o'qilgan bo'ladi;
+# allaqachon o'rnatilgan muhit o'zgaruvchilari ustun
+load_dotenv()
+
+# Fayl
+DB_PATH = getenv("DB_PATH", "objects.db")
+
+# Connection pool
+DB_POOL_SIZE = int(getenv("DB_POOL_SIZE", 5))
+DB_POOL_TIMEOUT = float(getenv("DB_POOL_TIMEOUT", 10))          # bo'sh connection kutish (soniya)
+DB_HEALTH_CHECK_INTERVAL = float(getenv("DB_HEALTH_CHECK_INTERVAL", 60))  # soniya
+
+# SQLite PRAGMA sozlamalari (har bir yangi connectionga qo'llanadi)
+DB_JOURNAL_MODE = getenv("DB_JOURNAL_MODE", "WAL")       # o'quvchilar yozuvchini kutmaydi
+DB_SYNCHRONOUS = getenv("DB_SYNCHRONOUS", "NORMAL")      # WAL bilan xavfsiz va tez
+DB_BUSY_TIMEOUT_MS = int(getenv("DB_BUSY_TIMEOUT_MS", 5000))
+DB_CACHE_SIZE_KB = int(getenv("DB_CACHE_SIZE_KB", 16384))          # 16 MB sahifa keshi
+DB_MMAP_SIZE = int(getenv("DB_MMAP_SIZE", 64 * 1024 * 1024))       # 64 MB
+
+DB_PRAGMAS = {
+    "journal_mode": DB_JOURNAL_MODE,
+    "synchronous": DB_SYNCHRONOUS,
+    "busy_timeout": DB_BUSY_TIMEOUT_MS,
+    "cache_size": -DB_CACHE_SIZE_KB,   # manfiy qiymat = KiB
+    "mmap_size": DB_MMAP_SIZE,
+    "temp_store": "MEMORY",
+}
+
+# Yozish navbati (group commit)
+DB_WRITE_BATCH_SIZE = int(getenv("DB_WRITE_BATCH_SIZE", 64))     # bitta commitdagi max amallar
+DB_WRITE_BATCH_DELAY = float(getenv("DB_WRITE_BATCH_DELAY", 0.002))  # yig'ish oynasi (soniya)
+
+# Auksion sevimlilar/arizalar (write-behind navbati)
+AUKSION_FLUSH_INTERVAL = float(getenv("AUKSION_FLUSH_INTERVAL", 0.5))  # yig'ish oynasi (soniya)
+
+# Auksion lotlari bo'yicha lokal to'liq matnli qidiruv (FTS5)
+AUKSION_INDEX_MAX_AGE = int(getenv("AUKSION_INDEX_MAX_AGE", 7 * 24 * 3600))  # shundan eski lotlar qidirilmaydi (soniya)
+AUKSION_INDEX_SIGNATURES = int(getenv("AUKSION_INDEX_SIGNATURES", 50_000))  # xotiradagi lot imzolari (LRU)
+
+# FSM holatlari (database/fsm_storage.py)
+FSM_STORAGE = getenv("FSM_STORAGE", "sqlite").strip().lower()   # sqlite | redis | memory
+FSM_REDIS_URL = getenv("FSM_REDIS_URL", "redis://localhost:6379/0")
+FSM_STATE_TTL = int(getenv("FSM_STATE_TTL", 3 * 24 * 3600))   # shuncha o'zgarmagan holat tashlab ketilgan hisoblanadi (soniya)
+FSM_CACHE_MAX_ENTRIES = int(getenv("FSM_CACHE_MAX_ENTRIES", 10000))   # o'qish keshi (LRU)
+FSM_FLUSH_INTERVAL = float(getenv("FSM_FLUSH_INTERVAL", 0.5))         # yozuvlarni yig'ish oynasi (soniya)
+FSM_CLEANUP_INTERVAL = int(getenv("FSM_CLEANUP_INTERVAL", 3600))      # eskirgan holatlarni tozalash oralig'i (soniya)
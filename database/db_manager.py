@@ -5,22 +5,139 @@ Barcha ma'lumotlar bazasi operatsiyalari
 """
 import sqlite3
 import logging
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Callable, Tuple
+
+from .config import DB_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_HEALTH_CHECK_INTERVAL, DB_PRAGMAS
+from .pool import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
+# Schema indekslari versiyalar bo'yicha (PRAGMA user_version).
+# Yangi indeks qo'shish uchun yangi versiya raqami bilan ro'yxat qo'shing.
+SCHEMA_INDEXES = {
+    1: [
+        # get_kochmas_mulk_list / get_ijara_list: filtrlar + ORDER BY created_at
+        "CREATE INDEX IF NOT EXISTS idx_kochmas_list "
+        "ON kochmas_mulk(region, property_type, action_type, is_active, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_kochmas_list_district "
+        "ON kochmas_mulk(region, district, property_type, action_type, is_active, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_ijara_list "
+        "ON ijara(region, property_type, action_type, is_active, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_ijara_list_district "
+        "ON ijara(region, district, property_type, action_type, is_active, created_at)",
+        # get_user_kochmas_mulk / get_user_ijara
+        "CREATE INDEX IF NOT EXISTS idx_kochmas_user ON kochmas_mulk(user_id, is_active, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_ijara_user ON ijara(user_id, is_active, created_at)",
+        # get_all_kochmas / get_all_ijara (admin)
+        "CREATE INDEX IF NOT EXISTS idx_kochmas_created ON kochmas_mulk(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_ijara_created ON ijara(created_at)",
+        # get_user_favorites + e'lon bo'yicha teskari qidiruv
+        "CREATE INDEX IF NOT EXISTS idx_favorites_user ON favorites(user_id, object_type, added_at)",
+        "CREATE INDEX IF NOT EXISTS idx_favorites_object ON favorites(object_id, object_type)",
+    ],
+    2: [
+        # get_all_*_page(active_only=True): admin ro'yxati keyset sahifalash
+        "CREATE INDEX IF NOT EXISTS idx_kochmas_active_created ON kochmas_mulk(is_active, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_ijara_active_created ON ijara(is_active, created_at)",
+    ],
+}
+SCHEMA_VERSION = max(SCHEMA_INDEXES)
+
+# Page = (qatorlar, keyingi_cursor, oldingi_cursor)
+Page = Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]
+
+_CURSOR_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+_BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _to_base36(value: int) -> str:
+    digits = ""
+    while True:
+        value, rem = divmod(value, 36)
+        digits = _BASE36[rem] + digits
+        if not value:
+            return digits
+
+
+def encode_cursor(created_at: str, object_id: int) -> str:
+    """
+    (created_at, id) juftligini qisqa, shaffof bo'lmagan cursorga aylantirish.
+    Natija ~10 belgi: callback_data (64 bayt) ichiga bemalol sig'adi,
+    faqat [0-9a-z.] belgilardan iborat ("_" yo'q).
+    """
+    moment = datetime.strptime(str(created_at)[:19], _CURSOR_TIME_FORMAT).replace(tzinfo=timezone.utc)
+    return f"{_to_base36(int(moment.timestamp()))}.{_to_base36(int(object_id))}"
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """encode_cursor() ga teskari amal; noto'g'ri cursor uchun ValueError"""
+    ts_part, id_part = cursor.split(".")
+    moment = datetime.fromtimestamp(int(ts_part, 36), tz=timezone.utc)
+    return moment.strftime(_CURSOR_TIME_FORMAT), int(id_part, 36)
+
 
 class DatabaseManager:
     """Database bilan ishlash uchun asosiy klass"""
     
-    def __init__(self, db_path: str = "objects.db"):
+    def __init__(self, db_path: str = DB_PATH, pool_size: int = DB_POOL_SIZE):
         self.db_path = db_path
+        self.pool = ConnectionPool(
+            db_path,
+            size=pool_size,
+            timeout=DB_POOL_TIMEOUT,
+            health_check_interval=DB_HEALTH_CHECK_INTERVAL,
+            pragmas=DB_PRAGMAS,
+        )
+        # execute_batch() ichida metodlar shu thread'ning umumiy connectionini ishlatadi
+        self._local = threading.local()
         self.init_database()
     
     def get_connection(self):
-        """Database connection olish"""
-        return sqlite3.connect(self.db_path)
+        """
+        Pooldan connection olish (context manager).
+        Blok muvaffaqiyatli tugasa commit, xato bo'lsa rollback qilinadi
+        va connection poolga qaytariladi.
+        execute_batch() ichida esa umumiy transaction connectioni qaytariladi.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return nullcontext(conn)
+        return self.pool.connection()
+
+    @contextmanager
+    def _batch_connection(self):
+        with self.pool.connection() as conn:
+            self._local.conn = conn
+            try:
+                yield conn
+            finally:
+                self._local.conn = None
+
+    def execute_batch(self, operations: List[Callable[[], Any]]) -> List[Tuple[Any, Optional[BaseException]]]:
+        """
+        Bir nechta yozish amalini bitta transaction ichida bajarish (group commit).
+        Har bir amal SAVEPOINT bilan o'ralgan — bittasi xato bersa faqat o'zi bekor qilinadi.
+        Natija: har bir amal uchun (qiymat, xato) juftligi.
+        """
+        results = []
+        with self._batch_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for operation in operations:
+                conn.execute("SAVEPOINT write_op")
+                try:
+                    results.append((operation(), None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write_op")
+                    results.append((None, e))
+                conn.execute("RELEASE write_op")
+        return results
+
+    def close(self):
+        """Pooldagi barcha connectionlarni yopish (bot to'xtaganda)"""
+        self.pool.close()
     
     def init_database(self):
         """Database va jadvallarni yaratish"""
@@ -96,6 +213,7 @@ class DatabaseManager:
             logger.info("✅ Database initialized successfully")
             # Migration: mavjud jadvalga district ustuni qo'shish
             self._migrate_add_district(conn)
+            self._migrate_indexes(conn)
 
     def _migrate_add_district(self, conn):
         """District ustunini mavjud jadvalga qo'shish (migration)"""
@@ -107,6 +225,19 @@ class DatabaseManager:
                 logger.info(f"✅ Migration: {table}.district ustuni qo'shildi")
             except Exception:
                 pass  # Ustun allaqachon mavjud
+
+    def _migrate_indexes(self, conn):
+        """Indekslarni schema versiyasi bo'yicha yaratish (migration)"""
+        cursor = conn.cursor()
+        current = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if current >= SCHEMA_VERSION:
+            return
+        for version in sorted(v for v in SCHEMA_INDEXES if v > current):
+            for statement in SCHEMA_INDEXES[version]:
+                cursor.execute(statement)
+            cursor.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+            logger.info(f"✅ Migration: indekslar v{version} yaratildi")
     
     # ============================================================================
     # KO'CHMAS MULK METODLARI
@@ -141,7 +272,6 @@ class DatabaseManager:
                 data.get('video_id'),
                 data.get('address')
             ))
-            conn.commit()
             return cursor.lastrowid
     
     def get_kochmas_mulk_list(
@@ -185,6 +315,20 @@ class DatabaseManager:
             
             return [dict(row) for row in rows]
     
+    def get_kochmas_mulk_page(
+        self,
+        region: Optional[str] = None,
+        district: Optional[str] = None,
+        property_type: Optional[str] = None,
+        action_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        direction: str = "next",
+        limit: int = 10
+    ) -> Page:
+        """Ko'chmas mulk ro'yxati — keyset (cursor) sahifalash"""
+        where, params = self._listing_filters(region, district, property_type, action_type)
+        return self._keyset_page("kochmas_mulk", where, params, cursor, direction, limit)
+    
     def get_kochmas_mulk_by_id(self, object_id: int) -> Optional[Dict[str, Any]]:
         """ID bo'yicha ko'chmas mulk olish"""
         with self.get_connection() as conn:
@@ -239,7 +383,6 @@ class DatabaseManager:
                 data.get('video_id'),
                 data.get('address')
             ))
-            conn.commit()
             return cursor.lastrowid
     
     def get_ijara_list(
@@ -283,6 +426,20 @@ class DatabaseManager:
             
             return [dict(row) for row in rows]
     
+    def get_ijara_page(
+        self,
+        region: Optional[str] = None,
+        district: Optional[str] = None,
+        property_type: Optional[str] = None,
+        action_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        direction: str = "next",
+        limit: int = 10
+    ) -> Page:
+        """Ijara e'lonlari ro'yxati — keyset (cursor) sahifalash"""
+        where, params = self._listing_filters(region, district, property_type, action_type)
+        return self._keyset_page("ijara", where, params, cursor, direction, limit)
+    
     def get_ijara_by_id(self, object_id: int) -> Optional[Dict[str, Any]]:
         """ID bo'yicha ijara e'lonini olish"""
         with self.get_connection() as conn:
@@ -308,6 +465,28 @@ class DatabaseManager:
             cursor.execute("SELECT * FROM ijara ORDER BY created_at DESC LIMIT ? OFFSET ?", (limit, offset))
             return [dict(r) for r in cursor.fetchall()]
 
+    def get_all_kochmas_page(
+        self,
+        cursor: Optional[str] = None,
+        direction: str = "next",
+        limit: int = 20,
+        active_only: bool = True
+    ) -> Page:
+        """Admin view: ko'chmas mulk — keyset (cursor) sahifalash"""
+        where, params = ("is_active = 1", []) if active_only else ("1", [])
+        return self._keyset_page("kochmas_mulk", where, params, cursor, direction, limit)
+
+    def get_all_ijara_page(
+        self,
+        cursor: Optional[str] = None,
+        direction: str = "next",
+        limit: int = 20,
+        active_only: bool = True
+    ) -> Page:
+        """Admin view: ijara — keyset (cursor) sahifalash"""
+        where, params = ("is_active = 1", []) if active_only else ("1", [])
+        return self._keyset_page("ijara", where, params, cursor, direction, limit)
+
     def update_kochmas_mulk(self, object_id: int, data: Dict[str, Any]) -> bool:
         """E'lonni yangilash (admin/edit)"""
         try:
@@ -321,7 +500,6 @@ class DatabaseManager:
                 params.append(object_id)
                 query = f"UPDATE kochmas_mulk SET {', '.join(fields)} WHERE id = ?"
                 cursor.execute(query, params)
-                conn.commit()
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error updating kochmas_mulk: {e}")
@@ -340,7 +518,6 @@ class DatabaseManager:
                 params.append(object_id)
                 query = f"UPDATE ijara SET {', '.join(fields)} WHERE id = ?"
                 cursor.execute(query, params)
-                conn.commit()
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error updating ijara: {e}")
@@ -379,6 +556,72 @@ class DatabaseManager:
     # ============================================================================
     # UMUMIY METODLAR
     # ============================================================================
+
+    @staticmethod
+    def _listing_filters(
+        region: Optional[str],
+        district: Optional[str],
+        property_type: Optional[str],
+        action_type: Optional[str]
+    ) -> Tuple[str, List[Any]]:
+        """Ro'yxat filtrlarini WHERE qismiga aylantirish"""
+        conditions, params = ["is_active = 1"], []
+        for column, value in (
+            ("region", region),
+            ("district", district),
+            ("property_type", property_type),
+            ("action_type", action_type),
+        ):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        return " AND ".join(conditions), params
+
+    def _keyset_page(
+        self,
+        table: str,
+        where: str,
+        params: List[Any],
+        cursor: Optional[str],
+        direction: str,
+        limit: int
+    ) -> Page:
+        """
+        (created_at, id) bo'yicha keyset sahifalash.
+        OFFSET ishlatilmaydi — har bir sahifa indeks bo'yicha bir xil tezlikda o'qiladi.
+        direction="next" — cursordan keyingi (eskiroq) e'lonlar,
+        direction="prev" — cursordan oldingi (yangiroq) e'lonlar.
+        """
+        backwards = direction == "prev"
+        query = f"SELECT * FROM {table} WHERE {where}"
+        params = list(params)
+        if cursor:
+            created_at, object_id = decode_cursor(cursor)
+            query += " AND (created_at, id) > (?, ?)" if backwards else " AND (created_at, id) < (?, ?)"
+            params.extend([created_at, object_id])
+        query += (
+            " ORDER BY created_at ASC, id ASC LIMIT ?" if backwards
+            else " ORDER BY created_at DESC, id DESC LIMIT ?"
+        )
+        params.append(limit + 1)
+
+        with self.get_connection() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = [dict(r) for r in conn.execute(query, params).fetchall()]
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
+        if not rows:
+            return [], None, None
+
+        first = encode_cursor(rows[0]['created_at'], rows[0]['id'])
+        last = encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+        # Qaysi yo'nalishdan kelgan bo'lsak, o'sha tomonda albatta sahifa bor
+        next_cursor = last if (has_more if not backwards else bool(cursor)) else None
+        prev_cursor = first if (has_more if backwards else bool(cursor)) else None
+        return rows, next_cursor, prev_cursor
     
     def deactivate_object(self, table: str, object_id: int) -> bool:
         """E'lonni o'chirish (deaktivatsiya)"""
@@ -389,7 +632,6 @@ class DatabaseManager:
                     f"UPDATE {table} SET is_active = 0 WHERE id = ?",
                     (object_id,)
                 )
-                conn.commit()
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error deactivating object: {e}")
@@ -432,7 +674,6 @@ class DatabaseManager:
                     INSERT OR IGNORE INTO favorites (user_id, object_id, object_type, added_at)
                     VALUES (?, ?, ?, datetime('now'))
                 """, (user_id, object_id, object_type))
-                conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Error adding favorite: {e}")
@@ -447,7 +688,6 @@ class DatabaseManager:
                     """DELETE FROM favorites WHERE user_id = ? AND object_id = ? AND object_type = ?""",
                     (user_id, object_id, object_type)
                 )
-                conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Error removing favorite: {e}")
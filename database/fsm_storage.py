@@ -0,0 +1,281 @@
+"""
+FSM holatlari uchun doimiy saqlash (aiogram BaseStorage)
+
+SQLiteStorage — holat va ma'lumotlar fsm_states jadvalida; o'qish xotiradagi
+LRU keshdan (har bir update'da diskka borilmaydi). Yozish — kalit bo'yicha
+birlashtiriladigan write-behind: bir qadamdagi set_state + update_data bitta UPSERT.
+FSM_STATE_TTL dan uzoq o'zgarmagan (tashlab ketilgan) holatlar davriy ravishda o'chiriladi.
+
+create_fsm_storage() — FSM_STORAGE bo'yicha:
+  sqlite (standart) | redis (FSM_REDIS_URL, bir nechta replika uchun) | memory
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from .config import (
+    DB_PATH, DB_PRAGMAS, FSM_STORAGE, FSM_REDIS_URL, FSM_STATE_TTL, FSM_CACHE_MAX_ENTRIES,
+    FSM_FLUSH_INTERVAL, FSM_CLEANUP_INTERVAL,
+)
+from .pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS fsm_states (
+        key TEXT PRIMARY KEY,
+        state TEXT,
+        data TEXT NOT NULL DEFAULT '{}',
+        updated_at INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_fsm_states_updated ON fsm_states(updated_at)",
+]
+
+# Redis bilan bir xil kalit ko'rinishi: fsm:bot:chat:user[:thread][:business]:destiny
+KEY_BUILDER = DefaultKeyBuilder(with_bot_id=True, with_business_connection_id=True, with_destiny=True)
+
+
+class _Record:
+    __slots__ = ("state", "data", "data_json", "updated_at")
+
+    def __init__(self, state: Optional[str] = None, data: Optional[Dict[str, Any]] = None,
+                 data_json: str = "{}", updated_at: int = 0):
+        self.state = state
+        self.data = data if data is not None else {}
+        self.data_json = data_json
+        self.updated_at = updated_at
+
+    @property
+    def empty(self) -> bool:
+        return self.state is None and not self.data
+
+
+class SQLiteStorage(BaseStorage):
+    """SQLite + o'qish keshi asosidagi FSM storage (bitta jarayon uchun)"""
+
+    def __init__(
+        self,
+        db_path: str = DB_PATH,
+        ttl: int = FSM_STATE_TTL,
+        cache_size: int = FSM_CACHE_MAX_ENTRIES,
+        flush_interval: float = FSM_FLUSH_INTERVAL,
+        cleanup_interval: int = FSM_CLEANUP_INTERVAL,
+    ):
+        self.pool = ConnectionPool(db_path, size=2, pragmas=DB_PRAGMAS)
+        self.ttl = ttl
+        self.cache_size = max(1, cache_size)
+        self.flush_interval = flush_interval
+        self.cleanup_interval = cleanup_interval
+        # kalit -> yozuv (bo'sh yozuvlar ham — "holat yo'q" javobi ham keshlanadi)
+        self._cache: "OrderedDict[str, _Record]" = OrderedDict()
+        # diskka yozilishi kerak bo'lgan kalitlar -> oxirgi yozuv
+        self._dirty: Dict[str, _Record] = {}
+        # flush() diskka yozayotgan (hali commit qilinmagan) yozuvlar — disk hali eski
+        self._inflight: Dict[str, _Record] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._last_cleanup = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.written = 0
+        self.expired = 0
+        self._init_tables()
+
+    def _init_tables(self):
+        with self.pool.connection() as conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    async def _in_thread(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    # ------------------------------------------------------------------
+    # Disk (executor thread'da)
+    # ------------------------------------------------------------------
+
+    def _load_row(self, key: str) -> Optional[Tuple[Optional[str], str, int]]:
+        with self.pool.connection() as conn:
+            return conn.execute(
+                "SELECT state, data, updated_at FROM fsm_states WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _write_rows(self, rows: List[Tuple[str, _Record]]):
+        with self.pool.connection() as conn:
+            for key, record in rows:
+                if record.empty:
+                    conn.execute("DELETE FROM fsm_states WHERE key = ?", (key,))
+                else:
+                    conn.execute(
+                        "INSERT INTO fsm_states (key, state, data, updated_at) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET state = excluded.state, data = excluded.data, "
+                        "updated_at = excluded.updated_at",
+                        (key, record.state, record.data_json, record.updated_at),
+                    )
+
+    def _delete_expired(self, cutoff: int) -> int:
+        with self.pool.connection() as conn:
+            return conn.execute("DELETE FROM fsm_states WHERE updated_at < ?", (cutoff,)).rowcount
+
+    # ------------------------------------------------------------------
+    # Kesh
+    # ------------------------------------------------------------------
+
+    def _is_expired(self, record: _Record) -> bool:
+        return not record.empty and record.updated_at < time.time() - self.ttl
+
+    def _remember(self, key: str, record: _Record):
+        self._cache[key] = record
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _get(self, key: StorageKey) -> _Record:
+        k = KEY_BUILDER.build(key)
+        record = self._cache.get(k)
+        if record is not None:
+            self.hits += 1
+            self._cache.move_to_end(k)
+        elif k in self._dirty or k in self._inflight:
+            # Keshdan chiqarilgan, lekin hali diskka yozilmagan (yoki yozilayotgan)
+            record = self._dirty.get(k) or self._inflight[k]
+            self._remember(k, record)
+        else:
+            self.misses += 1
+            row = await self._in_thread(self._load_row, k)
+            # Kutish paytida shu kalitga yozilgan yoki flush boshlangan bo'lsa — xotiradagi qiymat ustun
+            record = self._cache.get(k) or self._dirty.get(k) or self._inflight.get(k)
+            if record is None:
+                record = _Record(row[0], json.loads(row[1]), row[1], row[2]) if row else _Record()
+                self._remember(k, record)
+        if self._is_expired(record):
+            self.expired += 1
+            record = self._put(k, None, {})
+        return record
+
+    def _put(self, key: str, state: Optional[str], data: Dict[str, Any]) -> _Record:
+        # json.dumps shu yerda — serializatsiya qilinmaydigan qiymat handler'ning o'zida xato beradi
+        record = _Record(state, data, json.dumps(data, ensure_ascii=False), int(time.time()))
+        self._remember(key, record)
+        self._dirty[key] = record
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop(), name="fsm-flush")
+        return record
+
+    # ------------------------------------------------------------------
+    # BaseStorage
+    # ------------------------------------------------------------------
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = await self._get(key)
+        state = state.state if isinstance(state, State) else state
+        if state != record.state:
+            self._put(KEY_BUILDER.build(key), state, record.data)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return (await self._get(key)).state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        record = await self._get(key)
+        self._put(KEY_BUILDER.build(key), record.state, data.copy())
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        return (await self._get(key)).data.copy()
+
+    # ------------------------------------------------------------------
+    # Write-behind
+    # ------------------------------------------------------------------
+
+    async def flush(self):
+        """Yig'ilgan o'zgarishlarni bitta transaction bilan diskka yozish"""
+        if not self._dirty:
+            return
+        batch, self._dirty = self._dirty, {}
+        # Commit tugaguncha _get() diskdagi eski qatorni emas, shu yozuvlarni ko'radi
+        self._inflight.update(batch)
+        try:
+            await self._in_thread(self._write_rows, list(batch.items()))
+            self.written += len(batch)
+        except sqlite3.Error as e:
+            # Keyingi urinishda qayta yoziladi (yangiroq qiymatlar ustun)
+            for key, record in batch.items():
+                self._dirty.setdefault(key, record)
+            logger.error(f"❌ FSM holatlari saqlanmadi ({len(batch)} ta): {e}")
+        finally:
+            for key, record in batch.items():
+                if self._inflight.get(key) is record:
+                    del self._inflight[key]
+
+    async def cleanup(self) -> int:
+        """FSM_STATE_TTL dan uzoq o'zgarmagan holatlarni o'chirish"""
+        self._last_cleanup = time.time()
+        cutoff = int(self._last_cleanup - self.ttl)
+        for key in [k for k, r in self._cache.items() if not r.empty and r.updated_at < cutoff]:
+            del self._cache[key]
+        removed = await self._in_thread(self._delete_expired, cutoff)
+        if removed:
+            logger.info(f"🧹 Tashlab ketilgan FSM holatlari o'chirildi: {removed} ta")
+        return removed
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+                if time.time() - self._last_cleanup >= self.cleanup_interval:
+                    await self.cleanup()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ FSM storage fon vazifasida xato: {e}", exc_info=True)
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+        self.pool.close()
+        logger.info(f"🔒 FSM storage yopildi (yozildi: {self.written})")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'cached': len(self._cache),
+            'pending': len(self._dirty) + len(self._inflight),
+            'hits': self.hits,
+            'misses': self.misses,
+            'written': self.written,
+            'expired': self.expired,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+def create_fsm_storage(kind: str = FSM_STORAGE) -> BaseStorage:
+    """FSM_STORAGE sozlamasiga mos storage"""
+    if kind == "redis":
+        try:
+            from aiogram.fsm.storage.redis import RedisStorage
+        except ImportError as e:  # redis paketi ixtiyoriy
+            raise RuntimeError("FSM_STORAGE=redis uchun `redis` paketi o'rnatilishi kerak") from e
+        logger.info("🗄 FSM storage: Redis")
+        # TTL ni Redis o'zi boshqaradi; kesh yo'q — replikalar bir-birining yozuvini ko'radi
+        return RedisStorage.from_url(
+            FSM_REDIS_URL, key_builder=KEY_BUILDER, state_ttl=FSM_STATE_TTL, data_ttl=FSM_STATE_TTL,
+        )
+    if kind == "memory":
+        logger.info("🗄 FSM storage: xotira (qayta ishga tushganda yo'qoladi)")
+        return MemoryStorage()
+    logger.info("🗄 FSM storage: SQLite")
+    return SQLiteStorage()
@@ -0,0 +1,176 @@
+"""
+SQLite connection pool
+Har bir so'rov uchun yangi sqlite3.connect() ochish o'rniga
+uzoq yashaydigan connectionlarni qayta ishlatish
+"""
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(sqlite3.OperationalError):
+    """Belgilangan vaqt ichida bo'sh connection topilmadi"""
+
+
+class PoolClosed(sqlite3.ProgrammingError):
+    """Pool yopilgandan keyin connection so'raldi"""
+
+
+def apply_pragmas(conn: sqlite3.Connection, pragmas: Dict[str, Any]):
+    """PRAGMA sozlamalarini connectionga qo'llash (WAL, synchronous, cache...)"""
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+class ConnectionPool:
+    """Cheklangan o'lchamdagi, thread-safe SQLite connection pool"""
+
+    def __init__(
+        self,
+        db_path: str,
+        size: int = 5,
+        timeout: float = 10.0,
+        health_check_interval: float = 60.0,
+        pragmas: Optional[Dict[str, Any]] = None,
+    ):
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.pragmas = pragmas or {}
+
+        # LIFO — eng oxirgi ishlatilgan (issiq) connection birinchi beriladi
+        self._idle: "queue.LifoQueue[Tuple[sqlite3.Connection, float]]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Ichki yordamchilar
+    # ------------------------------------------------------------------
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """Yangi connection ochish (pool ichida thread'lar orasida ko'chadi)"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            apply_pragmas(conn, self.pragmas)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Connection tirikligini tekshirish"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    # ------------------------------------------------------------------
+    # Asosiy API
+    # ------------------------------------------------------------------
+
+    def acquire(self) -> sqlite3.Connection:
+        """Pooldan connection olish (kerak bo'lsa yangisini ochish)"""
+        while True:
+            if self._closed:
+                raise PoolClosed("Connection pool yopilgan")
+
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self.size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        return self._create_connection()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                try:
+                    conn, last_used = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise PoolTimeout(
+                        f"{self.timeout}s ichida bo'sh connection topilmadi (pool size={self.size})"
+                    )
+
+            # Uzoq vaqt ishlatilmagan connectionni tekshirish
+            if time.monotonic() - last_used > self.health_check_interval and not self._is_healthy(conn):
+                logger.warning("⚠️ Buzilgan SQLite connection almashtirildi")
+                self._discard(conn)
+                continue
+            return conn
+
+    def release(self, conn: sqlite3.Connection):
+        """Connectionni poolga qaytarish"""
+        if self._closed:
+            self._discard(conn)
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Connection olish: muvaffaqiyatli bo'lsa commit, xato bo'lsa rollback,
+        oxirida poolga qaytarish
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            raise
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Barcha bo'sh connectionlarni yopish; band connectionlar qaytarilganda yopiladi"""
+        self._closed = True
+        closed = 0
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+            closed += 1
+        logger.info(f"🔒 SQLite pool yopildi ({closed} ta connection)")
+
+    def stats(self) -> dict:
+        """Pool holati (monitoring uchun)"""
+        return {
+            'size': self.size,
+            'created': self._created,
+            'idle': self._idle.qsize(),
+            'closed': self._closed,
+        }
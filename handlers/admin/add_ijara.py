@@ -331,12 +331,12 @@ async def _ai_confirm(message: Message, state: FSMContext):
         return await message.answer("Bekor.", reply_markup=get_admin_ijara_menu())
     if message.text != "✅ Saqlash":
         return
-    from database.db_manager import db
+    from database import adb
     import logging
     logger = logging.getLogger(__name__)
     data = await state.get_data()
     try:
-        obj_id = db.add_ijara({
+        obj_id = await adb.add_ijara({
             'user_id':           message.from_user.id,
             'username':          message.from_user.username,
             'full_name':         data.get('full_name', ''),
@@ -315,12 +315,12 @@ async def _ak_confirm(message: Message, state: FSMContext):
         return await message.answer("Bekor.", reply_markup=get_admin_kochmas_menu())
     if message.text != "✅ Saqlash":
         return
-    from database.db_manager import db
+    from database import adb
     import logging
     logger = logging.getLogger(__name__)
     data = await state.get_data()
     try:
-        obj_id = db.add_kochmas_mulk({
+        obj_id = await adb.add_kochmas_mulk({
             'user_id':       message.from_user.id,
             'username':      message.from_user.username,
             'full_name':     data.get('full_name', ''),
@@ -17,7 +17,7 @@ from .utils import (
     get_admin_main_menu, get_admin_kochmas_menu, get_admin_ijara_menu,
     get_cancel_admin,
     kochmas_detail_kb, ijara_detail_kb, confirm_delete_kb,
-    db_get_all_kochmas, db_get_all_ijara,
+    db_get_kochmas_page, db_get_ijara_page, admin_page_nav,
     format_kochmas_text, format_ijara_text,
     AdminEditKochmas, AdminEditIjara,
 )
@@ -66,14 +66,44 @@ async def back_to_main(message: Message, state: FSMContext):
 async def admin_statistics(message: Message):
     if not is_admin(message.from_user.id):
         return
-    from database.db_manager import db
+    from database import adb
+    from handlers.auksion_v2.api import api_client
+    from handlers.auksion_v2.image_cache import image_cache
+    from handlers.auksion_v2.media import photo_sender
+    from handlers.auksion_v2.models import storage as auksion_storage
+    from handlers.auksion_v2.sync import catalog_sync
     try:
-        stats = db.get_statistics()
+        stats = await adb.get_statistics()
+        cache = api_client.cache_stats()
+        detail = api_client.detail_cache_stats()
+        memory = auksion_storage.memory_stats()
+        breaker = api_client.breaker_stats()
+        limiter = api_client.limiter_stats()
+        sync = catalog_sync.stats()
+        photos = photo_sender.stats()
+        images = image_cache.stats()
         text = (
             "📊 <b>BOT STATISTIKASI</b>\n\n"
             f"🏠 Ko'chmas mulk (faol): <b>{stats.get('kochmas_mulk', 0)}</b> ta\n"
             f"📋 Ijara (faol): <b>{stats.get('ijara', 0)}</b> ta\n"
             f"📌 Jami faol: <b>{stats.get('total', 0)}</b> ta\n\n"
+            f"⚡ Auksion keshi: {cache['size']}/{cache['maxsize']} | "
+            f"hit {cache['hits'] + cache['coalesced']} / miss {cache['misses']} "
+            f"({cache['hit_rate']:.0%})\n"
+            f"⚡ Lot detail keshi: {detail['size']} | hit {detail['hits']} / "
+            f"stale {detail['stale_hits']} / miss {detail['misses']} / fallback {detail['fallbacks']}\n"
+            f"🧠 Auksion xotirasi: {memory['lots']}/{memory['max_entries']} lot "
+            f"({memory['bytes'] / 1024 / 1024:.1f} MB, pin {memory['pinned']}, "
+            f"chiqarilgan {memory['evictions'] + memory['expired']})\n"
+            f"🔌 e-auksion.uz circuit: {breaker['state']} (ochilgan: {breaker['trips']} marta)\n"
+            f"🚦 Upstream navbati: {limiter['in_flight']} faol, {limiter['waiting']} kutmoqda, "
+            f"{limiter['rejected']} rad etilgan\n"
+            f"🔄 Katalog: {sync['partitions']} bo'lim, {sync['cycles']} sikl, kutish {sync['throttled']} | "
+            f"lokal {sync['local_hits']} / upstream {sync['upstream_fallbacks']}\n"
+            f"🖼 Rasm file_id: {photos['file_ids']} ta | file_id {photos['cached_sends']} / "
+            f"yuklash {photos['uploads']} ({photos['hit_rate']:.0%}), albom {photos['albums']}\n"
+            f"💾 Rasm keshi: {images['files']} fayl, {images['bytes'] / 1024 / 1024:.0f}/"
+            f"{images['max_bytes'] / 1024 / 1024:.0f} MB | hit {images['hits']} / miss {images['misses']}\n\n"
             f"📅 {datetime.now().strftime('%d.%m.%Y %H:%M')}"
         )
     except Exception as e:
@@ -97,12 +127,24 @@ async def admin_kochmas_section(message: Message, state: FSMContext):
 async def admin_list_kochmas(message: Message):
     if not is_admin(message.from_user.id):
         return
-    from database.db_manager import db
-    # Faqat FAOL e'lonlar
-    objects = [o for o in db_get_all_kochmas(db) if o.get('is_active', 1)]
-    if not objects:
+    await _send_kochmas_list(message)
+
+
+async def _send_kochmas_list(message: Message):
+    page = await _build_kochmas_list_page()
+    if page is None:
         await message.answer("📭 Faol Ko'chmas mulk e'lonlari yo'q.", reply_markup=get_admin_kochmas_menu())
         return
+    text, markup = page
+    await message.answer(text, reply_markup=markup, parse_mode="HTML")
+
+
+async def _build_kochmas_list_page(cursor=None, direction="next", page_no=1):
+    """Faol ko'chmas mulk e'lonlari sahifasi; bo'sh bo'lsa None"""
+    from database import adb
+    objects, next_cursor, prev_cursor = await db_get_kochmas_page(adb, cursor, direction)
+    if not objects:
+        return None
     keyboard = []
     for obj in objects:
         prop   = get_property_type_name_by_code(obj.get('property_type', ''))
@@ -111,10 +153,9 @@ async def admin_list_kochmas(message: Message):
         region = get_region_name_by_code(obj.get('region', ''))
         label  = f"#{obj['id']} | {rooms}{prop} | {price} | {region}"
         keyboard.append([InlineKeyboardButton(text=label[:64], callback_data=f"akv_kochmas_{obj['id']}")])
-    await message.answer(
-        f"🏠 <b>BARCHA KO'CHMAS MULK E'LONLAR</b>\n\nFaol: {len(objects)} ta",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard), parse_mode="HTML"
-    )
+    keyboard += admin_page_nav("kochmas", page_no, next_cursor, prev_cursor)
+    text = f"🏠 <b>BARCHA KO'CHMAS MULK E'LONLAR</b>\n\n📄 Sahifa: {page_no}"
+    return text, InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
 @router.callback_query(F.data.startswith("akv_kochmas_"))
@@ -122,13 +163,13 @@ async def admin_view_kochmas(callback: CallbackQuery):
     if not is_admin(callback.from_user.id):
         await callback.answer("❌ Ruxsat yo'q", show_alert=True)
         return
-    from database.db_manager import db
+    from database import adb
     try:
         obj_id = int(callback.data.split("_")[-1])
     except (ValueError, IndexError):
         await callback.answer("❌ Xato", show_alert=True)
         return
-    obj = db.get_kochmas_mulk_by_id(obj_id)
+    obj = await adb.get_kochmas_mulk_by_id(obj_id)
     if not obj:
         await callback.answer("❌ Topilmadi!", show_alert=True)
         return
@@ -157,7 +198,7 @@ async def adm_back_kochmas_list(callback: CallbackQuery):
         await callback.message.delete()
     except Exception:
         pass
-    await admin_list_kochmas(callback.message)
+    await _send_kochmas_list(callback.message)
     await callback.answer()
 
 
@@ -187,14 +228,14 @@ async def admin_delete_kochmas_do(callback: CallbackQuery):
     if not is_admin(callback.from_user.id):
         await callback.answer("❌ Ruxsat yo'q", show_alert=True)
         return
-    from database.db_manager import db
+    from database import adb
     try:
         obj_id = int(callback.data.split("_")[-1])
     except (ValueError, IndexError):
         await callback.answer("❌ Xato", show_alert=True)
         return
     try:
-        db.delete_kochmas_mulk(obj_id)
+        await adb.delete_kochmas_mulk(obj_id)
         await callback.message.edit_text(
             f"✅ <b>Ko'chmas mulk #{obj_id} o'chirildi!</b>\n\n"
             "E'lon endi barcha bo'limlarda ko'rinmaydi.",
@@ -254,30 +295,30 @@ async def admin_edit_kochmas_save(message: Message, state: FSMContext):
     if message.text == "❌ Bekor qilish":
         await state.clear()
         return await message.answer("Bekor qilindi.", reply_markup=get_admin_kochmas_menu())
-    from database.db_manager import db
+    from database import adb
     data   = await state.get_data()
     obj_id = data['edit_obj_id']
     field  = data['edit_field']
     try:
         if field == "price":
             val = float(message.text.replace(" ", "").replace(",", ""))
-            db.update_kochmas_mulk(obj_id, {"price": val})
+            await adb.update_kochmas_mulk(obj_id, {"price": val})
             await message.answer(f"✅ Narx yangilandi: {format_price(val)}", reply_markup=get_admin_kochmas_menu())
         elif field == "address":
-            db.update_kochmas_mulk(obj_id, {"address": message.text.strip()})
+            await adb.update_kochmas_mulk(obj_id, {"address": message.text.strip()})
             await message.answer("✅ Manzil yangilandi!", reply_markup=get_admin_kochmas_menu())
         elif field == "description":
-            db.update_kochmas_mulk(obj_id, {"description": message.text.strip()})
+            await adb.update_kochmas_mulk(obj_id, {"description": message.text.strip()})
             await message.answer("✅ Tavsif yangilandi!", reply_markup=get_admin_kochmas_menu())
         elif field == "photo":
             if not message.photo:
                 return await message.answer("❌ Rasm yuboring!")
-            db.update_kochmas_mulk(obj_id, {"photo_id": message.photo[-1].file_id})
+            await adb.update_kochmas_mulk(obj_id, {"photo_id": message.photo[-1].file_id})
             await message.answer("✅ Rasm yangilandi!", reply_markup=get_admin_kochmas_menu())
         elif field == "video":
             if not message.video:
                 return await message.answer("❌ Video yuboring!")
-            db.update_kochmas_mulk(obj_id, {"video_id": message.video.file_id})
+            await adb.update_kochmas_mulk(obj_id, {"video_id": message.video.file_id})
             await message.answer("✅ Video yangilandi!", reply_markup=get_admin_kochmas_menu())
         logger.info(f"Admin {message.from_user.id}: Ko'chmas #{obj_id} '{field}' yangilandi")
     except Exception as e:
@@ -301,12 +342,24 @@ async def admin_ijara_section(message: Message, state: FSMContext):
 async def admin_list_ijara(message: Message):
     if not is_admin(message.from_user.id):
         return
-    from database.db_manager import db
-    # Faqat FAOL e'lonlar
-    objects = [o for o in db_get_all_ijara(db) if o.get('is_active', 1)]
-    if not objects:
+    await _send_ijara_list(message)
+
+
+async def _send_ijara_list(message: Message):
+    page = await _build_ijara_list_page()
+    if page is None:
         await message.answer("📭 Faol Ijara e'lonlari yo'q.", reply_markup=get_admin_ijara_menu())
         return
+    text, markup = page
+    await message.answer(text, reply_markup=markup, parse_mode="HTML")
+
+
+async def _build_ijara_list_page(cursor=None, direction="next", page_no=1):
+    """Faol ijara e'lonlari sahifasi; bo'sh bo'lsa None"""
+    from database import adb
+    objects, next_cursor, prev_cursor = await db_get_ijara_page(adb, cursor, direction)
+    if not objects:
+        return None
     keyboard = []
     for obj in objects:
         prop   = get_property_type_name_by_code(obj.get('property_type', ''))
@@ -315,10 +368,9 @@ async def admin_list_ijara(message: Message):
         region = get_region_name_by_code(obj.get('region', ''))
         label  = f"#{obj['id']} | {rooms}{prop} | {price}/oy | {region}"
         keyboard.append([InlineKeyboardButton(text=label[:64], callback_data=f"akv_ijara_{obj['id']}")])
-    await message.answer(
-        f"📋 <b>BARCHA IJARA E'LONLAR</b>\n\nFaol: {len(objects)} ta",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard), parse_mode="HTML"
-    )
+    keyboard += admin_page_nav("ijara", page_no, next_cursor, prev_cursor)
+    text = f"📋 <b>BARCHA IJARA E'LONLAR</b>\n\n📄 Sahifa: {page_no}"
+    return text, InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
 @router.callback_query(F.data.startswith("akv_ijara_"))
@@ -326,13 +378,13 @@ async def admin_view_ijara(callback: CallbackQuery):
     if not is_admin(callback.from_user.id):
         await callback.answer("❌ Ruxsat yo'q", show_alert=True)
         return
-    from database.db_manager import db
+    from database import adb
     try:
         obj_id = int(callback.data.split("_")[-1])
     except (ValueError, IndexError):
         await callback.answer("❌ Xato", show_alert=True)
         return
-    obj = db.get_ijara_by_id(obj_id)
+    obj = await adb.get_ijara_by_id(obj_id)
     if not obj:
         await callback.answer("❌ Topilmadi!", show_alert=True)
         return
@@ -361,7 +413,36 @@ async def adm_back_ijara_list(callback: CallbackQuery):
         await callback.message.delete()
     except Exception:
         pass
-    await admin_list_ijara(callback.message)
+    await _send_ijara_list(callback.message)
+    await callback.answer()
+
+
+# ============================================================================
+# RO'YXAT SAHIFALASH
+# ============================================================================
+
+@router.callback_query(F.data.startswith("akp_"))
+async def admin_list_page(callback: CallbackQuery):
+    """akp_{kochmas|ijara}_{next|prev}_{sahifa}_{cursor}"""
+    if not is_admin(callback.from_user.id):
+        await callback.answer("❌ Ruxsat yo'q", show_alert=True)
+        return
+    try:
+        _, section, direction, page_no, cursor = callback.data.split("_", 4)
+        page_no = int(page_no)
+    except ValueError:
+        await callback.answer("❌ Xato", show_alert=True)
+        return
+    build = _build_kochmas_list_page if section == "kochmas" else _build_ijara_list_page
+    page = await build(cursor, direction, page_no)
+    if page is None:
+        await callback.answer("📭 Boshqa e'lonlar yo'q")
+        return
+    text, markup = page
+    try:
+        await callback.message.edit_text(text, reply_markup=markup, parse_mode="HTML")
+    except Exception:
+        await callback.message.answer(text, reply_markup=markup, parse_mode="HTML")
     await callback.answer()
 
 
@@ -391,14 +472,14 @@ async def admin_delete_ijara_do(callback: CallbackQuery):
     if not is_admin(callback.from_user.id):
         await callback.answer("❌ Ruxsat yo'q", show_alert=True)
         return
-    from database.db_manager import db
+    from database import adb
     try:
         obj_id = int(callback.data.split("_")[-1])
     except (ValueError, IndexError):
         await callback.answer("❌ Xato", show_alert=True)
         return
     try:
-        db.delete_ijara(obj_id)
+        await adb.delete_ijara(obj_id)
         await callback.message.edit_text(
             f"✅ <b>Ijara #{obj_id} o'chirildi!</b>\n\n"
             "E'lon endi barcha bo'limlarda ko'rinmaydi.",
@@ -446,30 +527,30 @@ async def admin_edit_ijara_save(message: Message, state: FSMContext):
     if message.text == "❌ Bekor qilish":
         await state.clear()
         return await message.answer("Bekor qilindi.", reply_markup=get_admin_ijara_menu())
-    from database.db_manager import db
+    from database import adb
     data   = await state.get_data()
     obj_id = data['edit_obj_id']
     field  = data['edit_field']
     try:
         if field in ("monthly", "price"):
             val = float(message.text.replace(" ", "").replace(",", ""))
-            db.update_ijara(obj_id, {"monthly_price": val})
+            await adb.update_ijara(obj_id, {"monthly_price": val})
             await message.answer(f"✅ Oylik narx: {format_price(val)}", reply_markup=get_admin_ijara_menu())
         elif field == "address":
-            db.update_ijara(obj_id, {"address": message.text.strip()})
+            await adb.update_ijara(obj_id, {"address": message.text.strip()})
             await message.answer("✅ Manzil yangilandi!", reply_markup=get_admin_ijara_menu())
         elif field == "description":
-            db.update_ijara(obj_id, {"description": message.text.strip()})
+            await adb.update_ijara(obj_id, {"description": message.text.strip()})
             await message.answer("✅ Tavsif yangilandi!", reply_markup=get_admin_ijara_menu())
         elif field == "photo":
             if not message.photo:
                 return await message.answer("❌ Rasm yuboring!")
-            db.update_ijara(obj_id, {"photo_id": message.photo[-1].file_id})
+            await adb.update_ijara(obj_id, {"photo_id": message.photo[-1].file_id})
             await message.answer("✅ Rasm yangilandi!", reply_markup=get_admin_ijara_menu())
         elif field == "video":
             if not message.video:
                 return await message.answer("❌ Video yuboring!")
-            db.update_ijara(obj_id, {"video_id": message.video.file_id})
+            await adb.update_ijara(obj_id, {"video_id": message.video.file_id})
             await message.answer("✅ Video yangilandi!", reply_markup=get_admin_ijara_menu())
         logger.info(f"Admin {message.from_user.id}: Ijara #{obj_id} '{field}' yangilandi")
     except Exception as e:
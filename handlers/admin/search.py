@@ -58,10 +58,10 @@ async def admin_search_by_id(message: Message, state: FSMContext):
         return await message.answer("❌ Faqat raqam kiriting!\n<i>Masalan: 5</i>", parse_mode="HTML")
 
     await state.clear()
-    from database.db_manager import db
+    from database import adb
 
     # Ko'chmas mulkdan qidirish
-    obj = db.get_kochmas_mulk_by_id(obj_id)
+    obj = await adb.get_kochmas_mulk_by_id(obj_id)
     if obj:
         text = format_kochmas_text(obj)
         kb   = kochmas_detail_kb(obj_id, from_search=True)
@@ -72,7 +72,7 @@ async def admin_search_by_id(message: Message, state: FSMContext):
         return
 
     # Ijaradan qidirish
-    obj = db.get_ijara_by_id(obj_id)
+    obj = await adb.get_ijara_by_id(obj_id)
     if obj:
         text = format_ijara_text(obj)
         kb   = ijara_detail_kb(obj_id, from_search=True)
@@ -175,9 +175,9 @@ async def abk_prop_type(message: Message, state: FSMContext):
     data = await state.get_data()
     await state.clear()
 
-    from database.db_manager import db
+    from database import adb
     # Admin uchun BARCHA e'lonlar (o'chirilganlar ham)
-    all_objs = db.get_all_kochmas(limit=500)
+    all_objs = await adb.get_all_kochmas(limit=500)
     objects  = [
         o for o in all_objs
         if o.get('region') == data['region']
@@ -290,8 +290,8 @@ async def abi_prop_type(message: Message, state: FSMContext):
     data = await state.get_data()
     await state.clear()
 
-    from database.db_manager import db
-    all_objs = db.get_all_ijara(limit=500)
+    from database import adb
+    all_objs = await adb.get_all_ijara(limit=500)
     objects  = [
         o for o in all_objs
         if o.get('region') == data['region']
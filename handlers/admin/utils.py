@@ -199,18 +199,37 @@ def confirm_delete_kb(obj_type: str, obj_id: int) -> InlineKeyboardMarkup:
 # DB YORDAMCHI
 # ============================================================================
 
-def db_get_all_kochmas(db, limit: int = 200) -> list:
+ADMIN_PAGE_SIZE = 20
+
+
+async def db_get_kochmas_page(adb, cursor=None, direction="next", limit: int = ADMIN_PAGE_SIZE):
+    """Faol ko'chmas mulk e'lonlari: (qatorlar, keyingi_cursor, oldingi_cursor)"""
     try:
-        return db.get_all_kochmas(limit=limit)
+        return await adb.get_all_kochmas_page(cursor=cursor, direction=direction, limit=limit)
     except Exception:
-        return []
+        return [], None, None
 
 
-def db_get_all_ijara(db, limit: int = 200) -> list:
+async def db_get_ijara_page(adb, cursor=None, direction="next", limit: int = ADMIN_PAGE_SIZE):
+    """Faol ijara e'lonlari: (qatorlar, keyingi_cursor, oldingi_cursor)"""
     try:
-        return db.get_all_ijara(limit=limit)
+        return await adb.get_all_ijara_page(cursor=cursor, direction=direction, limit=limit)
     except Exception:
-        return []
+        return [], None, None
+
+
+def admin_page_nav(section: str, page_no: int, next_cursor, prev_cursor) -> list:
+    """akp_{section}_{next|prev}_{sahifa}_{cursor} sahifalash tugmalari"""
+    nav = []
+    if prev_cursor:
+        nav.append(InlineKeyboardButton(
+            text="⬅️ Oldingi", callback_data=f"akp_{section}_prev_{page_no - 1}_{prev_cursor}"
+        ))
+    if next_cursor:
+        nav.append(InlineKeyboardButton(
+            text="Keyingi ➡️", callback_data=f"akp_{section}_next_{page_no + 1}_{next_cursor}"
+        ))
+    return [nav] if nav else []
 
 
 def format_kochmas_text(obj: dict) -> str:
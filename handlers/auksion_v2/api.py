@@ -3,28 +3,310 @@ E-Auksion.uz V2 - API Client (REAL FORMAT)
 E-auksion.uz formatiga mos
 """
 import aiohttp
+import asyncio
 import logging
 import json
-from typing import Optional, List, Dict, Any
+import random
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 
-from .config import API_BASE_URL, API_HEADERS, ITEMS_PER_PAGE
-from .models import Lot, LotImage, storage
+from .cache import MISSING, SWRCache, TTLCache
+from .config import (
+    API_BASE_URL, API_HEADERS, ITEMS_PER_PAGE, CACHE_TTL, LOTS_CACHE_MAX_ENTRIES,
+    DETAIL_SOFT_TTL, DETAIL_HARD_TTL, DETAIL_STALE_TIMEOUT, DETAIL_CACHE_MAX_ENTRIES,
+    API_CONNECT_TIMEOUT, API_REQUEST_TIMEOUT, API_TOTAL_TIMEOUT,
+    API_MAX_RETRIES, API_BACKOFF_BASE, API_BACKOFF_MAX,
+    BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT,
+    API_CONNECTION_LIMIT, API_LIMIT_PER_HOST, API_DNS_CACHE_TTL, API_KEEPALIVE_TIMEOUT,
+    API_MAX_CONCURRENCY, API_RATE_PER_SECOND, API_RATE_BURST, API_QUEUE_TIMEOUT,
+    SEARCH_LOCAL_LIMIT, IMAGE_DOWNLOAD_TIMEOUT, IMAGE_MAX_DOWNLOAD_BYTES,
+)
+from .models import Lot, LotImage, lot_from_index_row, storage
 
 logger = logging.getLogger(__name__)
 
 
+# Kesh kalitida satr ko'rinishiga keltiriladigan maydonlar
+_ID_FIELDS = frozenset({
+    "confiscant_groups_id", "confiscant_categories_id", "regions_id", "areas_id",
+    "current_page", "per_page",
+})
+
+
+# Qayta urinishga arziydigan transport xatolari
+_RETRY_EXCEPTIONS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+
+
+class APIError(Exception):
+    """Upstream javobi ishlatib bo'lmaydi (status != 200) — keshlanmaydi"""
+
+
+class CircuitOpenError(APIError):
+    """Circuit breaker ochiq — upstream chaqirilmaydi"""
+
+
+class UpstreamBusyError(APIError):
+    """Navbatda API_QUEUE_TIMEOUT dan ortiq kutildi — so'rov yuborilmadi"""
+
+
+class UpstreamLimiter:
+    """
+    Upstreamga yuklamani cheklash:
+    - semaphore: bir vaqtda ko'pi bilan max_concurrency ta so'rov
+    - token bucket: o'rtacha rate so'rov/soniya, burst tagacha portlash
+    Ortiqcha so'rovlar navbatda kutadi, lekin max_wait dan ortiq emas.
+    """
+
+    def __init__(self, max_concurrency: int = API_MAX_CONCURRENCY, rate: float = API_RATE_PER_SECOND,
+                 burst: int = API_RATE_BURST, max_wait: float = API_QUEUE_TIMEOUT):
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._token_lock = asyncio.Lock()   # token kutayotganlar FIFO tartibida
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self.in_flight = 0
+        self.waiting = 0
+        self.delayed = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Bitta upstream so'rovi uchun ruxsat (kutish chegaralangan)"""
+        deadline = time.monotonic() + self.max_wait
+        self.waiting += 1
+        try:
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.max_wait)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise UpstreamBusyError(f"upstream navbati band ({self.max_wait:.0f}s)")
+            try:
+                await self._take_token(deadline)
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return now
+
+    def has_headroom(self, reserve_tokens: float, reserve_slots: int) -> bool:
+        """
+        Zaxiradan tashqari bo'sh joy bormi: fon vazifalari (katalog sinxronizatsiyasi)
+        faqat foydalanuvchilar uchun reserve_tokens token va reserve_slots slot qolganda so'rov yuboradi
+        """
+        self._refill()
+        if self.waiting:
+            return False
+        return (self._tokens - 1 >= reserve_tokens
+                and self.max_concurrency - self.in_flight - 1 >= reserve_slots)
+
+    async def _take_token(self, deadline: float):
+        async with self._token_lock:
+            while True:
+                now = self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+                if now + wait > deadline:
+                    self.rejected += 1
+                    raise UpstreamBusyError("upstream so'rovlar limiti (token bucket)")
+                self.delayed += 1
+                await asyncio.sleep(wait)
+
+    def stats(self) -> dict:
+        return {
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'delayed': self.delayed,
+            'rejected': self.rejected,
+            'tokens': round(self._tokens, 1),
+        }
+
+
+class CircuitBreaker:
+    """
+    closed -> (ketma-ket failure_threshold xato) -> open
+    open -> (reset_timeout o'tgach) -> half_open: bitta sinov so'rovi
+    half_open -> muvaffaqiyat: closed, xato: yana open
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self.trips = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """So'rov yuborish mumkinmi"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self._probe_in_flight:
+            self.rejected += 1
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info("✅ e-auksion.uz tiklandi — circuit yopildi")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+                logger.warning(
+                    f"🔌 e-auksion.uz ishlamayapti — circuit ochildi ({self.reset_timeout:.0f}s)"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self):
+        """Natija qayd etilmay tugagan so'rov (masalan, bekor qilingan) — sinov slotini bo'shatish"""
+        self._probe_in_flight = False
+
+    def stats(self) -> dict:
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'trips': self.trips,
+            'rejected': self.rejected,
+        }
+
+
 class AuksionAPIV2:
     """E-Auksion.uz API client - real format"""
     
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
+        self.breaker = CircuitBreaker()
+        self.limiter = UpstreamLimiter()
+        # Foydalanuvchilar so'ragan ro'yxat sahifalari chastotasi (prefetch uchun)
+        # kalit: (groups_id, categories_id, region_id, area_id, page, per_page)
+        self.demand: Counter = Counter()
+        # Ro'yxat sahifalari: normallashtirilgan payload -> List[Lot]
+        self.lots_cache = TTLCache("lots", maxsize=LOTS_CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+        # Lot detail: lot_id -> Lot (stale-while-revalidate)
+        self.detail_cache = SWRCache(
+            "lot-detail",
+            maxsize=DETAIL_CACHE_MAX_ENTRIES,
+            soft_ttl=DETAIL_SOFT_TTL,
+            hard_ttl=DETAIL_HARD_TTL,
+            stale_timeout=DETAIL_STALE_TIMEOUT,
+        )
     
     async def _get_session(self) -> aiohttp.ClientSession:
         """HTTP session yaratish"""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(headers=API_HEADERS)
+            connector = aiohttp.TCPConnector(
+                limit=API_CONNECTION_LIMIT,
+                limit_per_host=API_LIMIT_PER_HOST,
+                use_dns_cache=True,
+                ttl_dns_cache=API_DNS_CACHE_TTL,
+                keepalive_timeout=API_KEEPALIVE_TIMEOUT,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=API_HEADERS,
+                timeout=aiohttp.ClientTimeout(
+                    total=API_TOTAL_TIMEOUT,
+                    connect=API_CONNECT_TIMEOUT,
+                    sock_read=API_REQUEST_TIMEOUT,
+                ),
+            )
         return self.session
+
+    async def _request_json(self, method: str, path: str, **kwargs) -> Tuple[int, Any]:
+        """
+        Upstreamga so'rov: har bir urinishga timeout, jami API_TOTAL_TIMEOUT,
+        5xx va ulanish xatolarida exponential backoff + jitter bilan qayta urinish,
+        circuit breaker ochiq bo'lsa darhol CircuitOpenError.
+        Har bir urinish UpstreamLimiter orqali o'tadi (navbat band bo'lsa UpstreamBusyError).
+
+        Qaytaradi: (status, data) — 200 da JSON, boshqa <500 statusda javob matni.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("e-auksion.uz vaqtincha chaqirilmaydi (circuit ochiq)")
+
+        session = await self._get_session()
+        url = f"{API_BASE_URL}{path}"
+        deadline = time.monotonic() + API_TOTAL_TIMEOUT
+        last_error: Optional[BaseException] = None
+        recorded = False
+        try:
+            for attempt in range(API_MAX_RETRIES + 1):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                timeout = aiohttp.ClientTimeout(
+                    total=min(API_REQUEST_TIMEOUT, remaining), connect=API_CONNECT_TIMEOUT
+                )
+                try:
+                    async with self.limiter.slot(), \
+                            session.request(method, url, timeout=timeout, **kwargs) as response:
+                        if response.status < 500:
+                            if response.status == 200:
+                                data = await response.json(content_type=None)
+                            else:
+                                data = await response.text()
+                            self.breaker.record_success()
+                            recorded = True
+                            return response.status, data
+                        last_error = APIError(f"{path} status {response.status}")
+                except _RETRY_EXCEPTIONS as e:
+                    last_error = e
+
+                logger.warning(f"⚠️ {path}: {last_error!r} (urinish {attempt + 1}/{API_MAX_RETRIES + 1})")
+                if attempt == API_MAX_RETRIES:
+                    break
+                # Full jitter: 0 .. base * 2^attempt
+                delay = random.uniform(0, min(API_BACKOFF_MAX, API_BACKOFF_BASE * 2 ** attempt))
+                if time.monotonic() + delay >= deadline:
+                    break
+                await asyncio.sleep(delay)
+
+            self.breaker.record_failure()
+            recorded = True
+            raise APIError(f"{path}: upstream javob bermadi ({last_error!r})") from last_error
+        finally:
+            if not recorded:
+                self.breaker.release()
     
     async def close(self):
         """Session yopish"""
@@ -39,6 +321,7 @@ class AuksionAPIV2:
         per_page: int = ITEMS_PER_PAGE,
         region_id: int = None,
         area_id: int = None,
+        record_demand: bool = True,
     ) -> List[Lot]:
         """
         Kategoriya bo'yicha lotlarni olish (E-auksion.uz format)
@@ -49,9 +332,36 @@ class AuksionAPIV2:
             page: Sahifa raqami
             per_page: Sahifadagi elementlar soni
             region_id: Viloyat ID (agar kerak bo'lsa)
+            record_demand: False — so'rov prefetch talab statistikasiga qo'shilmaydi
+                (foydalanuvchi ko'rmaydigan ichki so'rovlar, masalan narx qidiruvi)
+
+        Natija CACHE_TTL davomida keshlanadi (kalit — normallashtirilgan payload).
         """
-        session = await self._get_session()
-        
+        if record_demand:
+            self.demand[(groups_id, categories_id, region_id, area_id, page, per_page)] += 1
+        payload = self._lots_payload(groups_id, categories_id, page, per_page, region_id, area_id)
+
+        cache_key = self._payload_key(payload)
+        try:
+            lots = await self.lots_cache.get_or_load(
+                cache_key,
+                lambda: self._fetch_lots(payload, groups_id, categories_id, region_id)
+            )
+        except Exception as e:
+            lots = self.lots_cache.get_stale(cache_key)
+            if lots is MISSING:
+                logger.error(f"❌ Lotlarni olishda xato: {e}", exc_info=not isinstance(e, APIError))
+                return []
+            logger.warning(f"⚠️ Upstream ishlamayapti ({e}) — keshdagi oxirgi sahifa berildi")
+
+        # Keshdan kelgan lotlar ham storage'da bo'lishi kerak (handlerlar storage.get_lot ishlatadi)
+        for lot in lots:
+            storage.save_lot(lot)
+        return list(lots)
+
+    @staticmethod
+    def _lots_payload(groups_id, categories_id, page, per_page, region_id, area_id) -> Dict[str, Any]:
+        """/lots so'rovi tanasi"""
         # E-auksion.uz REAL format
         payload = {
             "sort_type": 1,
@@ -83,56 +393,131 @@ class AuksionAPIV2:
             payload["regions_id"] = region_id
         if area_id is not None:
             payload["areas_id"] = area_id
-        
+        return payload
+
+    @staticmethod
+    def _payload_key(payload: Dict[str, Any]) -> str:
+        """
+        So'rov payloadini kesh kalitiga aylantirish:
+        kalitlar tartibidan va ID turlaridan ("5" / 5) mustaqil
+        """
+        normalized = {
+            key: str(value) if key in _ID_FIELDS and value is not None else value
+            for key, value in payload.items()
+        }
+        return json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+
+    async def _fetch_lots(self, payload: Dict[str, Any], groups_id, categories_id, region_id) -> List[Lot]:
+        """/lots ga haqiqiy so'rov; xatoda APIError"""
         logger.info(f"📤 API Request: groups_id={groups_id}, categories_id={categories_id}, region_id={region_id}")
-        
-        try:
-            async with session.post(f"{API_BASE_URL}/lots", json=payload) as response:
-                if response.status != 200:
-                    logger.error(f"❌ API xatolik: {response.status}")
-                    response_text = await response.text()
-                    logger.error(f"Response: {response_text[:500]}")
-                    return []
-                
-                data = await response.json()
-
-                # Try to extract rows from common response shapes
-                rows = data.get("rows") if isinstance(data, dict) else None
-                if not rows:
-                    for key in ("data", "result", "items", "rows", "lots"):
-                        candidate = data.get(key) if isinstance(data, dict) else None
-                        if isinstance(candidate, list):
-                            rows = candidate
-                            logger.debug(f"API fallback: used key '{key}' for rows extraction")
-                            break
-
-                if rows is None:
-                    # If no list found, ensure we have empty list and log response for debugging
-                    rows = []
-                    logger.debug(f"API returned non-list payload for lots: {str(data)[:1000]}")
-
-                logger.info(f"✅ API Success: {len(rows)} ta lot topildi")
-
-                lots = []
-                for row in rows:
-                    # Faqat aktiv lotlar
-                    status = row.get("status", "") if isinstance(row, dict) else ""
-                    if status in ("finished", "completed"):
-                        continue
-
-                    if isinstance(row, dict):
-                        lot = Lot.from_api_data(row)
-                        storage.save_lot(lot)
-                        lots.append(lot)
-                    else:
-                        logger.debug("Skipping non-dict row from API response")
-
-                logger.info(f"📦 Aktiv lotlar: {len(lots)} ta")
-                return lots
-                
-        except Exception as e:
-            logger.error(f"❌ Lotlarni olishda xato: {e}", exc_info=True)
-            return []
+
+        status, data = await self._request_json("POST", "/lots", json=payload)
+        if status != 200:
+            logger.error(f"❌ API xatolik: {status}")
+            logger.error(f"Response: {str(data)[:500]}")
+            raise APIError(f"/lots status {status}")
+
+        # Try to extract rows from common response shapes
+        rows = data.get("rows") if isinstance(data, dict) else None
+        if not rows:
+            for key in ("data", "result", "items", "rows", "lots"):
+                candidate = data.get(key) if isinstance(data, dict) else None
+                if isinstance(candidate, list):
+                    rows = candidate
+                    logger.debug(f"API fallback: used key '{key}' for rows extraction")
+                    break
+
+        if rows is None:
+            # If no list found, ensure we have empty list and log response for debugging
+            rows = []
+            logger.debug(f"API returned non-list payload for lots: {str(data)[:1000]}")
+
+        logger.info(f"✅ API Success: {len(rows)} ta lot topildi")
+
+        lots = []
+        for row in rows:
+            # Faqat aktiv lotlar
+            status = row.get("status", "") if isinstance(row, dict) else ""
+            if status in ("finished", "completed"):
+                continue
+
+            if isinstance(row, dict):
+                # Ro'yxat: rasmlar/xususiyatlar lot ochilganda tahlil qilinadi
+                lots.append(Lot.from_api_data(row, lazy=True))
+            else:
+                logger.debug("Skipping non-dict row from API response")
+
+        logger.info(f"📦 Aktiv lotlar: {len(lots)} ta")
+        storage.index_lots(lots)
+        return lots
+
+    async def fetch_catalog_page(
+        self, groups_id: str, categories_id: int, region_id: int, page: int, per_page: int,
+    ) -> List[Lot]:
+        """
+        Katalog sinxronizatsiyasi uchun sahifa: keshsiz, talab hisoblanmaydi; xatoda APIError.
+        Circuit to'liq yopiq bo'lmasa so'rov yuborilmaydi — half_open sinovi foydalanuvchi so'roviga qoladi.
+        """
+        if self.breaker.state != CircuitBreaker.CLOSED:
+            raise CircuitOpenError("e-auksion.uz tiklanmagan — sinxronizatsiya kutadi")
+        payload = self._lots_payload(groups_id, categories_id, page, per_page, region_id, None)
+        return await self._fetch_lots(payload, groups_id, categories_id, region_id)
+
+    async def prefetch_lots(
+        self,
+        groups_id: str,
+        categories_id: int,
+        page: int = 1,
+        per_page: int = ITEMS_PER_PAGE,
+        region_id: int = None,
+        area_id: int = None,
+        min_ttl: float = 0,
+    ) -> bool:
+        """
+        Ro'yxat sahifasini keshga oldindan yuklash.
+        Foydalanuvchi talabi (demand) va kesh hit/miss metrikalariga qo'shilmaydi.
+        Keshda min_ttl dan ko'p vaqt qolgan bo'lsa yoki circuit ochiq bo'lsa — o'tkazib yuboriladi.
+        """
+        if self.breaker.state != CircuitBreaker.CLOSED:
+            return False
+        payload = self._lots_payload(groups_id, categories_id, page, per_page, region_id, area_id)
+        cache_key = self._payload_key(payload)
+        if self.lots_cache.ttl_remaining(cache_key) > min_ttl:
+            return False
+        await self.lots_cache.refresh(
+            cache_key,
+            lambda: self._fetch_lots(payload, groups_id, categories_id, region_id)
+        )
+        return True
+
+    def popular_requests(self, limit: int) -> List[Tuple[tuple, float]]:
+        """Eng ko'p so'ralgan ro'yxat sahifalari"""
+        return self.demand.most_common(limit)
+
+    def decay_demand(self, factor: float):
+        """Eski talabni susaytirish — yaqinda so'ralganlar ustun bo'ladi"""
+        for key, count in list(self.demand.items()):
+            count *= factor
+            if count < 0.5:
+                del self.demand[key]
+            else:
+                self.demand[key] = count
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Ro'yxat keshi metrikalari (hit/miss/coalesced)"""
+        return self.lots_cache.stats()
+
+    def detail_cache_stats(self) -> Dict[str, Any]:
+        """Lot detail keshi metrikalari (hit/stale/fallback)"""
+        return self.detail_cache.stats()
+
+    def breaker_stats(self) -> Dict[str, Any]:
+        """Circuit breaker holati"""
+        return self.breaker.stats()
+
+    def limiter_stats(self) -> Dict[str, Any]:
+        """Upstream navbati holati"""
+        return self.limiter.stats()
     
     async def get_lots_by_category_and_region(
         self,
@@ -152,53 +537,106 @@ class AuksionAPIV2:
         )
     
     async def get_lot_detail(self, lot_id: int) -> Optional[Lot]:
-        """Lot batafsil ma'lumotlarini olish"""
-        session = await self._get_session()
-        
+        """
+        Lot batafsil ma'lumotlarini olish.
+        DETAIL_SOFT_TTL ichida keshdan; undan keyin eski nusxa darhol beriladi
+        va fonda yangilanadi. Upstream sekin yoki xato bo'lsa ham eski nusxa qaytadi.
+        """
         try:
-            url = f"{API_BASE_URL}/lot-info"
-            params = {"lot_id": lot_id, "lang": "uz"}
-            
-            logger.info(f"📤 Lot detail request: {lot_id}")
-            
-            async with session.get(url, params=params) as response:
-                if response.status != 200:
-                    logger.error(f"❌ Lot {lot_id} uchun xatolik: {response.status}")
-                    return None
-                
-                data = await response.json()
-                lot = Lot.from_api_data(data)
-                
-                # Rasmlarni qo'shish
-                images_data = data.get("images", []) + data.get("gallery", [])
-                
-                if data.get("file_hash"):
-                    images_data.insert(0, {
-                        "file_hash": data["file_hash"],
-                        "file_name": "main_image"
-                    })
-                
-                for img_data in images_data:
-                    if img_data.get("file_hash"):
-                        image = LotImage(
-                            file_hash=img_data["file_hash"],
-                            file_name=img_data.get("file_name")
-                        )
-                        lot.images.append(image)
-                
-                storage.save_lot(lot)
-                logger.info(f"✅ Lot {lot_id} detail: {len(lot.images)} ta rasm")
-                
-                return lot
-                
+            lot = await self.detail_cache.get_or_load(lot_id, lambda: self._fetch_lot_detail(lot_id))
         except Exception as e:
+            # Upstream ishlamasa — ro'yxatdan kelgan nusxa (bo'lsa)
             logger.error(f"❌ Lot {lot_id} ma'lumotlarini olishda xato: {e}")
+            return storage.get_lot(lot_id)
+
+        if lot:
+            storage.save_lot(lot)
+        return lot
+
+    async def _fetch_lot_detail(self, lot_id: int) -> Optional[Lot]:
+        """/lot-info ga haqiqiy so'rov; topilmasa None, xatoda APIError"""
+        params = {"lot_id": lot_id, "lang": "uz"}
+
+        logger.info(f"📤 Lot detail request: {lot_id}")
+
+        status, data = await self._request_json("GET", "/lot-info", params=params)
+        if status == 404:
             return None
-    
-    async def search_lots(self, query: str) -> List[Lot]:
-        """Lotlarni qidirish"""
+        if status != 200:
+            logger.error(f"❌ Lot {lot_id} uchun xatolik: {status}")
+            raise APIError(f"/lot-info status {status}")
+
+        lot = Lot.from_api_data(data)
+
+        # Rasmlarni qo'shish
+        images_data = data.get("images", []) + data.get("gallery", [])
+
+        if data.get("file_hash"):
+            images_data.insert(0, {
+                "file_hash": data["file_hash"],
+                "file_name": "main_image"
+            })
+
+        extra_images = [
+            LotImage(file_hash=img_data["file_hash"], file_name=img_data.get("file_name"))
+            for img_data in images_data
+            if img_data.get("file_hash")
+        ]
+        if extra_images:
+            # lot.images umumiy bo'sh tuple bo'lishi mumkin — yangi ro'yxat tayinlanadi
+            lot.images = [*lot.images, *extra_images]
+
+        logger.info(f"✅ Lot {lot_id} detail: {len(lot.images)} ta rasm")
+        storage.index_lots([lot])
+        return lot
+
+    async def download_image(self, image: LotImage, max_bytes: int = IMAGE_MAX_DOWNLOAD_BYTES) -> bytes:
+        """
+        Rasm faylini yuklash (rasm proksi uchun). Boshqa host — circuit breakerga ta'sir qilmaydi,
+        lekin UpstreamLimiter orqali o'tadi. Xatoda APIError.
+        """
         session = await self._get_session()
-        
+        timeout = aiohttp.ClientTimeout(total=IMAGE_DOWNLOAD_TIMEOUT, connect=API_CONNECT_TIMEOUT)
+        try:
+            async with self.limiter.slot(), session.get(image.get_url(), timeout=timeout) as response:
+                if response.status != 200:
+                    raise APIError(f"rasm {image.file_hash}: status {response.status}")
+                if (response.content_length or 0) > max_bytes:
+                    raise APIError(f"rasm {image.file_hash}: juda katta ({response.content_length} bayt)")
+                chunks = []
+                size = 0
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise APIError(f"rasm {image.file_hash}: {max_bytes} baytdan katta")
+                    chunks.append(chunk)
+                return b"".join(chunks)
+        except _RETRY_EXCEPTIONS as e:
+            raise APIError(f"rasm {image.file_hash} yuklanmadi: {e!r}") from e
+
+    async def search_local(self, query: str, limit: int = SEARCH_LOCAL_LIMIT) -> List[Lot]:
+        """Bot ilgari olgan lotlar ichidan qidirish (FTS5, bm25 bo'yicha saralangan)"""
+        backend = storage.backend
+        if backend is None:
+            return []
+        try:
+            rows = await asyncio.get_running_loop().run_in_executor(None, backend.search_lots, query, limit)
+        except Exception as e:
+            logger.error(f"❌ Lokal qidiruvda xato: {e}")
+            return []
+        # Xotirada to'liq nusxa bo'lsa — o'sha, bo'lmasa indeksdagi qisqa ma'lumot
+        return [storage.get_lot(row['lot_id']) or lot_from_index_row(row) for row in rows]
+
+    async def search_lots(self, query: str) -> List[Lot]:
+        """
+        Lotlarni qidirish: avval lokal indeks, natija bo'lmasa upstream.
+        Upstream natijalari indeksga qo'shiladi.
+        """
+        lots = await self.search_local(query)
+        if lots:
+            logger.info(f"⚡ Lokal qidiruv: '{query}' — {len(lots)} ta lot")
+            return lots
+
         payload = {
             "sort_type": 1,
             "confiscant_groups_id": None,
@@ -228,27 +666,27 @@ class AuksionAPIV2:
         logger.info(f"🔍 Search request: '{query}'")
         
         try:
-            async with session.post(f"{API_BASE_URL}/lots", json=payload) as response:
-                if response.status != 200:
-                    logger.error(f"❌ Search xatolik: {response.status}")
-                    return []
-                
-                data = await response.json()
-                rows = data.get("rows", [])
-                
-                logger.info(f"✅ Search natija: {len(rows)} ta lot")
-                
-                lots = []
-                for row in rows:
-                    status = row.get("status", "")
-                    if status == "finished" or status == "completed":
-                        continue
-                    
-                    lot = Lot.from_api_data(row)
-                    storage.save_lot(lot)
-                    lots.append(lot)
+            status, data = await self._request_json("POST", "/lots", json=payload)
+            if status != 200:
+                logger.error(f"❌ Search xatolik: {status}")
+                return []
+            
+            rows = data.get("rows", [])
+            
+            logger.info(f"✅ Search natija: {len(rows)} ta lot")
+            
+            lots = []
+            for row in rows:
+                status = row.get("status", "")
+                if status == "finished" or status == "completed":
+                    continue
                 
-                return lots
+                lot = Lot.from_api_data(row, lazy=True)
+                storage.save_lot(lot)
+                lots.append(lot)
+
+            storage.index_lots(lots)
+            return lots
                 
         except Exception as e:
             logger.error(f"❌ Qidirishda xato: {e}")
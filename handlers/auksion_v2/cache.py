@@ -0,0 +1,249 @@
+"""
+E-Auksion.uz V2 - Javoblar keshi
+TTL + LRU bilan cheklangan xotira keshi va single-flight:
+bir xil kalit uchun bir vaqtda kelgan so'rovlar bitta upstream chaqiruvni kutadi.
+SWRCache — stale-while-revalidate: eskirgan nusxa darhol qaytariladi,
+yangilash fonda bajariladi; upstream sekin/xato bo'lsa eski nusxa beriladi.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+class _SingleFlight:
+    """Bir kalit uchun bitta yuklash vazifasi (task) — qolganlar shu natijani kutadi"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def _start_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._load_done(key, t))
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Yuklash; keshlar natijani saqlash uchun qayta aniqlaydi"""
+        return await loader()
+
+    def _load_done(self, key: Hashable, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # hech kim kutmagan bo'lsa ham xato "retrieved" bo'ladi
+
+
+class TTLCache(_SingleFlight):
+    """Cheklangan o'lchamli, muddatli (TTL) LRU kesh"""
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        super().__init__()
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        # kalit -> (tugash_vaqti, qiymat); oxirgi element — eng yangi ishlatilgan
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expired = 0
+        self.stale_served = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Keshdan olish; yo'q yoki muddati o'tgan bo'lsa MISSING"""
+        entry = self._data.get(key)
+        if entry is None:
+            return MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            # Muddati o'tgan yozuv LRU chiqarib yuborguncha get_stale() uchun qoladi
+            self.expired += 1
+            return MISSING
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get_stale(self, key: Hashable) -> Any:
+        """Muddatidan qat'i nazar oxirgi qiymat (upstream ishlamaganda zaxira)"""
+        entry = self._data.get(key)
+        if entry is None:
+            return MISSING
+        self.stale_served += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def ttl_remaining(self, key: Hashable) -> float:
+        """Yozuv yana qancha yangi hisoblanadi (yo'q/eskirgan bo'lsa 0); metrikaga ta'sir qilmaydi"""
+        entry = self._data.get(key)
+        return max(0.0, entry[0] - time.monotonic()) if entry else 0.0
+
+    async def refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Fonda oldindan yuklash: hit/miss metrikalarini o'zgartirmaydi, single-flight saqlanadi"""
+        return await asyncio.shield(self._start_load(key, loader))
+
+    def clear(self):
+        self._data.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Keshdan qaytarish yoki loader() orqali yuklash.
+        Bir kalit uchun parallel chaqiruvlar bitta loader natijasini kutadi (single-flight).
+        loader xato bersa — hech narsa keshlanmaydi, xato barcha kutayotganlarga uzatiladi.
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+
+        if key in self._inflight:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        # shield: bitta foydalanuvchi bekor qilsa, boshqalar uchun yuklash davom etadi
+        return await asyncio.shield(self._start_load(key, loader))
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        self.set(key, value)
+        return value
+
+    def stats(self) -> dict:
+        """Kesh holati (monitoring uchun)"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            'name': self.name,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+            'expired': self.expired,
+            'stale_served': self.stale_served,
+            'inflight': len(self._inflight),
+            'hit_rate': round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
+
+
+class SWRCache(_SingleFlight):
+    """
+    Stale-while-revalidate LRU kesh.
+    - yoshi < soft_ttl: darhol qaytariladi
+    - soft_ttl <= yoshi < hard_ttl: eski nusxa darhol qaytariladi, fonda yangilanadi
+    - yoshi >= hard_ttl: upstream kutiladi (ko'pi bilan stale_timeout),
+      kechiksa yoki xato bo'lsa — eski nusxa qaytariladi
+    loader None qaytarsa (topilmadi) — keshlanmaydi.
+    """
+
+    def __init__(self, name: str, maxsize: int, soft_ttl: float, hard_ttl: float, stale_timeout: float):
+        super().__init__()
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = max(soft_ttl, hard_ttl)
+        self.stale_timeout = stale_timeout
+        # kalit -> (saqlangan_vaqt, qiymat)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.fallbacks = 0
+        self.evictions = 0
+
+    def peek(self, key: Hashable) -> Any:
+        """Yoshidan qat'i nazar keshdagi qiymat (yo'q bo'lsa MISSING)"""
+        entry = self._data.get(key)
+        return MISSING if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._data.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            self._data.move_to_end(key)
+            if age < self.soft_ttl:
+                self.hits += 1
+                return value
+            if age < self.hard_ttl:
+                self.stale_hits += 1
+                self._revalidate(key, loader)
+                return value
+
+        self.misses += 1
+        task = self._start_load(key, loader)
+        if entry is None:
+            return await asyncio.shield(task)
+
+        # Juda eski nusxa bor: upstreamni qisqa kutamiz, bo'lmasa eski nusxa
+        try:
+            value = await asyncio.wait_for(asyncio.shield(task), self.stale_timeout)
+        except Exception as e:
+            self.fallbacks += 1
+            logger.warning(f"⚠️ {self.name} keshi: {key} uchun eski nusxa berildi ({type(e).__name__})")
+            return entry[1]
+        return entry[1] if value is None else value
+
+    def _revalidate(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        """Fonda yangilash (kalit bo'yicha bittadan ortiq emas)"""
+        if key in self._inflight:
+            return
+        self.refreshes += 1
+        self._start_load(key, loader)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.warning(f"⚠️ {self.name} keshi: {key} yangilanmadi: {e}")
+            raise
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def stats(self) -> dict:
+        """Kesh holati (monitoring uchun)"""
+        return {
+            'name': self.name,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'soft_ttl': self.soft_ttl,
+            'hard_ttl': self.hard_ttl,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'refresh_errors': self.refresh_errors,
+            'fallbacks': self.fallbacks,
+            'evictions': self.evictions,
+            'inflight': len(self._inflight),
+        }
@@ -1,6 +1,7 @@
 """
 E-Auksion.uz V2 - Yangi konfiguratsiya
 """
+from os import getenv
 
 # API endpoints
 API_BASE_URL = "https://e-auksion.uz/api/front"
@@ -13,12 +14,115 @@ API_HEADERS = {
     "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
 }
 
+# HTTP timeout va retry siyosati
+API_CONNECT_TIMEOUT = 5         # ulanish (soniya)
+API_REQUEST_TIMEOUT = 10        # bitta urinish (soniya)
+API_TOTAL_TIMEOUT = 25          # barcha urinishlar jami (soniya)
+API_MAX_RETRIES = 3             # 5xx / ulanish xatosida qayta urinishlar
+API_BACKOFF_BASE = 0.5          # exponential backoff boshlang'ich qiymati (soniya)
+API_BACKOFF_MAX = 8.0
+
+# Ulanishlar puli (aiohttp.TCPConnector)
+API_CONNECTION_LIMIT = 20       # jami ochiq ulanishlar
+API_LIMIT_PER_HOST = 10         # e-auksion.uz ga bir vaqtda
+API_DNS_CACHE_TTL = 300         # DNS natijasi keshi (soniya)
+API_KEEPALIVE_TIMEOUT = 30      # bo'sh ulanishni ochiq ushlab turish (soniya)
+
+# Upstream yuklamasini cheklash: bir vaqtdagi so'rovlar + token bucket
+API_MAX_CONCURRENCY = 8         # bir vaqtda upstreamga ketayotgan so'rovlar
+API_RATE_PER_SECOND = 10        # o'rtacha so'rov/soniya
+API_RATE_BURST = 20             # qisqa portlashda ruxsat etilgan so'rovlar
+API_QUEUE_TIMEOUT = 5.0         # navbatda kutishning yuqori chegarasi (soniya)
+
+# Circuit breaker: ketma-ket shuncha xatodan keyin upstream vaqtincha chaqirilmaydi
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30      # shundan keyin bitta sinov so'rovi (half-open)
+
 # Pagination
 ITEMS_PER_PAGE = 10
 MAX_IMAGES_PER_LOT = 20
 
+# Albom (sendMediaGroup) galereyasi
+ALBUM_SIZE = 10                 # Telegram bitta albomda ko'pi bilan 10 ta media
+# Keyingi albom oldindan tayyorlanadi: standart holatda faqat rasm proksi keshi isitiladi.
+# AUKSION_ALBUM_PREFETCH_UPLOAD=1 va AUKSION_MEDIA_CHAT_ID (bot a'zo bo'lgan xizmat kanali/guruhi)
+# berilsa — rasmlar oldindan shu chatga yuboriladi, file_id olinadi va xabarlar o'chiriladi
+# (file_id si yo'q har bir albom uchun bir marta; Telegram limitlaridan foydalanadi)
+ALBUM_PREFETCH_UPLOAD = getenv("AUKSION_ALBUM_PREFETCH_UPLOAD", "0") in ("1", "true", "yes")
+ALBUM_PREFETCH_CHAT_ID = int(getenv("AUKSION_MEDIA_CHAT_ID", 0))
+
+# Rasm proksi: lot rasmi bir marta yuklanadi, kichraytiriladi va diskda saqlanadi;
+# Telegramga URL o'rniga tayyor bayt yuboriladi (birinchi marta, keyin file_id)
+IMAGE_PROXY_ENABLED = getenv("AUKSION_IMAGE_PROXY", "1") not in ("0", "false", "no")
+IMAGE_CACHE_DIR = getenv("AUKSION_IMAGE_CACHE_DIR", "image_cache")
+IMAGE_CACHE_MAX_BYTES = int(getenv("AUKSION_IMAGE_CACHE_MAX_BYTES", 512 * 1024 * 1024))  # 512 MB
+IMAGE_MAX_SIDE = 1280           # Telegram rasmni baribir shu o'lchamgacha kichraytiradi
+IMAGE_JPEG_QUALITY = 82
+IMAGE_DOWNLOAD_TIMEOUT = 20     # bitta rasmni yuklash (soniya)
+IMAGE_MAX_DOWNLOAD_BYTES = 30 * 1024 * 1024  # bundan katta asl rasm yuklanmaydi
+IMAGE_MAX_UPLOAD_BYTES = 10 * 1024 * 1024    # Telegram sendPhoto chegarasi
+# Fonda isitish (keyingi albom) past ustuvorlikda: bir vaqtda ko'pi bilan shuncha yuklash,
+# limiter'da foydalanuvchilar zaxirasi bo'sh bo'lmasa rasm o'tkazib yuboriladi
+IMAGE_WARM_CONCURRENCY = 2
+IMAGE_WARM_RESERVE_TOKENS = API_RATE_BURST // 2
+IMAGE_WARM_RESERVE_SLOTS = API_MAX_CONCURRENCY // 2
+
 # Cache vaqti (soniyalarda)
 CACHE_TTL = 300  # 5 daqiqa (faqat yaqinlashayotgan lotlar uchun)
+LOTS_CACHE_MAX_ENTRIES = 512  # ro'yxat sahifalari keshi (LRU)
+
+# Oldindan yuklash (prefetch): mashhur (kategoriya, viloyat, sahifa) kombinatsiyalari
+PREFETCH_INTERVAL = 240         # sikllar orasidagi vaqt (soniya), CACHE_TTL dan kam
+PREFETCH_TOP_N = 20             # har siklda nechta eng ko'p so'ralgan sahifa
+PREFETCH_MAX_PAGE = 3           # faqat birinchi sahifalar
+PREFETCH_MIN_TTL = 60           # keshda shundan ko'p vaqt qolgan sahifa qayta yuklanmaydi
+PREFETCH_DEMAND_DECAY = 0.5     # har siklda talab hisoblagichi shu koeffitsiyentga ko'paytiriladi
+# Hali statistika yo'q paytda (ishga tushganda) isitiladigan kategoriyalar
+PREFETCH_SEED_CATEGORIES = ("kop_qavatli", "turar_joy_uchastka", "tadbirkorlik", "yakka_uy")
+
+# Katalog sinxronizatsiyasi: CATEGORY_FILTERS x viloyatlar lokal jadvalga
+SYNC_INTERVAL = 900             # sikllar orasidagi vaqt (soniya)
+SYNC_PAGE_SIZE = 50             # bitta so'rovdagi lotlar soni
+SYNC_MAX_PAGES = 20             # bitta bo'lim uchun ko'pi bilan sahifa
+SYNC_REQUEST_DELAY = 0.2        # so'rovlar orasidagi pauza — foydalanuvchi so'rovlariga joy qoladi
+SYNC_FULL_INTERVAL = 6 * 3600   # to'liq aylanish (tugagan lotlarni o'chirish) oralig'i
+SYNC_MAX_STALENESS = 3 * SYNC_INTERVAL  # bo'lim shundan eski bo'lsa ro'yxat upstreamdan olinadi
+# Inkremental sinxronizatsiya chuqur sahifalarni qayta ko'rmaydi — lot shuncha vaqt
+# upstream ro'yxatida ko'rinmasa (to'liq aylanishlar ham topmagan) eskirgan hisoblanadi
+SYNC_LOT_MAX_UNSEEN = SYNC_FULL_INTERVAL + SYNC_MAX_STALENESS
+# Sinxronizatsiya UpstreamLimiter'ni foydalanuvchilar bilan bo'lishadi, lekin past ustuvorlikda:
+# bucket'da shuncha token va shuncha bo'sh slot foydalanuvchilar uchun qoldiriladi
+SYNC_RESERVE_TOKENS = API_RATE_BURST // 2
+SYNC_RESERVE_SLOTS = API_MAX_CONCURRENCY // 2
+SYNC_BUDGET_POLL = 0.5          # zaxira bo'shaguncha tekshirish oralig'i (soniya)
+SYNC_BUDGET_MAX_WAIT = 60       # shuncha kutib ham joy bo'lmasa sikl keyinga qoldiriladi
+# Lokal ro'yxatlarda ko'rsatilmaydigan holatlar (kichik harflarda)
+SYNC_INACTIVE_STATUSES = (
+    "finished", "completed", "cancelled", "canceled",
+    "savdo yakunlangan", "yakunlangan", "bekor qilingan", "sotilgan",
+)
+
+# Matn bo'yicha qidiruv: avval lokal FTS indeks, topilmasa upstream
+SEARCH_LOCAL_LIMIT = 50         # lokal indeksdan qaytariladigan natijalar soni
+
+# Narx bo'yicha qidiruv: bir nechta kategoriyaga parallel so'rov
+SEARCH_PRICE_PER_PAGE = 50      # har bir kategoriyadan olinadigan lotlar soni
+SEARCH_PRICE_CONCURRENCY = 4    # bir vaqtda nechta kategoriya so'raladi
+SEARCH_PRICE_MAX_RESULTS = 100  # birlashtirilgan natijalar chegarasi
+
+# Sevimlilar: faqat ko'rinayotgan sahifadagi lotlar olinadi
+FAVORITES_FETCH_CONCURRENCY = 4  # bir vaqtda nechta lot detail so'raladi
+
+# Lot detail keshi (stale-while-revalidate)
+DETAIL_SOFT_TTL = 60            # shundan keyin fonda yangilanadi
+DETAIL_HARD_TTL = CACHE_TTL     # shundan keyin upstream kutiladi
+DETAIL_STALE_TIMEOUT = 3.0      # upstream shuncha kechiksa — eski nusxa beriladi
+DETAIL_CACHE_MAX_ENTRIES = 2048
+
+# storage.lots chegaralari (LRU)
+LOT_STORE_MAX_ENTRIES = 5000
+LOT_STORE_MAX_BYTES = 64 * 1024 * 1024   # 64 MB
+LOT_STORE_MAX_AGE = 6 * 60 * 60          # 6 soat
 
 # Format
 DATE_FORMAT = "%d.%m.%Y %H:%M"
@@ -6,19 +6,23 @@ YANGILANGAN:
   - "Mening arizalarim" bo'limi
   - Narx kuzatish
 """
+import asyncio
 import logging
 import os
 from datetime import datetime
+from typing import Optional
 
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, InputMediaPhoto
+from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from aiogram.filters import Command
 
 from .categories import MAIN_CATEGORIES, SUB_CATEGORIES, CATEGORY_FILTERS, get_breadcrumb
-from .config import ITEMS_PER_PAGE, MSG_LOT_NOT_FOUND, MSG_ERROR
+from .config import ITEMS_PER_PAGE, ALBUM_SIZE, FAVORITES_FETCH_CONCURRENCY, MSG_LOT_NOT_FOUND, MSG_ERROR
 from .models import Lot, UserFavorite, UserApplication, storage
-from .api import api_client
+from .api import APIError, api_client
+from .media import photo_sender, album_count, album_images
+from .sync import catalog_sync
 from .utils import format_price, paginate_list, clean_text
 from .keyboards import (
     get_auksion_main_keyboard,
@@ -26,6 +30,7 @@ from .keyboards import (
     get_lots_list_keyboard,
     get_lot_detail_keyboard,
     get_image_navigation_keyboard,
+    get_album_navigation_keyboard,
     get_favorites_keyboard,
     get_back_to_main_keyboard,
     get_my_applications_keyboard,
@@ -123,7 +128,7 @@ async def callback_lots_page(callback: CallbackQuery, state: FSMContext):
     area_id   = data.get("filter_area_id")      # None = barcha tumanlar
 
     await callback.message.edit_text("⏳ Yuklanmoqda...")
-    lots = await api_client.get_lots_by_category(
+    lots = await catalog_sync.get_lots(
         groups_id=filter_data["groups_id"],
         categories_id=filter_data["categories_id"],
         region_id=region_id,
@@ -168,7 +173,7 @@ async def callback_back_to_lots(callback: CallbackQuery, state: FSMContext):
     area_id   = data.get("filter_area_id")
 
     await callback.message.edit_text("⏳ Yuklanmoqda...")
-    lots = await api_client.get_lots_by_category(
+    lots = await catalog_sync.get_lots(
         groups_id=filter_data["groups_id"],
         categories_id=filter_data["categories_id"],
         region_id=region_id,
@@ -241,8 +246,8 @@ async def callback_view_lot(callback: CallbackQuery, state: FSMContext):
                 pass
             # Rasm yuborish
             try:
-                await callback.message.answer_photo(
-                    photo=lot.images[0].get_url(),
+                await photo_sender.send(
+                    callback.message, lot.images[0],
                     caption=caption,
                     parse_mode="HTML"
                 )
@@ -347,6 +352,11 @@ def _build_full_detail(lot: Lot) -> str:
     return text
 
 
+async def _get_lot(lot_id: int) -> Optional[Lot]:
+    """storage'dan lot; LRU dan chiqib ketgan bo'lsa — API (detail keshi) orqali"""
+    return storage.get_lot(lot_id) or await api_client.get_lot_detail(lot_id)
+
+
 # ============================================================================
 # RASMLAR GALEREYASI
 # ============================================================================
@@ -359,7 +369,7 @@ async def callback_view_images(callback: CallbackQuery):
     main_cat = parts[4] if len(parts) > 4 else "kochmas_mulk"
     sub_cat  = parts[5] if len(parts) > 5 else "kop_qavatli"
 
-    lot = storage.get_lot(lot_id)
+    lot = await _get_lot(lot_id)
     if not lot or not lot.images:
         await callback.answer("Rasmlar topilmadi", show_alert=True)
         return
@@ -379,17 +389,17 @@ async def callback_view_images(callback: CallbackQuery):
 
     try:
         if callback.message.photo:
-            await callback.message.edit_media(
-                media=InputMediaPhoto(media=image.get_url(), caption=caption, parse_mode="HTML"),
-                reply_markup=keyboard
+            await photo_sender.edit(
+                callback.message, image, caption=caption,
+                parse_mode="HTML", reply_markup=keyboard
             )
         else:
             try:
                 await callback.message.delete()
             except Exception:
                 pass
-            await callback.message.answer_photo(
-                photo=image.get_url(), caption=caption,
+            await photo_sender.send(
+                callback.message, image, caption=caption,
                 reply_markup=keyboard, parse_mode="HTML"
             )
     except Exception as e:
@@ -399,6 +409,53 @@ async def callback_view_images(callback: CallbackQuery):
     await callback.answer()
 
 
+@router.callback_query(F.data.startswith("auk2:album:"))
+async def callback_view_album(callback: CallbackQuery):
+    """Rasmlar ALBUM_SIZE tadan albom bo'lib; navigatsiya albom ostidagi xabarda"""
+    parts = callback.data.split(":")
+    lot_id  = int(parts[2])
+    album   = int(parts[3])
+    main_cat = parts[4] if len(parts) > 4 else "kochmas_mulk"
+    sub_cat  = parts[5] if len(parts) > 5 else "kop_qavatli"
+
+    lot = await _get_lot(lot_id)
+    if not lot or not lot.images:
+        await callback.answer("Rasmlar topilmadi", show_alert=True)
+        return
+    total_albums = album_count(len(lot.images))
+    if album >= total_albums:
+        await callback.answer("Rasm topilmadi", show_alert=True)
+        return
+    # Albom yuborilguncha tugma "aylanib" turmasin
+    await callback.answer()
+
+    images     = album_images(lot.images, album)
+    first      = album * ALBUM_SIZE
+    breadcrumb = get_breadcrumb(main_cat, sub_cat)
+    caption    = (
+        f"📂 <b>{breadcrumb}</b>\n\n"
+        f"🖼 <b>Rasmlar {first + 1}-{first + len(images)}/{len(lot.images)}</b>\n\n"
+        f"<b>{lot.name[:80]}</b>\n"
+        f"💰 {format_price(lot.current_price or lot.start_price)}"
+    )
+    keyboard = get_album_navigation_keyboard(lot.id, album, total_albums, first, main_cat, sub_cat)
+
+    # Oldingi navigatsiya xabari albom ustida qolmasin
+    try:
+        await callback.message.delete()
+    except Exception:
+        pass
+    # Foydalanuvchi shu albomni ko'rayotganda keyingisi tayyorlanadi
+    if album + 1 < total_albums:
+        photo_sender.prefetch_album(callback.bot, lot.id, album + 1, album_images(lot.images, album + 1))
+    try:
+        await photo_sender.send_album(callback.bot, callback.message.chat.id, images, caption)
+        await callback.message.answer(f"🖼 Albom {album + 1}/{total_albums}", reply_markup=keyboard)
+    except Exception as e:
+        logger.error(f"Albom xato: {e}")
+        await callback.message.answer(caption, reply_markup=keyboard, parse_mode="HTML")
+
+
 # ============================================================================
 # SEVIMLILAR
 # ============================================================================
@@ -407,7 +464,7 @@ async def callback_view_images(callback: CallbackQuery):
 async def callback_add_favorite(callback: CallbackQuery):
     parts = callback.data.split(":")
     lot_id, main_cat, sub_cat = int(parts[2]), parts[3], parts[4]
-    lot = storage.get_lot(lot_id)
+    lot = await _get_lot(lot_id)
     if not lot:
         await callback.answer("Lot topilmadi", show_alert=True)
         return
@@ -430,7 +487,7 @@ async def callback_remove_favorite(callback: CallbackQuery):
     lot_id, main_cat, sub_cat = int(parts[2]), parts[3], parts[4]
     storage.remove_favorite(callback.from_user.id, lot_id)
     await callback.answer("🗑 Sevimlilardan o'chirildi", show_alert=True)
-    lot = storage.get_lot(lot_id)
+    lot = await _get_lot(lot_id)
     if lot:
         keyboard = get_lot_detail_keyboard(lot, callback.from_user.id, main_cat, sub_cat, 1)
         if callback.message.photo:
@@ -443,10 +500,14 @@ async def callback_remove_favorite(callback: CallbackQuery):
             )
 
 
-@router.callback_query(F.data == "auk2:favorites")
-async def callback_show_favorites(callback: CallbackQuery):
-    user_id = callback.from_user.id
-    favorites = storage.get_user_favorites(user_id)
+async def _render_favorites(callback: CallbackQuery, page: int):
+    """
+    Sevimlilar sahifasi: faqat shu sahifadagi lotlar olinadi
+    (ko'pi bilan FAVORITES_FETCH_CONCURRENCY ta parallel).
+    Olib bo'lmagan lot ro'yxatdan yo'qolmaydi — o'rniga belgi qatori chiqadi.
+    """
+    # Qo'shilgan tartibda (storage tartibni saqlaydi)
+    favorites = storage.get_user_favorites(callback.from_user.id)
     if not favorites:
         await callback.message.edit_text(
             "⭐ <b>SEVIMLILAR</b>\n\nSizda hali sevimli lotlar yo'q.\n\nLotlarni ko'rib, ⭐ ni bosing!",
@@ -454,27 +515,45 @@ async def callback_show_favorites(callback: CallbackQuery):
         )
         await callback.answer()
         return
-    lots = [storage.get_lot(f.lot_id) for f in favorites]
-    lots = [l for l in lots if l]
-    if not lots:
-        await callback.message.edit_text(
-            "⭐ <b>SEVIMLILAR</b>\n\nSevimli lotlar topilmadi.",
-            reply_markup=get_back_to_main_keyboard(), parse_mode="HTML"
-        )
-        await callback.answer()
-        return
-    page_lots, total_pages, _, _ = paginate_list(lots, 1, ITEMS_PER_PAGE)
+    total_pages = (len(favorites) + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
+    page = min(max(page, 1), total_pages)
+    page_favorites, _, _, _ = paginate_list(favorites, page, ITEMS_PER_PAGE)
+    semaphore = asyncio.Semaphore(FAVORITES_FETCH_CONCURRENCY)
+
+    async def fetch(lot_id: int) -> Optional[Lot]:
+        async with semaphore:
+            try:
+                return await _get_lot(lot_id)
+            except APIError as e:
+                logger.warning(f"⚠️ Sevimli lot {lot_id} olinmadi: {e}")
+                return None
+
+    lots = await asyncio.gather(*(fetch(f.lot_id) for f in page_favorites))
+    items = [(f.lot_id, lot) for f, lot in zip(page_favorites, lots)]
+    failed = sum(1 for lot in lots if lot is None)
+    text = f"⭐ <b>SEVIMLILAR</b>\n\n📦 Jami: {len(favorites)} ta lot\n\nLotni tanlang:"
+    if failed:
+        text += f"\n\n⚠️ {failed} ta lot hozircha yuklanmadi — keyinroq qayta urinib ko'ring."
     await callback.message.edit_text(
-        f"⭐ <b>SEVIMLILAR</b>\n\n📦 Jami: {len(lots)} ta lot\n\nLotni tanlang:",
-        reply_markup=get_favorites_keyboard(page_lots, 1, total_pages), parse_mode="HTML"
+        text, reply_markup=get_favorites_keyboard(items, page, total_pages), parse_mode="HTML"
     )
     await callback.answer()
 
 
+@router.callback_query(F.data == "auk2:favorites")
+async def callback_show_favorites(callback: CallbackQuery):
+    await _render_favorites(callback, 1)
+
+
+@router.callback_query(F.data.startswith("auk2:fav_page:"))
+async def callback_favorites_page(callback: CallbackQuery):
+    await _render_favorites(callback, int(callback.data.split(":")[-1]))
+
+
 @router.callback_query(F.data.startswith("auk2:view_fav:"))
 async def callback_view_favorite_lot(callback: CallbackQuery):
     lot_id = int(callback.data.split(":")[-1])
-    lot = storage.get_lot(lot_id) or await api_client.get_lot_detail(lot_id)
+    lot = await _get_lot(lot_id)
     if not lot:
         await callback.answer("Lot topilmadi", show_alert=True)
         return
@@ -485,7 +564,7 @@ async def callback_view_favorite_lot(callback: CallbackQuery):
             await callback.message.delete()
         except Exception:
             pass
-        await callback.message.answer_photo(photo=lot.images[0].get_url(), caption=caption, parse_mode="HTML")
+        await photo_sender.send(callback.message, lot.images[0], caption=caption, parse_mode="HTML")
         await callback.message.answer(
             "⭐ <b>Sevimlilar</b>\n\n" + _build_full_detail(lot),
             reply_markup=keyboard, parse_mode="HTML"
@@ -603,7 +682,7 @@ async def callback_apply_start(callback: CallbackQuery, state: FSMContext):
     main_cat = parts[3] if len(parts) > 3 else ""
     sub_cat  = parts[4] if len(parts) > 4 else ""
 
-    lot = storage.get_lot(lot_id)
+    lot = await _get_lot(lot_id)
     if not lot:
         await callback.answer("Lot topilmadi", show_alert=True)
         return
@@ -0,0 +1,259 @@
+"""
+E-Auksion.uz V2 - Rasm proksi
+Lot rasmi upstreamdan bir marta yuklanadi, Telegram uchun kichraytiriladi
+(Pillow o'rnatilgan bo'lsa) va diskda file_hash bo'yicha saqlanadi.
+Telegramga URL o'rniga tayyor bayt yuboriladi — katta asl rasmlarni
+Telegram o'zi yuklay olmay qoladigan holatlar bo'lmaydi.
+Kesh hajmi IMAGE_CACHE_MAX_BYTES dan oshsa, eng uzoq ishlatilmagan fayllar o'chiriladi.
+"""
+import asyncio
+import hashlib
+import io
+import logging
+import os
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Set
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow yo'q — rasm o'zgartirilmasdan saqlanadi
+    Image = None
+
+from .api import api_client
+from .cache import _SingleFlight
+from .config import (
+    IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES, IMAGE_MAX_SIDE, IMAGE_JPEG_QUALITY, IMAGE_MAX_UPLOAD_BYTES,
+    IMAGE_WARM_CONCURRENCY, IMAGE_WARM_RESERVE_TOKENS, IMAGE_WARM_RESERVE_SLOTS,
+)
+from .models import LotImage
+
+logger = logging.getLogger(__name__)
+
+# Chegaradan oshganda kesh shu ulushgacha tozalanadi (har yozishda o'chirish bo'lmasin)
+_EVICT_TARGET = 0.9
+
+
+def prepare_image(raw: bytes) -> Optional[bytes]:
+    """
+    Telegramga yuboriladigan JPEG: eng katta tomoni IMAGE_MAX_SIDE gacha, EXIF burilishi hisobga olinadi.
+    Allaqachon mos JPEG o'zgartirilmaydi. Rasm bo'lmasa yoki yuborib bo'lmasa — None.
+    """
+    if Image is None:
+        return raw if len(raw) <= IMAGE_MAX_UPLOAD_BYTES else None
+    try:
+        with Image.open(io.BytesIO(raw)) as original:
+            if (original.format == "JPEG" and max(original.size) <= IMAGE_MAX_SIDE
+                    and len(raw) <= IMAGE_MAX_UPLOAD_BYTES):
+                return raw
+            image = ImageOps.exif_transpose(original)
+            if image.mode in ("RGBA", "LA", "P"):
+                # Shaffof fon oq rangga
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+            image.thumbnail((IMAGE_MAX_SIDE, IMAGE_MAX_SIDE), Image.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, "JPEG", quality=IMAGE_JPEG_QUALITY, optimize=True, progressive=True)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.warning(f"⚠️ Rasmni qayta ishlab bo'lmadi: {e}")
+        return None
+    data = output.getvalue()
+    return data if len(data) <= IMAGE_MAX_UPLOAD_BYTES else None
+
+
+class ImageCache(_SingleFlight):
+    """file_hash bo'yicha diskdagi rasm keshi (LRU, hajm bilan cheklangan)"""
+
+    def __init__(self, directory: str = IMAGE_CACHE_DIR, max_bytes: int = IMAGE_CACHE_MAX_BYTES, client=api_client):
+        super().__init__()
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.client = client
+        # fayl yo'li -> hajmi; oxirgi element — eng yangi ishlatilgan.
+        # Faqat event loop thread'ida o'zgartiriladi, disk amallari executor'da
+        self._files: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._scanned = False
+        self._scan_lock = asyncio.Lock()
+        self._warming: Set[asyncio.Task] = set()
+        self._warm_semaphore = asyncio.Semaphore(IMAGE_WARM_CONCURRENCY)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.evictions = 0
+        self.warm_skipped = 0
+        self.downloaded_bytes = 0
+        self.stored_bytes = 0
+
+    def path_for(self, file_hash: str) -> str:
+        # file_hash ichida fayl nomiga yaroqsiz belgilar bo'lishi mumkin
+        digest = hashlib.sha1(file_hash.encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.jpg")
+
+    async def _in_thread(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    # ------------------------------------------------------------------
+    # Disk (executor thread'da)
+    # ------------------------------------------------------------------
+
+    def _scan_files(self) -> List[tuple]:
+        """Oldingi ishga tushirishdan qolgan fayllar, mtime bo'yicha (eng eskisi birinchi)"""
+        entries = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    if name.endswith(".tmp"):
+                        os.remove(path)  # yozish yarmida to'xtagan
+                        continue
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path, stat.st_size))
+        entries.sort()
+        return entries
+
+    @staticmethod
+    def _read_file(path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # LRU tartibi qayta ishga tushganda ham saqlanadi
+            return data
+        except OSError:
+            return None
+
+    @staticmethod
+    def _write_file(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _remove_files(paths: List[str]):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Kesh
+    # ------------------------------------------------------------------
+
+    async def _ensure_scanned(self):
+        if self._scanned:
+            return
+        async with self._scan_lock:
+            if self._scanned:
+                return
+            for _, path, size in await self._in_thread(self._scan_files):
+                self._files[path] = size
+                self._bytes += size
+            self._scanned = True
+            logger.info(f"💾 Rasm keshi: {len(self._files)} ta fayl, {self._bytes / 1024 / 1024:.1f} MB")
+
+    def _forget(self, path: str):
+        self._bytes -= self._files.pop(path, 0)
+
+    async def _evict(self):
+        if self._bytes <= self.max_bytes:
+            return
+        victims = []
+        while self._files and self._bytes > self.max_bytes * _EVICT_TARGET:
+            path, size = self._files.popitem(last=False)
+            self._bytes -= size
+            victims.append(path)
+        self.evictions += len(victims)
+        await self._in_thread(self._remove_files, victims)
+
+    async def get(self, image: LotImage) -> Optional[bytes]:
+        """Telegramga yuborishga tayyor rasm baytlari; yuklab/qayta ishlab bo'lmasa None"""
+        await self._ensure_scanned()
+        path = self.path_for(image.file_hash)
+        if path in self._files:
+            data = await self._in_thread(self._read_file, path)
+            if data is not None:
+                self._files.move_to_end(path)
+                self.hits += 1
+                return data
+            self._forget(path)  # fayl tashqaridan o'chirilgan
+
+        self.misses += 1
+        try:
+            return await asyncio.shield(self._start_load(image.file_hash, lambda: self._fetch(image, path)))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"⚠️ Rasm proksi: {image.file_hash} olinmadi: {e}")
+            return None
+
+    async def _fetch(self, image: LotImage, path: str) -> Optional[bytes]:
+        raw = await self.client.download_image(image)
+        self.downloaded_bytes += len(raw)
+        data = await self._in_thread(prepare_image, raw)
+        if data is None:
+            return None
+        await self._in_thread(self._write_file, path, data)
+        self._forget(path)
+        self._files[path] = len(data)
+        self._bytes += len(data)
+        self.stored_bytes += len(data)
+        await self._evict()
+        return data
+
+    def warm(self, images: Iterable[LotImage]):
+        """
+        Rasmlarni fonda keshga yuklash (keyingi albom uchun).
+        Past ustuvorlik: IMAGE_WARM_CONCURRENCY tadan, upstream band bo'lsa o'tkazib yuboriladi —
+        rasm keyin foydalanuvchi so'raganda get() orqali olinadi.
+        """
+        images = [image for image in images if self.path_for(image.file_hash) not in self._files]
+        if images:
+            task = asyncio.create_task(self._warm(images), name="image-cache-warm")
+            self._warming.add(task)
+            task.add_done_callback(self._warming.discard)
+
+    async def _warm(self, images: List[LotImage]):
+        await asyncio.gather(*(self._warm_one(image) for image in images))
+
+    async def _warm_one(self, image: LotImage):
+        async with self._warm_semaphore:
+            if self.path_for(image.file_hash) in self._files:
+                return
+            if not self.client.limiter.has_headroom(IMAGE_WARM_RESERVE_TOKENS, IMAGE_WARM_RESERVE_SLOTS):
+                self.warm_skipped += 1
+                return
+            await self.get(image)
+
+    async def stop(self):
+        tasks = set(self._warming)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'files': len(self._files),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'evictions': self.evictions,
+            'warm_skipped': self.warm_skipped,
+            'downloaded_bytes': self.downloaded_bytes,
+            'stored_bytes': self.stored_bytes,
+            'pillow': Image is not None,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Global instance
+image_cache = ImageCache()
@@ -2,9 +2,10 @@
 Auksion V2 - Keyboard tugmalari
 YANGILANGAN: get_my_applications_keyboard + asosiy menyuda "Mening arizalarim"
 """
+from functools import lru_cache
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from typing import List
+from typing import List, Optional, Tuple
 
 from .categories import MAIN_CATEGORIES, SUB_CATEGORIES
 from .config import EMOJI_BACK, EMOJI_FAVORITE, EMOJI_UNFAVORITE, EMOJI_SEARCH, EMOJI_IMAGES
@@ -12,6 +13,20 @@ from .models import Lot, storage
 from .utils import format_price, paginate_list
 
 
+# ============================================================================
+# KLAVIATURA KESHI
+# ============================================================================
+
+def cached_keyboard(maxsize: int = 128):
+    """
+    Statik (yoki faqat kirish parametrlariga bog'liq) klaviaturani bir marta qurish.
+    Bir xil argumentlar uchun har safar o'sha InlineKeyboardMarkup obyekti qaytadi —
+    uni o'zgartirmang, boshqacha klaviatura kerak bo'lsa alohida quring.
+    """
+    return lru_cache(maxsize=maxsize)
+
+
+@cached_keyboard(maxsize=1)
 def get_auksion_main_keyboard() -> InlineKeyboardMarkup:
     """
     Auksion asosiy menyusi.
@@ -32,6 +47,7 @@ def get_auksion_main_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard(maxsize=32)
 def get_subcategory_keyboard(main_cat: str) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     if main_cat not in SUB_CATEGORIES:
@@ -100,6 +116,10 @@ def get_lot_detail_keyboard(
             text=f"{EMOJI_IMAGES} Barcha rasmlar ({len(lot.images)} ta)",
             callback_data=f"auk2:images:{lot.id}:0:{main_cat}:{sub_cat}"
         )
+        builder.button(
+            text="🖼 Albom ko'rinishida",
+            callback_data=f"auk2:album:{lot.id}:0:{main_cat}:{sub_cat}"
+        )
 
     # Asosiy tugma
     builder.button(
@@ -163,17 +183,54 @@ def get_image_navigation_keyboard(
     return builder.as_markup()
 
 
+def get_album_navigation_keyboard(
+    lot_id: int,
+    album: int,
+    total_albums: int,
+    first_index: int,
+    main_cat: str,
+    sub_cat: str
+) -> InlineKeyboardMarkup:
+    """Albom ostidagi xabar tugmalari (albomga klaviatura biriktirib bo'lmaydi)"""
+    builder = InlineKeyboardBuilder()
+    nav = []
+    if album > 0:
+        nav.append(InlineKeyboardButton(
+            text="⬅️ Oldingi",
+            callback_data=f"auk2:album:{lot_id}:{album-1}:{main_cat}:{sub_cat}"
+        ))
+    nav.append(InlineKeyboardButton(text=f"🖼 {album+1}/{total_albums}", callback_data="noop"))
+    if album < total_albums - 1:
+        nav.append(InlineKeyboardButton(
+            text="Keyingi ➡️",
+            callback_data=f"auk2:album:{lot_id}:{album+1}:{main_cat}:{sub_cat}"
+        ))
+    builder.row(*nav)
+    builder.row(InlineKeyboardButton(
+        text=f"{EMOJI_IMAGES} Bittalab ko'rish",
+        callback_data=f"auk2:images:{lot_id}:{first_index}:{main_cat}:{sub_cat}"
+    ))
+    builder.row(InlineKeyboardButton(
+        text=f"{EMOJI_BACK} Lotga qaytish",
+        callback_data=f"auk2:view:{lot_id}:{main_cat}:{sub_cat}"
+    ))
+    return builder.as_markup()
+
+
 def get_favorites_keyboard(
-    lots: List[Lot],
+    items: List[Tuple[int, Optional[Lot]]],
     page: int = 1,
     total_pages: int = 1
 ) -> InlineKeyboardMarkup:
     """
-    Sevimlilar keyboard.
+    Sevimlilar keyboard. items — (lot_id, lot); lot None bo'lsa (yuklanmagan) belgi qatori.
     total_pages ma'lum (sevimlilari soni aniq), shuning uchun to'g'ri ko'rsatiladi.
     """
     builder = InlineKeyboardBuilder()
-    for lot in lots:
+    for lot_id, lot in items:
+        if lot is None:
+            builder.button(text=f"⚠️ Lot #{lot_id} — yuklanmadi", callback_data=f"auk2:view_fav:{lot_id}")
+            continue
         lot_name = lot.name[:35] + "..." if len(lot.name) > 35 else lot.name
         builder.button(text=f"{EMOJI_FAVORITE} {lot_name}", callback_data=f"auk2:view_fav:{lot.id}")
 
@@ -222,17 +279,20 @@ def get_my_applications_keyboard(applications) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard(maxsize=1)
 def get_search_keyboard() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.button(text=f"{EMOJI_BACK} Orqaga", callback_data="auk2:menu")
     return builder.as_markup()
 
 
+@cached_keyboard(maxsize=1)
 def get_back_to_main_keyboard() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.button(text=f"{EMOJI_BACK} Orqaga", callback_data="auk2:menu")
     return builder.as_markup()
 
 
+@cached_keyboard(maxsize=1)
 def noop_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[])
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""
+E-Auksion.uz V2 - Lot rasmlarini yuborish
+Birinchi yuborishda rasm proksi (image_cache.py) tayyorlagan baytlar,
+proksi o'chiq yoki xato bo'lsa e-auksion.uz URL yuboriladi;
+javobdagi file_id saqlanadi (storage.file_ids, auksion_file_ids jadvali)
+va keyingi yuborishlar shu file_id orqali — upstreamga so'rovsiz — bajariladi.
+Albom rejimi: rasmlar ALBUM_SIZE tadan sendMediaGroup bilan yuboriladi;
+foydalanuvchi albomni ko'rayotganda keyingisi fonda oldindan yuklanadi.
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import BufferedInputFile, InputMediaPhoto, Message
+
+from .config import ALBUM_SIZE, ALBUM_PREFETCH_UPLOAD, ALBUM_PREFETCH_CHAT_ID, IMAGE_PROXY_ENABLED
+from .image_cache import image_cache
+from .models import LotImage, storage
+
+logger = logging.getLogger(__name__)
+
+# Keshlangan file_id ni yaroqsiz qiladigan Telegram xatolari (kichik harflarda).
+# Boshqa TelegramBadRequest (caption, markup, chat) — file_id o'chirilmaydi, xato yuqoriga chiqadi
+_FILE_ID_ERRORS = (
+    "wrong file identifier",
+    "wrong remote file identifier",
+    "wrong file_id",
+    "file reference expired",
+    "file_reference_expired",
+    "failed to get http url content",
+    "wrong type of the web page content",
+    "media_empty",
+    "can't use file of type",
+)
+
+
+def _is_file_id_error(error: TelegramBadRequest) -> bool:
+    message = str(error).lower()
+    return any(marker in message for marker in _FILE_ID_ERRORS)
+
+
+class PhotoSender:
+    """file_id keshi orqali lot rasmlarini yuborish/almashtirish"""
+
+    def __init__(self):
+        self.cached_sends = 0
+        self.uploads = 0
+        self.invalidated = 0
+        self.albums = 0
+        self.prefetched = 0
+        # (lot_id, albom) -> fonda ishlayotgan oldindan yuklash
+        self._prefetching: Dict[Tuple[int, int], asyncio.Task] = {}
+
+    def _remember(self, image: LotImage, sent: Union[Message, bool, None]):
+        if isinstance(sent, Message) and sent.photo:
+            # Eng katta o'lcham — keyingi yuborishda sifat pasaymaydi
+            storage.save_file_id(image.file_hash, sent.photo[-1].file_id)
+
+    def _invalidate(self, image: LotImage, error: Exception):
+        self.invalidated += 1
+        storage.forget_file_id(image.file_hash)
+        logger.warning(f"⚠️ Rasm file_id yaroqsiz ({image.file_hash}), qayta yuklanadi: {error}")
+
+    async def _upload_source(self, image: LotImage) -> Union[str, BufferedInputFile]:
+        """file_id bo'lmaganda: proksi keshidagi baytlar, bo'lmasa upstream URL"""
+        if IMAGE_PROXY_ENABLED:
+            data = await image_cache.get(image)
+            if data is not None:
+                return BufferedInputFile(data, filename="image.jpg")
+        return image.get_url()
+
+    async def send(self, message: Message, image: LotImage, **kwargs) -> Message:
+        """message.answer_photo(); kwargs — caption, reply_markup, parse_mode"""
+        file_id = storage.get_file_id(image.file_hash)
+        if file_id:
+            try:
+                sent = await message.answer_photo(photo=file_id, **kwargs)
+                self.cached_sends += 1
+                return sent
+            except TelegramBadRequest as e:
+                if not _is_file_id_error(e):
+                    raise
+                self._invalidate(image, e)
+        sent = await message.answer_photo(photo=await self._upload_source(image), **kwargs)
+        self.uploads += 1
+        self._remember(image, sent)
+        return sent
+
+    async def edit(
+        self, message: Message, image: LotImage, caption: Optional[str] = None,
+        parse_mode: Optional[str] = "HTML", reply_markup=None,
+    ) -> Union[Message, bool]:
+        """Mavjud rasmli xabarni boshqa rasmga almashtirish (galereya)"""
+        file_id = storage.get_file_id(image.file_hash)
+        if file_id:
+            try:
+                edited = await message.edit_media(
+                    media=InputMediaPhoto(media=file_id, caption=caption, parse_mode=parse_mode),
+                    reply_markup=reply_markup,
+                )
+                self.cached_sends += 1
+                return edited
+            except TelegramBadRequest as e:
+                if "not modified" in str(e).lower():
+                    return message
+                if not _is_file_id_error(e):
+                    raise
+                self._invalidate(image, e)
+        edited = await message.edit_media(
+            media=InputMediaPhoto(
+                media=await self._upload_source(image), caption=caption, parse_mode=parse_mode,
+            ),
+            reply_markup=reply_markup,
+        )
+        self.uploads += 1
+        self._remember(image, edited)
+        return edited
+
+    # ------------------------------------------------------------------
+    # Albom (sendMediaGroup)
+    # ------------------------------------------------------------------
+
+    async def _album_media(
+        self, images: Sequence[LotImage], caption: Optional[str], use_cache: bool,
+    ) -> List[InputMediaPhoto]:
+        file_ids = [use_cache and storage.get_file_id(image.file_hash) for image in images]
+        # file_id si yo'q rasmlar proksidan parallel olinadi
+        uploads = iter(await asyncio.gather(*(
+            self._upload_source(image) for image, file_id in zip(images, file_ids) if not file_id
+        )))
+        media = []
+        for i, file_id in enumerate(file_ids):
+            source = file_id or next(uploads)
+            # Albom izohi birinchi rasmda ko'rsatiladi
+            media.append(InputMediaPhoto(
+                media=source, caption=caption if i == 0 else None, parse_mode="HTML" if i == 0 else None,
+            ))
+        return media
+
+    async def _send_group(self, bot, chat_id: int, media: List[InputMediaPhoto]) -> List[Message]:
+        # sendMediaGroup kamida 2 ta media talab qiladi
+        if len(media) == 1:
+            item = media[0]
+            return [await bot.send_photo(chat_id, item.media, caption=item.caption, parse_mode=item.parse_mode)]
+        return await bot.send_media_group(chat_id, media)
+
+    async def send_album(
+        self, bot, chat_id: int, images: Sequence[LotImage], caption: Optional[str] = None,
+    ) -> List[Message]:
+        """
+        Rasmlarni bitta albom qilib yuborish (ko'pi bilan ALBUM_SIZE ta).
+        Keshlangan file_id lardan biri yaroqsiz bo'lsa, albom URL lar bilan qayta yuboriladi.
+        """
+        images = list(images)[:ALBUM_SIZE]
+        cached = sum(1 for image in images if storage.get_file_id(image.file_hash))
+        try:
+            sent = await self._send_group(bot, chat_id, await self._album_media(images, caption, use_cache=True))
+        except TelegramBadRequest as e:
+            if not cached or not _is_file_id_error(e):
+                raise
+            # Qaysi file_id rad etilgani noma'lum — URL lar bilan yuborilgach hammasi yangilanadi
+            self.invalidated += 1
+            logger.warning(f"⚠️ Albomdagi file_id rad etildi, rasmlar qayta yuklanadi: {e}")
+            cached = 0
+            sent = await self._send_group(bot, chat_id, await self._album_media(images, caption, use_cache=False))
+        self.cached_sends += cached
+        self.uploads += len(images) - cached
+        self.albums += 1
+        for image, message in zip(images, sent):
+            self._remember(image, message)
+        return sent
+
+    def prefetch_album(self, bot, lot_id: int, album: int, images: Sequence[LotImage]):
+        """
+        Keyingi albomni fonda tayyorlash: file_id si yo'q rasmlar proksi keshiga yuklanadi —
+        foydalanuvchi "keyingi" ni bosganda rasmlar upstreamdan kutilmaydi.
+        ALBUM_PREFETCH_UPLOAD yoqilgan bo'lsa, file_id lar xizmat chati orqali oldindan olinadi.
+        """
+        missing = [image for image in images if not storage.get_file_id(image.file_hash)]
+        if not missing:
+            return
+        if not (ALBUM_PREFETCH_UPLOAD and ALBUM_PREFETCH_CHAT_ID):
+            if IMAGE_PROXY_ENABLED:
+                image_cache.warm(missing)
+            return
+        key = (lot_id, album)
+        if key in self._prefetching:
+            return
+        task = asyncio.create_task(self._prefetch(bot, missing), name=f"album-prefetch-{lot_id}-{album}")
+        self._prefetching[key] = task
+        task.add_done_callback(lambda _: self._prefetching.pop(key, None))
+
+    async def _prefetch(self, bot, images: List[LotImage]):
+        try:
+            sent = await self._send_group(
+                bot, ALBUM_PREFETCH_CHAT_ID, await self._album_media(images, None, use_cache=False)
+            )
+        except Exception as e:
+            logger.debug(f"Albom oldindan yuklanmadi: {e}")
+            return
+        for image, message in zip(images, sent):
+            self._remember(image, message)
+        self.prefetched += len(sent)
+        try:
+            await bot.delete_messages(ALBUM_PREFETCH_CHAT_ID, [m.message_id for m in sent])
+        except Exception as e:
+            logger.debug(f"Xizmat chatidagi albom o'chirilmadi: {e}")
+
+    async def stop(self):
+        """Fonda ishlayotgan oldindan yuklashlarni bekor qilish"""
+        tasks: Set[asyncio.Task] = set(self._prefetching.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await image_cache.stop()
+
+    def stats(self) -> dict:
+        total = self.cached_sends + self.uploads
+        return {
+            'file_ids': len(storage.file_ids),
+            'cached_sends': self.cached_sends,
+            'uploads': self.uploads,
+            'invalidated': self.invalidated,
+            'albums': self.albums,
+            'prefetched': self.prefetched,
+            'hit_rate': round(self.cached_sends / total, 3) if total else 0.0,
+        }
+
+
+def album_count(total_images: int) -> int:
+    return (total_images + ALBUM_SIZE - 1) // ALBUM_SIZE
+
+
+def album_images(images: Sequence[LotImage], album: int) -> Sequence[LotImage]:
+    return images[album * ALBUM_SIZE:(album + 1) * ALBUM_SIZE]
+
+
+# Global instance
+photo_sender = PhotoSender()
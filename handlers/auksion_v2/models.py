@@ -2,12 +2,46 @@
 Auksion uchun Database modellari
 YANGILANGAN: UserApplication (Mening arizalarim) qo'shildi
 """
-from typing import Optional, List, Dict, Any
+import logging
+import sys
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Iterator, Sequence, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from .config import LOT_STORE_MAX_ENTRIES, LOT_STORE_MAX_BYTES, LOT_STORE_MAX_AGE
+from .utils import parse_date
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+class _ReadOnlyDict(dict):
+    """O'zgartirib bo'lmaydigan dict — barcha lotlar uchun umumiy bo'sh properties"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Umumiy bo'sh properties o'zgartirilmaydi — yangi dict tayinlang")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+
+
+# Bo'sh konteynerlar barcha lotlar uchun bitta (lotga alohida list/dict ajratilmaydi).
+# images/documents — tuple; to'ldirish uchun yangi qiymat tayinlanadi.
+_NO_IMAGES: tuple = ()
+_NO_DOCUMENTS: tuple = ()
+_NO_PROPERTIES: Dict[str, Any] = _ReadOnlyDict()
+
+# Ro'yxatdan olingan lotda xom ma'lumot yo'qligini bildiradi
+_NOT_LAZY = object()
+
+
+def _intern(value):
+    """Ko'p takrorlanadigan satrlar (status, kategoriya) xotirada bitta nusxa bo'lsin"""
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class LotImage:
     file_hash: str
     file_name: Optional[str] = None
@@ -18,7 +52,7 @@ class LotImage:
         return f"{API_IMAGES_URL}?file_hash={self.file_hash}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Lot:
     id: int
     name: str
@@ -35,102 +69,187 @@ class Lot:
 
     description: Optional[str] = None
     location: Optional[str] = None
-    images: List[LotImage] = field(default_factory=list)
+    images: Sequence[LotImage] = _NO_IMAGES
 
     bids_count: int = 0
     participants_count: int = 0
     views_count: int = 0
 
     estimated_value: Optional[float] = None
-    documents: List[str] = field(default_factory=list)
-    properties: Dict[str, Any] = field(default_factory=dict)
+    documents: Sequence[str] = _NO_DOCUMENTS
+    properties: Dict[str, Any] = field(default_factory=lambda: _NO_PROPERTIES)
     winner_id: Optional[int] = None
     is_sold: bool = False
 
+    # Kechiktirilgan (lazy) tahlil uchun xom API bo'laklari
+    _raw_details: Any = field(default=_NOT_LAZY, init=False, repr=False, compare=False)
+    _raw_images: Any = field(default=None, init=False, repr=False, compare=False)
+
+    def __getattr__(self, name: str):
+        # Faqat ro'yxatdan (lazy=True) kelgan lotda: rasmlar va xususiyatlar birinchi murojaatda
+        if name in _LAZY_FIELDS and self._raw_details is not _NOT_LAZY:
+            self.materialize()
+            return getattr(self, name)
+        raise AttributeError(f"'Lot' object has no attribute '{name}'")
+
+    def materialize(self):
+        """Kechiktirilgan xususiyatlar va rasmlarni xom API ma'lumotidan hosil qilish"""
+        details, images = self._raw_details, self._raw_images
+        if details is _NOT_LAZY:
+            return
+        self.properties = _parse_properties(details) if details else _NO_PROPERTIES
+        self.images = _parse_images(images) if images else _NO_IMAGES
+        self._raw_details, self._raw_images = _NOT_LAZY, None
+
+    def property_values(self) -> List[str]:
+        """Xususiyat qiymatlari (qidiruv indeksi uchun) — kechiktirilgan lotni materializatsiya qilmaydi"""
+        details = self._raw_details
+        if details is _NOT_LAZY:
+            return [str(value) for value in self.properties.values()]
+        return [str(value) for _, value in _iter_details(details or ())]
+
     @staticmethod
-    def from_api_data(data: dict) -> 'Lot':
-        from .utils import parse_date
+    def from_api_data(data: dict, lazy: bool = False) -> 'Lot':
+        """
+        API qatoridan Lot.
+        lazy=True (ro'yxatlar uchun): confiscant_details_list va confiscant_images_list
+        tahlil qilinmaydi — lot.properties / lot.images ga birinchi murojaatda hosil qilinadi.
+        """
+        get = data.get
+
+        statuses = get('lot_statuses_name')
+        categories = get('confiscant_categories_name')
+        start_price = get('start_price', 0)
+        estimated = get('baholangan_narx') or get('estimated_value')
+        location = get('joylashgan_manzil', get('location', ''))
+        if not location:
+            location = _fallback_location(data) or location
+
+        details = get('confiscant_details_list')
+        details = details if type(details) is list else None
+        images = get('confiscant_images_list')
+        images = images if type(images) is list else None
 
         lot = Lot(
-            id=data.get('id', 0),
-            name=data.get('name', ''),
-            lot_number=data.get('lot_number', ''),
-            start_price=float(data.get('start_price', 0)),
-            current_price=float(data.get('current_price', data.get('start_price', 0))),
-            min_increment=float(data.get('step_summa', data.get('min_increment', 0))),
-            status=(
-                data.get('lot_statuses_name', {}).get('name_uz', 'upcoming')
-                if isinstance(data.get('lot_statuses_name'), dict)
-                else data.get('status', 'upcoming')
+            id=get('id', 0),
+            name=get('name', ''),
+            lot_number=get('lot_number', ''),
+            start_price=float(start_price),
+            current_price=float(get('current_price', start_price)),
+            min_increment=float(get('step_summa', get('min_increment', 0))),
+            status=_intern(
+                statuses.get('name_uz', 'upcoming') if type(statuses) is dict
+                else get('status', 'upcoming')
             ),
-            category=(
-                data.get('confiscant_categories_name', {}).get('name_uz', 'other')
-                if isinstance(data.get('confiscant_categories_name'), dict)
-                else data.get('category', 'other')
+            category=_intern(
+                categories.get('name_uz', 'other') if type(categories) is dict
+                else get('category', 'other')
             ),
-            auction_start=parse_date(data.get('start_time_str', data.get('auction_date_str'))),
-            description=data.get('additional_info', data.get('description', '')),
-            location=data.get('joylashgan_manzil', data.get('location', '')),
-            bids_count=data.get('bids_count', 0),
-            participants_count=data.get('participants_count', 0),
+            auction_start=parse_date(get('start_time_str', get('auction_date_str'))),
+            description=get('additional_info', get('description', '')),
+            location=location,
+            bids_count=get('bids_count', 0),
+            participants_count=get('participants_count', 0),
             estimated_value=(
-                float(data.get('baholangan_narx', data.get('estimated_value', 0)))
-                if data.get('baholangan_narx') or data.get('estimated_value') else None
+                float(get('baholangan_narx', get('estimated_value', 0))) if estimated else None
             ),
         )
 
-        # Properties
-        if 'confiscant_details_list' in data and isinstance(data['confiscant_details_list'], list):
-            properties = {}
-            for detail in data['confiscant_details_list']:
-                if isinstance(detail, dict):
-                    name_dict = detail.get('name', {})
-                    prop_name = (
-                        name_dict.get('name_uz', '') if isinstance(name_dict, dict)
-                        else str(detail.get('name', ''))
-                    )
-                    value = detail.get('detail_value_string', detail.get('detail_value', ''))
-                    if prop_name and value and str(value).strip() not in ['', '-', 'null', 'None']:
-                        if 'maydoni' in prop_name.lower():
-                            properties['area'] = value
-                        elif 'qurilgan yili' in prop_name.lower():
-                            properties['year_built'] = value
-                        elif 'balansda saqlovchi' in prop_name.lower() and 'nomi' in prop_name.lower():
-                            properties['balance_holder'] = value
-                        elif 'viloyat' in prop_name.lower():
-                            properties['region'] = value
-                        elif 'tuman' in prop_name.lower():
-                            properties['district'] = value
-                        else:
-                            properties[prop_name[:50]] = str(value)[:200]
-            lot.properties = properties
-
-        # Joylashuv
-        if not lot.location:
-            region = data.get('region_name', {}).get('name_uz', '') if isinstance(data.get('region_name'), dict) else ''
-            area   = data.get('area_name', {}).get('name_uz', '') if isinstance(data.get('area_name'), dict) else ''
-            address = data.get('joylashgan_manzil', '')
-            parts = [p for p in [region, area, address] if p]
-            if parts:
-                lot.location = ", ".join(parts)
-
-        # Rasmlar
-        if 'confiscant_images_list' in data and isinstance(data['confiscant_images_list'], list):
-            for img in data['confiscant_images_list']:
-                if isinstance(img, dict) and img.get('file_hash'):
-                    lot.images.append(LotImage(
-                        file_hash=img['file_hash'],
-                        file_name=img.get('description', img.get('image_positions_name', ''))
-                    ))
-
+        if lazy:
+            # Slot bo'shatiladi — birinchi murojaatda __getattr__ materializatsiya qiladi
+            del lot.images, lot.properties
+            lot._raw_details = details
+            lot._raw_images = images
+        else:
+            if details:
+                lot.properties = _parse_properties(details)
+            if images:
+                lot.images = _parse_images(images)
         return lot
 
 
+# ============================================================================
+# API QATORINI TAHLIL QILISH
+# ============================================================================
+
+_LAZY_FIELDS = frozenset({'images', 'properties'})
+
+# Xususiyat nomi (kichik harfda) -> Lot.properties kaliti; birinchi mos kelgan qoida
+_PROPERTY_RULES = (
+    (('maydoni',), 'area'),
+    (('qurilgan yili',), 'year_built'),
+    (('balansda saqlovchi', 'nomi'), 'balance_holder'),
+    (('viloyat',), 'region'),
+    (('tuman',), 'district'),
+)
+
+_EMPTY_VALUES = frozenset({'', '-', 'null', 'None'})
+
+
+@lru_cache(maxsize=2048)
+def _classify_property(prop_name: str) -> Tuple[str, bool]:
+    """
+    Xususiyat nomidan (properties kaliti, maxsus_kalitmi).
+    Nomlar lotlar orasida takrorlanadi — natija keshlanadi.
+    """
+    lowered = prop_name.lower()
+    for needles, key in _PROPERTY_RULES:
+        if all(needle in lowered for needle in needles):
+            return key, True
+    return prop_name[:50], False
+
+
+def _iter_details(details: list) -> Iterator[tuple]:
+    """confiscant_details_list dan (nom, qiymat) juftliklari (bo'sh qiymatlar tashlanadi)"""
+    for detail in details:
+        if type(detail) is not dict:
+            continue
+        name_dict = detail.get('name', {})
+        prop_name = (
+            name_dict.get('name_uz', '') if type(name_dict) is dict
+            else str(detail.get('name', ''))
+        )
+        value = detail.get('detail_value_string', detail.get('detail_value', ''))
+        if prop_name and value and str(value).strip() not in _EMPTY_VALUES:
+            yield prop_name, value
+
+
+def _parse_properties(details: list) -> Dict[str, Any]:
+    properties = {}
+    for prop_name, value in _iter_details(details):
+        key, special = _classify_property(prop_name)
+        properties[key] = value if special else str(value)[:200]
+    return properties
+
+
+def _parse_images(images: list) -> List[LotImage]:
+    return [
+        LotImage(
+            file_hash=img['file_hash'],
+            file_name=img.get('description', img.get('image_positions_name', ''))
+        )
+        for img in images
+        if type(img) is dict and img.get('file_hash')
+    ]
+
+
+def _fallback_location(data: dict) -> str:
+    """joylashgan_manzil bo'lmasa — viloyat, tuman va manzildan"""
+    region = data.get('region_name')
+    area = data.get('area_name')
+    parts = [
+        region.get('name_uz', '') if type(region) is dict else '',
+        area.get('name_uz', '') if type(area) is dict else '',
+        data.get('joylashgan_manzil', ''),
+    ]
+    return ", ".join(p for p in parts if p)
+
+
 # ============================================================================
 # YANGI: Foydalanuvchi arizasi
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class UserApplication:
     """
     Foydalanuvchi yuborgan ariza.
@@ -153,7 +272,7 @@ class UserApplication:
         return self.current_price - self.lot_price
 
 
-@dataclass
+@dataclass(slots=True)
 class UserBid:
     user_id: int
     lot_id: int
@@ -162,7 +281,7 @@ class UserBid:
     position: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class UserFavorite:
     user_id: int
     lot_id: int
@@ -170,7 +289,7 @@ class UserFavorite:
     notify_enabled: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class UserNotification:
     user_id: int
     lot_id: int
@@ -184,24 +303,209 @@ class UserNotification:
 # STORAGE
 # ============================================================================
 
+def estimate_lot_size(lot: Lot) -> int:
+    """Lot egallagan xotiraning taxminiy hajmi (bayt); kechiktirilgan lotni materializatsiya qilmaydi"""
+    size = sys.getsizeof(lot)  # slotlar obyekt ichida
+    for value in (lot.name, lot.lot_number, lot.description, lot.location):
+        if value:
+            size += sys.getsizeof(value)
+    if lot._raw_details is not _NOT_LAZY:
+        # Xom API bo'laklari (sayoz hajm) — materializatsiyadan keyin qayta o'lchanmaydi
+        for raw in (lot._raw_details, lot._raw_images):
+            if raw:
+                size += sys.getsizeof(raw) + sum(sys.getsizeof(item) for item in raw)
+        return size
+    # Umumiy bo'sh konteynerlar lotga qo'shimcha xotira olmaydi
+    if lot.images:
+        size += sys.getsizeof(lot.images)
+        for image in lot.images:
+            size += sys.getsizeof(image) + sys.getsizeof(image.file_hash)
+            if image.file_name:
+                size += sys.getsizeof(image.file_name)
+    if lot.properties:
+        size += sys.getsizeof(lot.properties)
+        for key, value in lot.properties.items():
+            size += sys.getsizeof(key) + sys.getsizeof(value)
+    if lot.documents:
+        size += sys.getsizeof(lot.documents) + sum(sys.getsizeof(d) for d in lot.documents)
+    return size
+
+
+def lot_from_index_row(row) -> Lot:
+    """Qidiruv indeksi qatoridan (database/auksion_store.py) ro'yxat uchun yetarli Lot"""
+    return Lot(
+        id=row['lot_id'],
+        name=row['title'] or '',
+        lot_number=row['lot_number'] or '',
+        start_price=float(row['start_price'] or 0),
+        current_price=float(row['current_price'] or 0),
+        min_increment=0,
+        status=_intern(row['status'] or 'upcoming'),
+        category=_intern(row['category'] or 'other'),
+    )
+
+
+class LotStore:
+    """
+    Lotlar uchun cheklangan LRU xotira: max soni, max bayt va max yosh.
+    Sevimlilarga qo'shilgan lotlar "pin" qilinadi — ular chiqarib yuborilmaydi
+    va eskirmaydi (sevimlilar ro'yxati ularga tayanadi).
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, max_age: float):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        # lot_id -> (saqlangan_vaqt, hajm, Lot); oxirgi element — eng yangi ishlatilgan
+        self._data: "OrderedDict[int, tuple]" = OrderedDict()
+        self._pins: Dict[int, int] = {}   # lot_id -> nechta foydalanuvchi sevimlisi
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, lot_id: int) -> bool:
+        return lot_id in self._data
+
+    def values(self) -> Iterator[Lot]:
+        return (lot for _, _, lot in list(self._data.values()))
+
+    def put(self, lot: Lot):
+        old = self._data.pop(lot.id, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+        size = estimate_lot_size(lot)
+        self._data[lot.id] = (time.monotonic(), size, lot)
+        self.total_bytes += size
+        self._evict()
+
+    def get(self, lot_id: int) -> Optional[Lot]:
+        entry = self._data.get(lot_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        saved_at, size, lot = entry
+        if lot_id not in self._pins and time.monotonic() - saved_at > self.max_age:
+            del self._data[lot_id]
+            self.total_bytes -= size
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(lot_id)
+        self.hits += 1
+        return lot
+
+    def pin(self, lot_id: int):
+        self._pins[lot_id] = self._pins.get(lot_id, 0) + 1
+
+    def unpin(self, lot_id: int):
+        count = self._pins.get(lot_id, 0) - 1
+        if count > 0:
+            self._pins[lot_id] = count
+        else:
+            self._pins.pop(lot_id, None)
+
+    def _evict(self):
+        """Chegaradan oshsa — eng eski ishlatilgan, pin qilinmagan lotlarni chiqarish"""
+        if len(self._data) <= self.max_entries and self.total_bytes <= self.max_bytes:
+            return
+        for lot_id in list(self._data):
+            if len(self._data) <= self.max_entries and self.total_bytes <= self.max_bytes:
+                break
+            if lot_id in self._pins:
+                continue
+            _, size, _ = self._data.pop(lot_id)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """Xotira holati (monitoring uchun)"""
+        return {
+            'lots': len(self._data),
+            'pinned': sum(1 for lot_id in self._pins if lot_id in self._data),
+            'bytes': self.total_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expired': self.expired,
+        }
+
+
 class MemoryStorage:
 
     def __init__(self):
-        self.lots: Dict[int, Lot] = {}
+        self.lots = LotStore(LOT_STORE_MAX_ENTRIES, LOT_STORE_MAX_BYTES, LOT_STORE_MAX_AGE)
         self.user_bids: Dict[int, List[UserBid]] = {}
-        self.user_favorites: Dict[int, List[UserFavorite]] = {}
+        # user_id -> {lot_id: sevimli}; dict qo'shilish tartibini saqlaydi
+        self.user_favorites: Dict[int, Dict[int, UserFavorite]] = {}
         self.user_notifications: Dict[int, Dict[int, UserNotification]] = {}
-        self.user_applications: Dict[int, List[UserApplication]] = {}
+        # Arizalar ikki indeksda: user_id -> {lot_id: ariza} va lot_id -> {user_id: ariza}
+        self.user_applications: Dict[int, Dict[int, UserApplication]] = {}
+        self.lot_applications: Dict[int, Dict[int, UserApplication]] = {}
         self.cache: Dict[str, Any] = {}
         self.cache_timestamps: Dict[str, datetime] = {}
+        # Rasm file_hash -> Telegram file_id (birinchi muvaffaqiyatli yuborishdan)
+        self.file_ids: Dict[str, str] = {}
+        # Doimiy backend (database/auksion_store.py) — attach_backend() dan keyin
+        self.backend = None
+
+    def attach_backend(self, backend):
+        """
+        Sevimlilar, arizalar va bildirishnomalarni backend'dan yuklash.
+        Shundan keyin har bir o'zgarish backend'ga ham yoziladi (write-behind).
+        """
+        from database.auksion_store import parse_timestamp
+
+        self.backend = None  # yuklash paytida qayta yozilmasin
+        for row in backend.load_favorites():
+            self.add_favorite(UserFavorite(
+                user_id=row['user_id'], lot_id=row['lot_id'],
+                added_at=parse_timestamp(row['added_at']),
+                notify_enabled=bool(row['notify_enabled']),
+            ))
+        for row in backend.load_applications():
+            self.add_application(UserApplication(
+                user_id=row['user_id'], lot_id=row['lot_id'],
+                lot_name=row['lot_name'] or '', lot_price=row['lot_price'] or 0,
+                current_price=row['current_price'] or 0,
+                name=row['name'] or '', phone=row['phone'] or '',
+                applied_at=parse_timestamp(row['applied_at']),
+                status=row['status'] or 'pending',
+            ))
+        for row in backend.load_notifications():
+            self.save_notification(UserNotification(
+                user_id=row['user_id'], lot_id=row['lot_id'],
+                notify_start=bool(row['notify_start']), notify_end=bool(row['notify_end']),
+                notify_outbid=bool(row['notify_outbid']), notify_winner=bool(row['notify_winner']),
+            ))
+        for row in backend.load_file_ids():
+            self.file_ids[row['file_hash']] = row['file_id']
+        self.backend = backend
+        stats = self.memory_stats()
+        logger.info(
+            f"📥 Auksion ma'lumotlari yuklandi: sevimlilar={stats['favorites']}, "
+            f"arizalar={stats['applications']}, bildirishnomalar={stats['notifications']}, "
+            f"rasm file_id={stats['file_ids']}"
+        )
 
     # Lot
     def save_lot(self, lot: Lot):
-        self.lots[lot.id] = lot
+        self.lots.put(lot)
 
     def get_lot(self, lot_id: int) -> Optional[Lot]:
         return self.lots.get(lot_id)
 
+    def index_lots(self, lots: List[Lot]):
+        """Upstreamdan olingan lotlarni lokal qidiruv indeksiga yuborish"""
+        if self.backend:
+            self.backend.index_lots(lots)
+
     def get_lots_by_status(self, status: str) -> List[Lot]:
         return [l for l in self.lots.values() if l.status == status]
 
@@ -214,58 +518,85 @@ class MemoryStorage:
 
     # Favorite
     def add_favorite(self, favorite: UserFavorite):
-        favs = self.user_favorites.setdefault(favorite.user_id, [])
-        if not any(f.lot_id == favorite.lot_id for f in favs):
-            favs.append(favorite)
+        favs = self.user_favorites.setdefault(favorite.user_id, {})
+        if favorite.lot_id not in favs:
+            favs[favorite.lot_id] = favorite
+            self.lots.pin(favorite.lot_id)
+            if self.backend:
+                self.backend.upsert_favorite(favorite)
 
     def remove_favorite(self, user_id: int, lot_id: int):
-        if user_id in self.user_favorites:
-            self.user_favorites[user_id] = [f for f in self.user_favorites[user_id] if f.lot_id != lot_id]
+        if self.user_favorites.get(user_id, {}).pop(lot_id, None) is not None:
+            self.lots.unpin(lot_id)
+            if self.backend:
+                self.backend.delete_favorite(user_id, lot_id)
 
     def get_user_favorites(self, user_id: int) -> List[UserFavorite]:
-        return self.user_favorites.get(user_id, [])
+        """Qo'shilgan tartibda"""
+        return list(self.user_favorites.get(user_id, {}).values())
 
     def is_favorite(self, user_id: int, lot_id: int) -> bool:
-        return any(f.lot_id == lot_id for f in self.get_user_favorites(user_id))
+        return lot_id in self.user_favorites.get(user_id, {})
 
     # Application
     def add_application(self, application: UserApplication):
-        apps = self.user_applications.setdefault(application.user_id, [])
-        for i, app in enumerate(apps):
-            if app.lot_id == application.lot_id:
-                apps[i] = application
-                return
-        apps.append(application)
+        if self.backend:
+            self.backend.upsert_application(application)
+        self.user_applications.setdefault(application.user_id, {})[application.lot_id] = application
+        self.lot_applications.setdefault(application.lot_id, {})[application.user_id] = application
 
     def get_user_applications(self, user_id: int) -> List[UserApplication]:
-        apps = self.user_applications.get(user_id, [])
-        return sorted(apps, key=lambda a: a.applied_at, reverse=True)
+        apps = self.user_applications.get(user_id, {})
+        return sorted(apps.values(), key=lambda a: a.applied_at, reverse=True)
 
     def get_application(self, user_id: int, lot_id: int) -> Optional[UserApplication]:
-        for app in self.user_applications.get(user_id, []):
-            if app.lot_id == lot_id:
-                return app
-        return None
+        return self.user_applications.get(user_id, {}).get(lot_id)
 
     def update_application_price(self, lot_id: int, new_price: float):
-        for apps in self.user_applications.values():
-            for app in apps:
-                if app.lot_id == lot_id:
-                    app.current_price = new_price
+        if self.backend:
+            self.backend.update_application_price(lot_id, new_price)
+        for app in self.lot_applications.get(lot_id, {}).values():
+            app.current_price = new_price
 
     def get_all_applications_for_lot(self, lot_id: int) -> List[UserApplication]:
-        result = []
-        for apps in self.user_applications.values():
-            result.extend(app for app in apps if app.lot_id == lot_id)
-        return result
+        return list(self.lot_applications.get(lot_id, {}).values())
 
     # Notification
     def save_notification(self, notification: UserNotification):
+        if self.backend:
+            self.backend.upsert_notification(notification)
         self.user_notifications.setdefault(notification.user_id, {})[notification.lot_id] = notification
 
     def get_notification(self, user_id: int, lot_id: int) -> Optional[UserNotification]:
         return self.user_notifications.get(user_id, {}).get(lot_id)
 
+    # Telegram file_id
+    def get_file_id(self, file_hash: str) -> Optional[str]:
+        return self.file_ids.get(file_hash)
+
+    def save_file_id(self, file_hash: str, file_id: str):
+        if self.file_ids.get(file_hash) != file_id:
+            self.file_ids[file_hash] = file_id
+            if self.backend:
+                self.backend.upsert_file_id(file_hash, file_id)
+
+    def forget_file_id(self, file_hash: str):
+        """Telegram qabul qilmagan file_id — keyingi safar URL orqali yuboriladi"""
+        if self.file_ids.pop(file_hash, None) is not None and self.backend:
+            self.backend.delete_file_id(file_hash)
+
+    # Monitoring
+    def memory_stats(self) -> dict:
+        """Storage xotira statistikasi"""
+        stats = self.lots.stats()
+        stats.update({
+            'favorites': sum(len(v) for v in self.user_favorites.values()),
+            'applications': sum(len(v) for v in self.user_applications.values()),
+            'notifications': sum(len(v) for v in self.user_notifications.values()),
+            'file_ids': len(self.file_ids),
+        })
+        return stats
+
     # Cache
     def cache_set(self, key: str, value: Any, ttl: int = 300):
         self.cache[key] = value
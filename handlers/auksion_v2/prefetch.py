@@ -0,0 +1,96 @@
+"""
+E-Auksion.uz V2 - Oldindan yuklash (prefetch)
+Fonda ishlaydigan vazifa: foydalanuvchilar eng ko'p ochadigan
+(kategoriya, viloyat, tuman, sahifa) kombinatsiyalarini ro'yxat keshiga
+oldindan yuklaydi — birinchi foydalanuvchi ham javobni darhol oladi.
+"""
+import asyncio
+import logging
+from typing import List, Optional
+
+from .api import APIError, api_client
+from .categories import CATEGORY_FILTERS
+from .config import (
+    ITEMS_PER_PAGE, PREFETCH_INTERVAL, PREFETCH_TOP_N, PREFETCH_MAX_PAGE,
+    PREFETCH_MIN_TTL, PREFETCH_DEMAND_DECAY, PREFETCH_SEED_CATEGORIES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchWorker:
+    """Mashhur ro'yxat sahifalarini davriy ravishda keshga yuklovchi"""
+
+    def __init__(self, client=api_client, interval: float = PREFETCH_INTERVAL):
+        self.client = client
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.cycles = 0
+        self.fetched = 0
+        self.errors = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="auksion-prefetch")
+            logger.info(f"🔥 Auksion prefetch ishga tushdi (har {self.interval:.0f}s)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _targets(self) -> List[tuple]:
+        """Isitiladigan so'rovlar: kuzatilgan talab bo'yicha, bo'lmasa standart kategoriyalar"""
+        targets = [
+            key for key, _ in self.client.popular_requests(PREFETCH_TOP_N)
+            if key[4] <= PREFETCH_MAX_PAGE  # key[4] — sahifa
+        ]
+        if not targets:
+            targets = [
+                (CATEGORY_FILTERS[name]["groups_id"], CATEGORY_FILTERS[name]["categories_id"],
+                 None, None, 1, ITEMS_PER_PAGE)
+                for name in PREFETCH_SEED_CATEGORIES if name in CATEGORY_FILTERS
+            ]
+        return targets
+
+    async def run_once(self) -> int:
+        """Bitta sikl; yuklangan sahifalar sonini qaytaradi"""
+        fetched = 0
+        for groups_id, categories_id, region_id, area_id, page, per_page in self._targets():
+            try:
+                if await self.client.prefetch_lots(
+                    groups_id, categories_id, page=page, per_page=per_page,
+                    region_id=region_id, area_id=area_id, min_ttl=PREFETCH_MIN_TTL,
+                ):
+                    fetched += 1
+            except APIError as e:
+                self.errors += 1
+                logger.debug(f"Prefetch o'tkazib yuborildi: {e}")
+        self.client.decay_demand(PREFETCH_DEMAND_DECAY)
+        self.cycles += 1
+        self.fetched += fetched
+        return fetched
+
+    async def _run(self):
+        while True:
+            try:
+                fetched = await self.run_once()
+                if fetched:
+                    logger.info(f"🔥 Prefetch: {fetched} ta sahifa keshga yuklandi")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ Prefetch xato: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {'cycles': self.cycles, 'fetched': self.fetched, 'errors': self.errors}
+
+
+# Global instance
+prefetch_worker = PrefetchWorker()
@@ -9,8 +9,8 @@ from aiogram import Router, F
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 
-from .api import api_client
-from .keyboards import get_lots_list_keyboard, get_back_to_main_keyboard
+from .sync import catalog_sync
+from .keyboards import cached_keyboard, get_lots_list_keyboard, get_back_to_main_keyboard
 from .categories import get_breadcrumb, CATEGORY_FILTERS
 from .config import ITEMS_PER_PAGE
 
@@ -155,6 +155,7 @@ DISTRICTS = {
 
 # ── Klaviaturalar ─────────────────────────────────────────────────────────────
 
+@cached_keyboard(maxsize=256)
 def get_region_filter_keyboard(main_cat: str, sub_cat: str) -> InlineKeyboardMarkup:
     buttons = [[InlineKeyboardButton(
         text=REGIONS["all"],
@@ -178,6 +179,7 @@ def get_region_filter_keyboard(main_cat: str, sub_cat: str) -> InlineKeyboardMar
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+@cached_keyboard(maxsize=32)
 def get_district_filter_keyboard(region_code: str, region_id: int) -> InlineKeyboardMarkup:
     """
     Tuman klaviaturasi.
@@ -278,7 +280,7 @@ async def _load_and_show_lots(callback: CallbackQuery, state: FSMContext, region
         return
 
     try:
-        lots = await api_client.get_lots_by_category(
+        lots = await catalog_sync.get_lots(
             groups_id=filter_data["groups_id"],
             categories_id=filter_data["categories_id"],
             region_id=region_id,
@@ -304,12 +306,14 @@ async def _load_and_show_lots(callback: CallbackQuery, state: FSMContext, region
             return
 
         has_next = len(lots) >= ITEMS_PER_PAGE
-        keyboard  = get_lots_list_keyboard(lots, main_cat, sub_cat, 1, has_next)
-        keyboard.inline_keyboard.insert(0, [
-            InlineKeyboardButton(
+        lots_keyboard = get_lots_list_keyboard(lots, main_cat, sub_cat, 1, has_next)
+        # Yangi markup — qaytarilgan (keshlangan bo'lishi mumkin) obyekt o'zgartirilmaydi
+        keyboard = InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(
                 text=f"📍 {location_name}  |  🔄 O'zgartirish",
                 callback_data="auk2:chrgn"
-            )
+            )],
+            *lots_keyboard.inline_keyboard,
         ])
 
         await callback.message.edit_text(
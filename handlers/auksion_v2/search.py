@@ -2,26 +2,31 @@
 PROFESSIONAL QIDIRUV TIZIMI
 handlers/auksion_v2/search.py
 """
+import asyncio
+import re
+from typing import Dict, List, Optional, Tuple
+
 from aiogram import Router, F
 from aiogram.types import CallbackQuery, Message, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 
 from .states import AuksionStatesV2
 from .api import api_client
-from .models import storage
-from .keyboards import get_lots_list_keyboard, get_back_to_main_keyboard
+from .config import SEARCH_PRICE_PER_PAGE, SEARCH_PRICE_CONCURRENCY, SEARCH_PRICE_MAX_RESULTS
+from .models import Lot, storage
+from .keyboards import cached_keyboard, get_lots_list_keyboard, get_back_to_main_keyboard
 from .utils import format_price
 
-import re
-
 router = Router()
 
 
+@cached_keyboard(maxsize=1)
 def get_search_keyboard() -> InlineKeyboardMarkup:
     """Qidiruv turi klaviaturasi"""
     return InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="🔤 Matn bo'yicha", callback_data="search:text")],
         [InlineKeyboardButton(text="🔢 Lot ID bo'yicha", callback_data="search:id")],
+        [InlineKeyboardButton(text="💰 Narx bo'yicha", callback_data="search:price")],
         [InlineKeyboardButton(text="🔙 Orqaga", callback_data="auk2:menu")]
     ])
 
@@ -36,6 +41,7 @@ async def callback_show_search(callback: CallbackQuery, state: FSMContext):
         "Qidiruv turini tanlang:\n\n"
         "🔤 <b>Matn:</b> Lot nomida qidirish\n"
         "🔢 <b>ID:</b> Lot raqami bo'yicha\n"
+        "💰 <b>Narx:</b> Narx oralig'i bo'yicha\n"
     )
     
     await callback.message.edit_text(
@@ -78,14 +84,42 @@ async def callback_search_id(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
+# 3. NARX BO'YICHA QIDIRUV
+@router.callback_query(F.data == "search:price")
+async def callback_search_price(callback: CallbackQuery, state: FSMContext):
+    """Narx oralig'i bo'yicha qidiruv"""
+    await state.set_state(AuksionStatesV2.searching)
+    await state.update_data(search_type="price")
+
+    await callback.message.edit_text(
+        "🔍 <b>NARX BO'YICHA QIDIRUV</b>\n\n"
+        "Narx oralig'ini so'mda kiriting (min-max):\n\n"
+        "<i>Misol: 100000000-500000000\n"
+        "yoki faqat yuqori chegara: 300000000</i>",
+        parse_mode="HTML"
+    )
+    await callback.answer()
+
+
 # QIDIRUV NATIJALARINI QAYTA ISHLASH
 @router.message(AuksionStatesV2.searching)
 async def process_search_query(message: Message, state: FSMContext):
     """Qidiruv so'rovini qayta ishlash"""
     data = await state.get_data()
     search_type = data.get("search_type", "text")
-    query = message.text.strip()
-    
+    query = (message.text or "").strip()
+
+    price_range = None
+    if search_type == "price":
+        price_range = parse_price_range(query)
+        if price_range is None:
+            # Holat saqlanadi — foydalanuvchi qayta kiritadi
+            await message.answer(
+                "❌ Narx oralig'i noto'g'ri.\n\n<i>Misol: 100000000-500000000</i>",
+                parse_mode="HTML"
+            )
+            return
+
     await message.answer("⏳ Qidirilmoqda...")
     
     # Qidiruv turi bo'yicha
@@ -102,7 +136,16 @@ async def process_search_query(message: Message, state: FSMContext):
             lots = []
         
         await show_search_results(message, lots, f"ID: #{lot_id}")
-    
+
+    elif search_type == "price":
+        min_price, max_price = price_range
+        lots = await search_by_price(min_price, max_price)
+        if min_price:
+            search_info = f"Narx: {format_price(min_price)} — {format_price(max_price)}"
+        else:
+            search_info = f"Narx: {format_price(max_price)} gacha"
+        await show_search_results(message, lots, search_info)
+
     else:
         # Matn bo'yicha (default)
         lots = await api_client.search_lots(query)
@@ -143,27 +186,63 @@ async def show_search_results(message, lots, search_info):
     await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
 
 
-async def search_by_price(min_price: int, max_price: int):
-    """Narx oralig'i bo'yicha qidiruv"""
-    # Barcha lotlarni olish
-    all_lots = []
-    
-    # Bir nechta kategoriyadan qidirish (optimizatsiya)
-    # Faqat eng ko'p ishlatiladigan kategoriyalar
-    categories_to_search = [
-        ("1", 3),   # Ko'chmas mulk - Ko'p qavatli
-        ("1", 2),   # Ko'chmas mulk - Turar-joy
-        ("6", 46),  # Yer - Tadbirkorlik
-        ("5", 27),  # Davlat - Davlat obyekti
-    ]
-    
-    for groups_id, categories_id in categories_to_search:
-        lots = await api_client.get_lots_by_category(
-            groups_id=groups_id,
-            categories_id=categories_id,
-            page=1,
-            per_page=50
-        )
-        all_lots.extend(lots)
-    
-
+# Narx bo'yicha qidiriladigan kategoriyalar (eng ko'p ishlatiladiganlari)
+PRICE_SEARCH_CATEGORIES = [
+    ("1", 3),   # Ko'chmas mulk - Ko'p qavatli
+    ("1", 2),   # Ko'chmas mulk - Turar-joy
+    ("6", 46),  # Yer - Tadbirkorlik
+    ("5", 27),  # Davlat - Davlat obyekti
+]
+
+
+def lot_price(lot: Lot) -> float:
+    """Lotning amaldagi narxi (joriy, bo'lmasa boshlang'ich)"""
+    return lot.current_price or lot.start_price or 0
+
+
+def parse_price_range(text: str) -> Optional[Tuple[int, int]]:
+    """
+    "100000000-500000000", "100 000 000 – 500 000 000" yoki "500000000" (faqat yuqori chegara)
+    ko'rinishidagi matndan (min, max) ni ajratish
+    """
+    parts = [re.sub(r'[^0-9]', '', part) for part in re.split(r'[-–—]', text)]
+    parts = [part for part in parts if part]
+    if len(parts) == 1:
+        return 0, int(parts[0])
+    if len(parts) != 2:
+        return None
+    low, high = int(parts[0]), int(parts[1])
+    return (low, high) if low <= high else (high, low)
+
+
+async def search_by_price(min_price: int, max_price: int) -> List[Lot]:
+    """
+    Narx oralig'i bo'yicha qidiruv.
+    Kategoriyalar parallel so'raladi (ko'pi bilan SEARCH_PRICE_CONCURRENCY ta bir vaqtda),
+    har bir javob kelishi bilan filtrlanib umumiy natijaga qo'shiladi.
+    Natija narx bo'yicha o'sish tartibida.
+    """
+    semaphore = asyncio.Semaphore(SEARCH_PRICE_CONCURRENCY)
+
+    async def fetch(groups_id: str, categories_id: int) -> List[Lot]:
+        async with semaphore:
+            return await api_client.get_lots_by_category(
+                groups_id=groups_id,
+                categories_id=categories_id,
+                page=1,
+                per_page=SEARCH_PRICE_PER_PAGE,
+                # Bu sahifalar ro'yxat sifatida ko'rsatilmaydi — prefetch ularni isitmasin
+                record_demand=False,
+            )
+
+    found: Dict[int, Lot] = {}
+    tasks = [fetch(groups_id, categories_id) for groups_id, categories_id in PRICE_SEARCH_CATEGORIES]
+    for next_done in asyncio.as_completed(tasks):
+        lots = await next_done
+        for lot in lots:
+            price = lot_price(lot)
+            # Narxi ko'rsatilmagan (0) lotlar natijaga kirmaydi
+            if price and min_price <= price <= max_price:
+                found[lot.id] = lot
+
+    return sorted(found.values(), key=lot_price)[:SEARCH_PRICE_MAX_RESULTS]
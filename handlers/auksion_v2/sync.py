@@ -0,0 +1,245 @@
+"""
+E-Auksion.uz V2 - Katalog sinxronizatsiyasi
+Fonda barcha CATEGORY_FILTERS x viloyatlar bo'limlarini aylanib, lotlarni
+lokal jadvalga (database/auksion_store.py, auksion_lots) yozadi.
+Inkremental: sahifadagi barcha lotlar ma'lum va o'zgarmagan bo'lsa, bo'lim to'xtatiladi.
+Upstream limitini past ustuvorlikda ishlatadi: foydalanuvchilar uchun zaxira bo'sh bo'lmasa kutadi.
+Ro'yxat handlerlari get_lots() orqali avval lokal jadvaldan o'qiydi (savdosi o'tgan,
+faol bo'lmagan va uzoq ko'rinmagan lotlarsiz);
+bo'lim hali sinxronlanmagan, eskirgan yoki tuman filtri bo'lsa — upstream.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .api import APIError, UpstreamBusyError, api_client
+from .categories import CATEGORY_FILTERS
+from .config import (
+    ITEMS_PER_PAGE, SYNC_INTERVAL, SYNC_PAGE_SIZE, SYNC_MAX_PAGES, SYNC_REQUEST_DELAY,
+    SYNC_FULL_INTERVAL, SYNC_MAX_STALENESS, SYNC_LOT_MAX_UNSEEN, SYNC_INACTIVE_STATUSES,
+    SYNC_RESERVE_TOKENS, SYNC_RESERVE_SLOTS, SYNC_BUDGET_POLL, SYNC_BUDGET_MAX_WAIT,
+)
+from .models import Lot, lot_from_index_row, storage
+
+logger = logging.getLogger(__name__)
+
+# (groups_id, categories_id, region_id)
+Partition = Tuple[str, int, int]
+
+
+def _categories() -> List[Tuple[str, int]]:
+    """CATEGORY_FILTERS dagi takrorlanmas (groups_id, categories_id) juftliklari"""
+    return sorted({(f["groups_id"], f["categories_id"]) for f in CATEGORY_FILTERS.values()})
+
+
+def _region_ids() -> List[int]:
+    from .region_filter import REGION_IDS  # region_filter bu moduldan import qiladi
+    return sorted(r for r in REGION_IDS.values() if r is not None)
+
+
+class CatalogSync:
+    """Auksion katalogini lokal jadvalga inkremental ko'chiruvchi fon vazifasi"""
+
+    def __init__(self, client=api_client, interval: float = SYNC_INTERVAL):
+        self.client = client
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        # bo'lim -> oxirgi (to'liq) sinxronizatsiya vaqti (time.time())
+        self._synced: Dict[Partition, float] = {}
+        self._full_synced: Dict[Partition, float] = {}
+        self.cycles = 0
+        self.pages = 0
+        self.changed = 0
+        self.removed = 0
+        self.errors = 0
+        self.throttled = 0
+        self.local_hits = 0
+        self.upstream_fallbacks = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="auksion-sync")
+            logger.info(f"🔄 Auksion katalog sinxronizatsiyasi ishga tushdi (har {self.interval:.0f}s)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _in_thread(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def load_state(self):
+        """Oldingi ishga tushirishdagi sinxronizatsiya vaqtlarini yuklash"""
+        backend = storage.backend
+        if backend is None:
+            return
+        for row in await self._in_thread(backend.load_sync_state):
+            key = (row['groups_id'], row['categories_id'], row['region_id'])
+            self._synced[key] = row['synced_at']
+            if row['full_synced_at']:
+                self._full_synced[key] = row['full_synced_at']
+
+    # ------------------------------------------------------------------
+    # Sinxronizatsiya
+    # ------------------------------------------------------------------
+
+    async def _wait_for_budget(self):
+        """Limiter'da foydalanuvchilar zaxirasidan ortiq joy bo'lguncha kutish"""
+        limiter = self.client.limiter
+        deadline = time.monotonic() + SYNC_BUDGET_MAX_WAIT
+        while not limiter.has_headroom(SYNC_RESERVE_TOKENS, SYNC_RESERVE_SLOTS):
+            if time.monotonic() >= deadline:
+                raise UpstreamBusyError("foydalanuvchi so'rovlari ko'p — sinxronizatsiya keyinga qoldirildi")
+            self.throttled += 1
+            await asyncio.sleep(SYNC_BUDGET_POLL)
+
+    async def sync_partition(self, groups_id: str, categories_id: int, region_id: int, full: bool) -> int:
+        """
+        Bitta bo'limni yangilash; yangi/o'zgargan lotlar sonini qaytaradi.
+        full=False: ma'lum va o'zgarmagan lotlar sahifasiga yetganda to'xtaydi.
+        full=True: oxirigacha aylanadi va ko'rinmay qolgan lotlarni o'chiradi.
+        """
+        backend = storage.backend
+        started_at = int(time.time())
+        changed_total = 0
+        reached_end = False
+        for page in range(1, SYNC_MAX_PAGES + 1):
+            await self._wait_for_budget()
+            lots = await self.client.fetch_catalog_page(groups_id, categories_id, region_id, page, SYNC_PAGE_SIZE)
+            self.pages += 1
+            if not lots:
+                reached_end = True
+                break
+            # Yangi lotlar upstream tartibida, avvalgi sinxronizatsiyalardagilardan yuqorida
+            sort_base = started_at * 100_000 - (page - 1) * SYNC_PAGE_SIZE
+            changed = await self._in_thread(
+                backend.save_catalog_page, groups_id, categories_id, region_id, lots, sort_base
+            )
+            changed_total += changed
+            if not changed and not full:
+                break
+            await asyncio.sleep(SYNC_REQUEST_DELAY)
+
+        # Oxirgi sahifagacha yetib bo'lmasa ham (SYNC_MAX_PAGES) uzoq ko'rinmagan lotlar o'chiriladi
+        removed = await self._in_thread(
+            backend.finish_catalog_sync, groups_id, categories_id, region_id, started_at, full and reached_end,
+            int(time.time() - SYNC_LOT_MAX_UNSEEN),
+        )
+        key = (groups_id, categories_id, region_id)
+        self._synced[key] = time.time()
+        if full and reached_end:
+            self._full_synced[key] = started_at
+        self.changed += changed_total
+        self.removed += removed
+        return changed_total
+
+    async def run_once(self) -> int:
+        """Barcha bo'limlar bo'yicha bitta sikl; yangi/o'zgargan lotlar sonini qaytaradi"""
+        if storage.backend is None:
+            return 0
+        changed = 0
+        now = time.time()
+        for groups_id, categories_id in _categories():
+            for region_id in _region_ids():
+                key = (groups_id, categories_id, region_id)
+                full = now - self._full_synced.get(key, 0) >= SYNC_FULL_INTERVAL
+                try:
+                    changed += await self.sync_partition(groups_id, categories_id, region_id, full)
+                except APIError as e:
+                    # Circuit ochiq / upstream band — siklni keyinga qoldirish
+                    self.errors += 1
+                    logger.warning(f"⚠️ Katalog sinxronizatsiyasi to'xtatildi: {e}")
+                    return changed
+                await asyncio.sleep(SYNC_REQUEST_DELAY)
+        self.cycles += 1
+        return changed
+
+    async def _run(self):
+        try:
+            await self.load_state()
+        except Exception as e:
+            logger.error(f"❌ Sinxronizatsiya holatini yuklashda xato: {e}")
+        while True:
+            try:
+                started = time.monotonic()
+                changed = await self.run_once()
+                logger.info(
+                    f"🔄 Katalog sinxronlandi: {changed} ta yangi/o'zgargan lot "
+                    f"({time.monotonic() - started:.0f}s)"
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ Katalog sinxronizatsiyasida xato: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    # ------------------------------------------------------------------
+    # O'qish (ro'yxat handlerlari)
+    # ------------------------------------------------------------------
+
+    def _is_fresh(self, groups_id: str, categories_id: int, region_id: Optional[int]) -> bool:
+        deadline = time.time() - SYNC_MAX_STALENESS
+        regions = _region_ids() if region_id is None else [region_id]
+        return all(self._synced.get((groups_id, categories_id, r), 0) >= deadline for r in regions)
+
+    async def local_page(
+        self, groups_id: str, categories_id: int, region_id: Optional[int], area_id: Optional[int],
+        page: int, per_page: int,
+    ) -> Optional[List[Lot]]:
+        """Lokal katalogdan sahifa; lokal javob berib bo'lmasa None"""
+        backend = storage.backend
+        # Katalog tuman bo'yicha bo'linmagan
+        if backend is None or area_id is not None or not self._is_fresh(groups_id, categories_id, region_id):
+            return None
+        try:
+            rows = await self._in_thread(
+                backend.catalog_page, groups_id, categories_id, region_id, per_page, (page - 1) * per_page,
+                int(time.time() - SYNC_LOT_MAX_UNSEEN), SYNC_INACTIVE_STATUSES,
+            )
+        except Exception as e:
+            logger.error(f"❌ Lokal katalogni o'qishda xato: {e}")
+            return None
+        return [storage.get_lot(row['lot_id']) or lot_from_index_row(row) for row in rows]
+
+    async def get_lots(
+        self, groups_id: str, categories_id: int, region_id: Optional[int] = None,
+        area_id: Optional[int] = None, page: int = 1, per_page: int = ITEMS_PER_PAGE,
+    ) -> List[Lot]:
+        """Ro'yxat sahifasi: lokal katalogdan, bo'lmasa upstream (kesh orqali)"""
+        lots = await self.local_page(groups_id, categories_id, region_id, area_id, page, per_page)
+        if lots is not None:
+            self.local_hits += 1
+            return lots
+        self.upstream_fallbacks += 1
+        return await self.client.get_lots_by_category(
+            groups_id=groups_id,
+            categories_id=categories_id,
+            region_id=region_id,
+            area_id=area_id,
+            page=page,
+            per_page=per_page,
+        )
+
+    def stats(self) -> dict:
+        return {
+            'partitions': len(self._synced),
+            'cycles': self.cycles,
+            'pages': self.pages,
+            'changed': self.changed,
+            'removed': self.removed,
+            'errors': self.errors,
+            'throttled': self.throttled,
+            'local_hits': self.local_hits,
+            'upstream_fallbacks': self.upstream_fallbacks,
+        }
+
+
+# Global instance
+catalog_sync = CatalogSync()
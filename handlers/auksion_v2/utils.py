@@ -2,12 +2,32 @@
 Auksion V2 - Yordamchi funksiyalar
 """
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, List, Tuple
 import re
 
 from .config import DATE_FORMAT, CURRENCY_FORMAT
 
 
+# Qo'llab-quvvatlanadigan sana formatlari (tartib — eski parse_date dagidek)
+DATE_INPUT_FORMATS = (
+    "%d.%m.%Y %H:%M",
+    "%d.%m.%Y %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%d.%m.%Y",
+)
+
+# Satr "shakli" (uzunligi + ajratkichlari) -> mos kelgan format.
+# API bir xil shakldagi sanalarni qaytaradi — format bir marta aniqlanadi.
+_date_format_by_shape: dict = {}
+
+
+def _date_shape(value: str) -> tuple:
+    return (len(value), value[2:3], value[4:5], value[10:11])
+
+
+@lru_cache(maxsize=4096)
 def parse_date(date_str: Optional[str]) -> Optional[datetime]:
     """
     Sana satrini datetime ga o'tkazish
@@ -17,25 +37,30 @@ def parse_date(date_str: Optional[str]) -> Optional[datetime]:
     
     Returns:
         datetime obyekti yoki None
+
+    Natija satr bo'yicha keshlanadi (datetime o'zgarmas), format esa satr shakli bo'yicha.
     """
     if not date_str:
         return None
-    
+
+    value = date_str.strip()
+    shape = _date_shape(value)
+    fmt = _date_format_by_shape.get(shape)
+    if fmt is not None:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+
     # Turli formatlarni sinash
-    formats = [
-        "%d.%m.%Y %H:%M",
-        "%d.%m.%Y %H:%M:%S",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%dT%H:%M:%S",
-        "%d.%m.%Y",
-    ]
-    
-    for fmt in formats:
+    for fmt in DATE_INPUT_FORMATS:
         try:
-            return datetime.strptime(date_str.strip(), fmt)
+            parsed = datetime.strptime(value, fmt)
         except ValueError:
             continue
-    
+        _date_format_by_shape[shape] = fmt
+        return parsed
+
     return None
 
 
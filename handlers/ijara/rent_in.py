@@ -23,13 +23,14 @@ from utils.constants import (
     format_price, format_area,
     get_region_name_by_code, get_property_type_name_by_code
 )
-from database.db_manager import db
+from database import adb
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 ADMIN_PHONE   = "+998 91 007 00 21"
 ADMIN_CHAT_ID = -1003037718098
+PAGE_SIZE     = 10
 
 
 @router.message(F.text == "📥 Ijaraga olish")
@@ -106,16 +107,20 @@ async def process_property_type(message: Message, state: FSMContext):
         property_type_name=message.text
     )
     data = await state.get_data()
-
-    objects = db.get_ijara_list(
-        region=data['region'],
-        district=data.get('district'),
-        property_type=data['property_type'],
-        action_type='rent_out'
-    )
+    search = {
+        'region': data['region'],
+        'district': data.get('district'),
+        'property_type': data['property_type'],
+        'region_name': data['region_name'],
+        'district_name': data.get('district_name'),
+        'property_type_name': data['property_type_name'],
+    }
     await state.clear()
+    # Qidiruv filtrlari sahifalash tugmalari uchun saqlanadi (state'siz data)
+    await state.update_data(ijara_search=search)
 
-    if not objects:
+    page = await _build_ijara_page(search)
+    if page is None:
         await message.answer(
             f"😔 <b>{data['region_name']} — {data['property_type_name']}</b>\n\n"
             "Hozircha e'lonlar yo'q.\nTez orada yangi e'lonlar qo'shiladi!",
@@ -123,8 +128,54 @@ async def process_property_type(message: Message, state: FSMContext):
         )
         return
 
+    text, markup = page
+    await message.answer(text, reply_markup=markup, parse_mode="HTML")
+
+
+@router.callback_query(F.data.startswith("ijara_page_"))
+async def callback_ijara_page(callback: CallbackQuery, state: FSMContext):
+    """ijara_page_{next|prev}_{sahifa}_{cursor}"""
+    try:
+        _, _, direction, page_no, cursor = callback.data.split("_", 4)
+        page_no = int(page_no)
+    except ValueError:
+        await callback.answer("❌ Xato", show_alert=True)
+        return
+
+    search = (await state.get_data()).get('ijara_search')
+    if not search:
+        await callback.answer("⌛ Qidiruv eskirgan, qaytadan qidiring", show_alert=True)
+        return
+
+    page = await _build_ijara_page(search, cursor, direction, page_no)
+    if page is None:
+        await callback.answer("📭 Boshqa e'lonlar yo'q")
+        return
+
+    text, markup = page
+    try:
+        await callback.message.edit_text(text, reply_markup=markup, parse_mode="HTML")
+    except Exception:
+        await callback.message.answer(text, reply_markup=markup, parse_mode="HTML")
+    await callback.answer()
+
+
+async def _build_ijara_page(search: dict, cursor=None, direction="next", page_no=1):
+    """Bitta sahifa matni va tugmalari; e'lon bo'lmasa None"""
+    objects, next_cursor, prev_cursor = await adb.get_ijara_page(
+        region=search['region'],
+        district=search.get('district'),
+        property_type=search['property_type'],
+        action_type='rent_out',
+        cursor=cursor,
+        direction=direction,
+        limit=PAGE_SIZE
+    )
+    if not objects:
+        return None
+
     keyboard = []
-    for obj in objects[:50]:
+    for obj in objects:
         rooms = f"{obj['rooms']}-xona " if obj.get('rooms') else ""
         prop  = get_property_type_name_by_code(obj.get('property_type', ''))
         price = format_price(obj.get('monthly_price', 0))
@@ -135,17 +186,28 @@ async def process_property_type(message: Message, state: FSMContext):
         keyboard.append([InlineKeyboardButton(
             text=label, callback_data=f"ijara_view_{obj['id']}"
         )])
+
+    nav = []
+    if prev_cursor:
+        nav.append(InlineKeyboardButton(
+            text="⬅️ Oldingi", callback_data=f"ijara_page_prev_{page_no - 1}_{prev_cursor}"
+        ))
+    if next_cursor:
+        nav.append(InlineKeyboardButton(
+            text="Keyingi ➡️", callback_data=f"ijara_page_next_{page_no + 1}_{next_cursor}"
+        ))
+    if nav:
+        keyboard.append(nav)
     keyboard.append([InlineKeyboardButton(text="🔙 Orqaga", callback_data="ijara_back")])
 
-    await message.answer(
-        f"📋 <b>{data['region_name']}"
-        + (f" | {data['district_name']}" if data.get('district_name') else "")
-        + f" — {data['property_type_name']}</b>\n\n"
-        f"Topildi: <b>{len(objects)}</b> ta e'lon\n\n"
-        "Batafsil ko'rish uchun tanlang:",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard),
-        parse_mode="HTML"
+    text = (
+        f"📋 <b>{search['region_name']}"
+        + (f" | {search['district_name']}" if search.get('district_name') else "")
+        + f" — {search['property_type_name']}</b>\n\n"
+        f"📄 Sahifa: <b>{page_no}</b>\n\n"
+        "Batafsil ko'rish uchun tanlang:"
     )
+    return text, InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
 # ============================================================================
@@ -160,7 +222,7 @@ async def callback_view_ijara(callback: CallbackQuery):
         await callback.answer("❌ Xato", show_alert=True)
         return
 
-    obj = db.get_ijara_by_id(obj_id)
+    obj = await adb.get_ijara_by_id(obj_id)
     if not obj:
         await callback.answer("❌ E'lon topilmadi!", show_alert=True)
         return
@@ -182,7 +244,7 @@ async def callback_view_ijara(callback: CallbackQuery):
     text += f"\n📞 <b>Bog'lanish:</b> {ADMIN_PHONE}"
     text += f"\n\n🆔 E'lon #{obj['id']}"
 
-    is_fav = db.is_favorite(callback.from_user.id, obj_id, 'ijara')
+    is_fav = await adb.is_favorite(callback.from_user.id, obj_id, 'ijara')
     kb = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="📤 Ariza yuborish", callback_data=f"apply_ijara_{obj_id}")],
         [InlineKeyboardButton(
@@ -239,7 +301,7 @@ async def callback_ijara_back(callback: CallbackQuery):
 
 @router.message(F.text == "❤️ Sevimlilar")
 async def show_ijara_favorites(message: Message):
-    objects = db.get_user_favorites(message.from_user.id, 'ijara')
+    objects = await adb.get_user_favorites(message.from_user.id, 'ijara')
     if not objects:
         await message.answer(
             "💔 <b>Sevimlilar bo'sh</b>\n\nHali sevimli e'lonlar yo'q.",
@@ -270,11 +332,11 @@ async def callback_toggle_fav_ijara(callback: CallbackQuery):
         await callback.answer("❌ Xato", show_alert=True)
         return
     user_id = callback.from_user.id
-    is_fav  = db.is_favorite(user_id, obj_id, 'ijara')
+    is_fav  = await adb.is_favorite(user_id, obj_id, 'ijara')
     if is_fav:
-        db.remove_favorite(user_id, obj_id, 'ijara')
+        await adb.remove_favorite(user_id, obj_id, 'ijara')
         await callback.answer("💔 Sevimlilardan o'chirildi")
     else:
-        db.add_favorite(user_id, obj_id, 'ijara')
+        await adb.add_favorite(user_id, obj_id, 'ijara')
         await callback.answer("❤️ Sevimlilarga qo'shildi")
     await callback_view_ijara(callback)
\ No newline at end of file
@@ -24,7 +24,7 @@ from utils.constants import (
     REGIONS, DISTRICTS, RENTAL_TYPES, RENTAL_PERIODS,
     format_price, format_area, format_phone, validate_phone
 )
-from database.db_manager import db
+from database import adb
 
 router = Router()
 logger = logging.getLogger(__name__)
@@ -466,7 +466,7 @@ async def process_confirmation(message: Message, state: FSMContext):
             'address':           data['address']
         }
         try:
-            obj_id = db.add_ijara(obj_data)
+            obj_id = await adb.add_ijara(obj_data)
             await _send_to_admin(message.bot, data, obj_id, user_phone, message.from_user.id)
             await message.answer(
                 "✅ <b>E'lon chop etildi!</b>\n\n"
@@ -27,13 +27,14 @@ from utils.constants import (
     get_region_name_by_code, get_property_type_name_by_code,
     validate_phone, format_phone
 )
-from database.db_manager import db
+from database import adb
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 ADMIN_PHONE   = "+998 91 007 00 21"
 ADMIN_CHAT_ID = -1003037718098
+PAGE_SIZE     = 10
 
 
 # ============================================================================
@@ -115,17 +116,19 @@ async def process_property_type_buy(message: Message, state: FSMContext):
         property_type_name=message.text
     )
     data = await state.get_data()
-
-    objects = db.get_kochmas_mulk_list(
-        region=data['region'],
-        district=data.get('district'),
-        property_type=data['property_type'],
-        action_type='sell',
-        limit=50
-    )
+    search = {
+        'region': data['region'],
+        'district': data.get('district'),
+        'property_type': data['property_type'],
+        'region_name': data['region_name'],
+        'property_type_name': data['property_type_name'],
+    }
     await state.clear()
+    # Qidiruv filtrlari sahifalash tugmalari uchun saqlanadi (state'siz data)
+    await state.update_data(kochmas_search=search)
 
-    if not objects:
+    page = await _build_kochmas_page(search)
+    if page is None:
         await message.answer(
             f"😔 <b>{data['region_name']} — {data['property_type_name']}</b>\n\n"
             "Hozircha e'lonlar yo'q.\nTez orada yangi e'lonlar qo'shiladi!",
@@ -134,8 +137,54 @@ async def process_property_type_buy(message: Message, state: FSMContext):
         )
         return
 
+    text, markup = page
+    await message.answer(text, reply_markup=markup, parse_mode="HTML")
+
+
+@router.callback_query(F.data.startswith("kochmas_page_"))
+async def callback_kochmas_page(callback: CallbackQuery, state: FSMContext):
+    """kochmas_page_{next|prev}_{sahifa}_{cursor}"""
+    try:
+        _, _, direction, page_no, cursor = callback.data.split("_", 4)
+        page_no = int(page_no)
+    except ValueError:
+        await callback.answer("❌ Xato", show_alert=True)
+        return
+
+    search = (await state.get_data()).get('kochmas_search')
+    if not search:
+        await callback.answer("⌛ Qidiruv eskirgan, qaytadan qidiring", show_alert=True)
+        return
+
+    page = await _build_kochmas_page(search, cursor, direction, page_no)
+    if page is None:
+        await callback.answer("📭 Boshqa e'lonlar yo'q")
+        return
+
+    text, markup = page
+    try:
+        await callback.message.edit_text(text, reply_markup=markup, parse_mode="HTML")
+    except Exception:
+        await callback.message.answer(text, reply_markup=markup, parse_mode="HTML")
+    await callback.answer()
+
+
+async def _build_kochmas_page(search: dict, cursor=None, direction="next", page_no=1):
+    """Bitta sahifa matni va tugmalari; e'lon bo'lmasa None"""
+    objects, next_cursor, prev_cursor = await adb.get_kochmas_mulk_page(
+        region=search['region'],
+        district=search.get('district'),
+        property_type=search['property_type'],
+        action_type='sell',
+        cursor=cursor,
+        direction=direction,
+        limit=PAGE_SIZE
+    )
+    if not objects:
+        return None
+
     keyboard = []
-    for obj in objects[:50]:
+    for obj in objects:
         rooms = f"{obj['rooms']}-xona " if obj.get('rooms') else ""
         prop  = get_property_type_name_by_code(obj.get('property_type', ''))
         price = format_price(obj.get('price', 0))
@@ -146,15 +195,26 @@ async def process_property_type_buy(message: Message, state: FSMContext):
         keyboard.append([InlineKeyboardButton(
             text=label, callback_data=f"kochmas_view_{obj['id']}"
         )])
+
+    nav = []
+    if prev_cursor:
+        nav.append(InlineKeyboardButton(
+            text="⬅️ Oldingi", callback_data=f"kochmas_page_prev_{page_no - 1}_{prev_cursor}"
+        ))
+    if next_cursor:
+        nav.append(InlineKeyboardButton(
+            text="Keyingi ➡️", callback_data=f"kochmas_page_next_{page_no + 1}_{next_cursor}"
+        ))
+    if nav:
+        keyboard.append(nav)
     keyboard.append([InlineKeyboardButton(text="🔙 Orqaga", callback_data="kochmas_back")])
 
-    await message.answer(
-        f"🏠 <b>{data['region_name']} — {data['property_type_name']}</b>\n\n"
-        f"Topildi: <b>{len(objects)}</b> ta e'lon\n\n"
-        "Batafsil ko'rish uchun tanlang:",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=keyboard),
-        parse_mode="HTML"
+    text = (
+        f"🏠 <b>{search['region_name']} — {search['property_type_name']}</b>\n\n"
+        f"📄 Sahifa: <b>{page_no}</b>\n\n"
+        "Batafsil ko'rish uchun tanlang:"
     )
+    return text, InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
 # ============================================================================
@@ -169,7 +229,7 @@ async def callback_view_object(callback: CallbackQuery):
         await callback.answer("❌ Xato", show_alert=True)
         return
 
-    obj = db.get_kochmas_mulk_by_id(obj_id)
+    obj = await adb.get_kochmas_mulk_by_id(obj_id)
     if not obj:
         await callback.answer("❌ E'lon topilmadi!", show_alert=True)
         return
@@ -189,7 +249,7 @@ async def callback_view_object(callback: CallbackQuery):
     text += f"\n📞 <b>Bog'lanish:</b> {ADMIN_PHONE}"
     text += f"\n\n🆔 E'lon #{obj['id']}"
 
-    is_fav = db.is_favorite(callback.from_user.id, obj_id, 'kochmas')
+    is_fav = await adb.is_favorite(callback.from_user.id, obj_id, 'kochmas')
     kb = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="📤 Ariza yuborish", callback_data=f"apply_kochmas_{obj_id}")],
         [InlineKeyboardButton(
@@ -245,7 +305,7 @@ async def callback_kochmas_back(callback: CallbackQuery):
 
 @router.message(F.text == "❤️ Sevimlilar")
 async def show_kochmas_favorites(message: Message):
-    objects = db.get_user_favorites(message.from_user.id, 'kochmas')
+    objects = await adb.get_user_favorites(message.from_user.id, 'kochmas')
     if not objects:
         await message.answer(
             "💔 <b>Sevimlilar bo'sh</b>\n\nHali sevimli e'lonlar yo'q.",
@@ -276,12 +336,12 @@ async def callback_toggle_favorite(callback: CallbackQuery):
         await callback.answer("❌ Xato", show_alert=True)
         return
     user_id = callback.from_user.id
-    is_fav  = db.is_favorite(user_id, obj_id, 'kochmas')
+    is_fav  = await adb.is_favorite(user_id, obj_id, 'kochmas')
     if is_fav:
-        db.remove_favorite(user_id, obj_id, 'kochmas')
+        await adb.remove_favorite(user_id, obj_id, 'kochmas')
         await callback.answer("💔 Sevimlilardan o'chirildi")
     else:
-        db.add_favorite(user_id, obj_id, 'kochmas')
+        await adb.add_favorite(user_id, obj_id, 'kochmas')
         await callback.answer("❤️ Sevimlilarga qo'shildi")
     await callback_view_object(callback)
 
@@ -396,8 +456,8 @@ async def process_application_comment(message: Message, state: FSMContext):
     obj_type = data.get('apply_object_type', 'kochmas')
 
     obj = (
-        db.get_kochmas_mulk_by_id(obj_id) if obj_type == 'kochmas'
-        else db.get_ijara_by_id(obj_id)
+        await adb.get_kochmas_mulk_by_id(obj_id) if obj_type == 'kochmas'
+        else await adb.get_ijara_by_id(obj_id)
     )
     if not obj:
         await message.answer("❌ E'lon topilmadi!", reply_markup=get_kochmas_mulk_menu())
@@ -24,12 +24,12 @@ async def kochmas_my_objects_menu(message: Message, state: FSMContext = None):
     if state:
         await state.clear()
 
-    from database.db_manager import db
+    from database import adb
     from utils.constants import format_price, format_area, get_property_type_name_by_code, get_region_name_by_code
     from utils.keyboards import get_kochmas_mulk_menu
 
     user_id = message.from_user.id
-    objects = db.get_user_kochmas_mulk(user_id) or []
+    objects = await adb.get_user_kochmas_mulk(user_id) or []
 
     if not objects:
         await message.answer(
@@ -73,7 +73,7 @@ async def kochmas_my_objects_menu(message: Message, state: FSMContext = None):
 
 @router.callback_query(F.data.startswith("kochmas_myobj_") & ~F.data.in_({"kochmas_myobj_menu_back"}))
 async def view_kochmas_my_detail(callback: CallbackQuery):
-    from database.db_manager import db
+    from database import adb
     from utils.constants import format_price, format_area, get_property_type_name_by_code, get_region_name_by_code
 
     try:
@@ -82,7 +82,7 @@ async def view_kochmas_my_detail(callback: CallbackQuery):
         await callback.answer("❌ Xato", show_alert=True)
         return
 
-    obj = db.get_kochmas_mulk_by_id(obj_id)
+    obj = await adb.get_kochmas_mulk_by_id(obj_id)
     if not obj:
         await callback.answer("❌ E'lon topilmadi!", show_alert=True)
         return
@@ -23,7 +23,7 @@ from utils.constants import (
     REGIONS, DISTRICTS, PROPERTY_TYPES,
     format_price, format_area, format_phone, validate_phone
 )
-from database.db_manager import db
+from database import adb
 
 router = Router()
 logger = logging.getLogger(__name__)
@@ -467,7 +467,7 @@ async def process_confirmation(message: Message, state: FSMContext):
             'address':       data['address']
         }
         try:
-            object_id = db.add_kochmas_mulk(object_data)
+            object_id = await adb.add_kochmas_mulk(object_data)
             await _send_to_admin(message.bot, data, object_id, user_phone, message.from_user.id)
             await message.answer(
                 "✅ <b>E'loningiz muvaffaqiyatli chop etildi!</b>\n\n"
@@ -25,23 +25,48 @@ PROYEKT STRUKTURASI:
         ├── my_objects.py
         ├── rent_out.py
         └── rent_in.py
+
+ISHGA TUSHIRISH REJIMLARI (BOT_MODE):
+  polling  — long polling (standart, lokal ishlab chiqish uchun)
+  webhook  — aiohttp server: Telegram update'larni POST qiladi (production).
+             WEBHOOK_BASE_URL (yoki Railway RAILWAY_PUBLIC_DOMAIN), WEBHOOK_PATH,
+             WEBHOOK_SECRET, WEBAPP_HOST, PORT. Sog'liq: GET /health, GET /ready
 """
 import asyncio
+import hashlib
 import logging
+import signal
+import time
 from os import getenv
 from dotenv import load_dotenv
 
+from aiohttp import web
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
-from aiogram.fsm.storage.memory import MemoryStorage
-
-from database.db_manager import db
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 
+# .env — database va handler modullari sozlamalarni import paytida o'qiydi
 load_dotenv()
+
+from database import db, adb, auksion_store  # noqa: E402
+from database.fsm_storage import create_fsm_storage  # noqa: E402
+
 TOKEN         = getenv("BOT_TOKEN")
 ADMIN_CHAT_ID = int(getenv("ADMIN_CHAT_ID", 0))
 
+# Ishga tushirish rejimi: polling (dev) | webhook (production)
+BOT_MODE                 = getenv("BOT_MODE", "polling").strip().lower()
+_RAILWAY_DOMAIN          = getenv("RAILWAY_PUBLIC_DOMAIN", "")
+WEBHOOK_BASE_URL         = getenv("WEBHOOK_BASE_URL") or (f"https://{_RAILWAY_DOMAIN}" if _RAILWAY_DOMAIN else "")
+WEBHOOK_PATH             = getenv("WEBHOOK_PATH", "/webhook")
+# Bo'sh bo'lsa tokendan hosil qilinadi — barcha replikalarda bir xil
+WEBHOOK_SECRET           = getenv("WEBHOOK_SECRET") or hashlib.sha256(f"webhook:{TOKEN}".encode()).hexdigest()
+WEBAPP_HOST              = getenv("WEBAPP_HOST", "0.0.0.0")
+WEBAPP_PORT              = int(getenv("PORT", 8080))
+WEBHOOK_MAX_CONNECTIONS  = int(getenv("WEBHOOK_MAX_CONNECTIONS", 40))
+WEBHOOK_SHUTDOWN_TIMEOUT = float(getenv("WEBHOOK_SHUTDOWN_TIMEOUT", 20))  # ishlanayotgan update'larni kutish
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -49,7 +74,8 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 bot = Bot(token=TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
-dp  = Dispatcher(storage=MemoryStorage())
+# FSM holatlari qayta ishga tushganda saqlanib qoladi (FSM_STORAGE: sqlite | redis | memory)
+dp  = Dispatcher(storage=create_fsm_storage())
 
 
 def _include_routers():
@@ -93,12 +119,23 @@ def _include_routers():
     dp.include_router(auksion_search)
 
 
-async def main():
-    logger.info("=" * 50)
-    logger.info("🚀 21ASR Bot ishga tushmoqda...")
+async def on_shutdown():
+    """Bot to'xtaganda resurslarni yopish"""
+    from handlers.auksion_v2.api import api_client
+    from handlers.auksion_v2.media import photo_sender
+    from handlers.auksion_v2.prefetch import prefetch_worker
+    from handlers.auksion_v2.sync import catalog_sync
+    await prefetch_worker.stop()
+    await catalog_sync.stop()
+    await photo_sender.stop()
+    await api_client.close()
+    # Auksion write-behind navbatini diskka yozib tugatish
+    await asyncio.get_running_loop().run_in_executor(None, auksion_store.close)
+    await adb.close()
+    logger.info("🔒 Database connectionlari yopildi")
 
-    _include_routers()
 
+def _start_services():
     try:
         stats = db.get_statistics()
         logger.info(
@@ -108,9 +145,154 @@ async def main():
     except Exception as e:
         logger.error(f"❌ Database xatolik: {e}")
 
-    logger.info("✅ Bot muvaffaqiyatli ishga tushdi!")
+    try:
+        from handlers.auksion_v2.models import storage as auksion_storage
+        auksion_storage.attach_backend(auksion_store)
+        # Tugagan (uzoq yangilanmagan) lotlar qidiruv indeksidan tozalanadi
+        auksion_store.prune_lot_index()
+    except Exception as e:
+        logger.error(f"❌ Auksion ma'lumotlarini yuklashda xato: {e}")
+
+    # Mashhur auksion sahifalarini fonda keshga yuklash
+    from handlers.auksion_v2.prefetch import prefetch_worker
+    prefetch_worker.start()
+
+    # Auksion katalogini lokal jadvalga sinxronlash (ro'yxatlar shu yerdan o'qiladi)
+    from handlers.auksion_v2.sync import catalog_sync
+    catalog_sync.start()
+
+
+# ============================================================================
+# WEBHOOK
+# ============================================================================
+
+class UpdateTracker:
+    """Ishlanayotgan update'lar soni — to'xtashda ular tugashi kutiladi"""
+
+    def __init__(self):
+        self.active = 0
+        self.handled = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def __call__(self, handler, event, data):
+        self.active += 1
+        self._idle.clear()
+        try:
+            return await handler(event, data)
+        finally:
+            self.active -= 1
+            self.handled += 1
+            if not self.active:
+                self._idle.set()
+
+    async def wait_idle(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+update_tracker = UpdateTracker()
+_webhook_state = {"ready": False, "started_at": time.monotonic()}
+
+
+async def on_webhook_startup(bot: Bot):
+    """
+    Webhook'ni o'rnatish. Har ishga tushishda chaqiriladi (idempotent): getWebhookInfo
+    secret va allowed_updates ni qaytarmaydi — URL o'zgarmasa ham yangi WEBHOOK_SECRET
+    yoki handlerlar qo'shgan update turlari Telegramga yetkaziladi.
+    """
+    url = f"{WEBHOOK_BASE_URL.rstrip('/')}{WEBHOOK_PATH}"
+    await bot.set_webhook(
+        url,
+        secret_token=WEBHOOK_SECRET,
+        allowed_updates=dp.resolve_used_update_types(),
+        max_connections=WEBHOOK_MAX_CONNECTIONS,
+    )
+    logger.info(f"🔗 Webhook o'rnatildi: {url}")
+    _webhook_state["ready"] = True
+
+
+async def _drain_updates(app: web.Application):
+    """Yangi so'rovlar qabul qilinmaydi; ishlanayotgan update'lar tugashini kutish"""
+    _webhook_state["ready"] = False
+    if not await update_tracker.wait_idle(WEBHOOK_SHUTDOWN_TIMEOUT):
+        logger.warning(f"⚠️ {update_tracker.active} ta update {WEBHOOK_SHUTDOWN_TIMEOUT:.0f}s ichida tugamadi")
+
+
+async def health(request: web.Request) -> web.Response:
+    """Liveness: jarayon ishlayapti"""
+    return web.json_response({
+        "status": "ok",
+        "mode": "webhook",
+        "uptime": round(time.monotonic() - _webhook_state["started_at"]),
+        "active_updates": update_tracker.active,
+        "handled_updates": update_tracker.handled,
+    })
+
+
+async def ready(request: web.Request) -> web.Response:
+    """Readiness: webhook o'rnatilgan va to'xtash jarayoni boshlanmagan"""
+    if not _webhook_state["ready"]:
+        return web.json_response({"status": "starting"}, status=503)
+    return web.json_response({"status": "ready"})
+
+
+def build_webhook_app() -> web.Application:
+    app = web.Application()
+    app.router.add_get("/health", health)
+    app.router.add_get("/ready", ready)
+    # Tartib muhim: avval update'lar tugashi kutiladi, keyin bot sessiyasi va resurslar yopiladi
+    app.on_shutdown.append(_drain_updates)
+    SimpleRequestHandler(dispatcher=dp, bot=bot, secret_token=WEBHOOK_SECRET).register(app, path=WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def run_webhook():
+    if not WEBHOOK_BASE_URL:
+        raise RuntimeError("BOT_MODE=webhook uchun WEBHOOK_BASE_URL (yoki RAILWAY_PUBLIC_DOMAIN) kerak")
+    dp.update.outer_middleware(update_tracker)
+    dp.startup.register(on_webhook_startup)
+
+    runner = web.AppRunner(build_webhook_app(), handle_signals=False)
+    await runner.setup()
+    await web.TCPSite(runner, WEBAPP_HOST, WEBAPP_PORT).start()
+    logger.info(f"🌐 Webhook server: http://{WEBAPP_HOST}:{WEBAPP_PORT}{WEBHOOK_PATH}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+    try:
+        await stop.wait()
+    finally:
+        logger.info("🛑 Webhook server to'xtatilmoqda...")
+        # Portni yopadi, keyin app.on_shutdown: drain -> bot sessiyasi -> on_shutdown()
+        await runner.cleanup()
+
+
+async def main():
+    logger.info("=" * 50)
+    logger.info("🚀 21ASR Bot ishga tushmoqda...")
+
+    _include_routers()
+    dp.shutdown.register(on_shutdown)
+    _start_services()
+
+    logger.info(f"✅ Bot muvaffaqiyatli ishga tushdi! (rejim: {BOT_MODE})")
     logger.info("=" * 50)
-    await dp.start_polling(bot)
+    if BOT_MODE == "webhook":
+        await run_webhook()
+    else:
+        # Oldin webhook o'rnatilgan bo'lsa getUpdates ishlamaydi
+        await bot.delete_webhook(drop_pending_updates=False)
+        await dp.start_polling(bot)
 
 
 if __name__ == "__main__":
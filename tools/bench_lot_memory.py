@@ -0,0 +1,98 @@
+"""
+Lot xotira benchmarki: 10 000 ta lot uchun RSS (eski dataclass va slotli model).
+Har bir variant alohida jarayonda o'lchanadi — allocator holati aralashmaydi.
+
+Ishga tushirish:  python tools/bench_lot_memory.py [lotlar_soni]
+"""
+import gc
+import os
+import random
+import subprocess
+import sys
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, TOOLS_DIR)
+
+VARIANTS = {
+    "legacy": "eski @dataclass (__dict__, alohida list/dict)",
+    "slots": "slots + umumiy bo'sh konteynerlar + intern",
+    "slots_lazy": "slots, lazy=True (xom qatorlar oldindan xotirada — hisobga kirmaydi)",
+}
+
+
+def rss_bytes() -> int:
+    """Joriy jarayonning RSS hajmi (Linux /proc, bo'lmasa maksimal RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def make_rows(count: int) -> list:
+    from bench_lot_parser import make_row
+
+    rng = random.Random(42)
+    rows = []
+    for i in range(count):
+        row = make_row(rng, i)
+        # Haqiqiy ro'yxatlarda ko'p lotda rasm/xususiyat yo'q — har uchinchisi bo'sh
+        if i % 3 == 0:
+            row.pop("confiscant_details_list")
+            row.pop("confiscant_images_list")
+        rows.append(row)
+    return rows
+
+
+def measure(variant: str, count: int) -> int:
+    """Lotlar yaratilgandan keyingi RSS o'sishi (bayt); xom qatorlar (lazy dan tashqari) o'chiriladi"""
+    from bench_lot_parser import legacy_from_api_data
+    from handlers.auksion_v2.models import Lot
+
+    parse = {
+        "legacy": legacy_from_api_data,
+        "slots": Lot.from_api_data,
+        "slots_lazy": lambda row: Lot.from_api_data(row, lazy=True),
+    }[variant]
+
+    # Har bir variantda qatorlar bir xil: satrlar JSON dan kelgandek alohida obyektlar
+    rows = make_rows(count)
+    gc.collect()
+    before = rss_bytes()
+    lots = [parse(row) for row in rows]
+    if variant != "slots_lazy":
+        # To'liq tahlildan keyin qatorlar kerak emas (lazy lot ularni ushlab turadi)
+        for row in rows:
+            row.clear()
+    del rows
+    gc.collect()
+    after = rss_bytes()
+    assert len(lots) == count
+    return after - before
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--variant":
+        variant, count = sys.argv[2], int(sys.argv[3])
+        print(measure(variant, count))
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    print(f"RSS o'sishi, {count} ta lot:")
+    results = {}
+    for variant, label in VARIANTS.items():
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--variant", variant, str(count)],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()[-1]
+        results[variant] = int(output)
+        per_10k = results[variant] / count * 10_000 / 1024 / 1024
+        print(f"  {label:<60} {per_10k:7.2f} MB / 10k lot")
+
+    saved = 1 - results["slots"] / results["legacy"] if results["legacy"] else 0
+    print(f"\n  slots: {saved:.0%} kam xotira (to'liq tahlil)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Lot.from_api_data micro-benchmark: eski (legacy) tahlil va yangi tezkor yo'l.
+Natijalar bir xil ekanligi ham tekshiriladi.
+
+Ishga tushirish:  python tools/bench_lot_parser.py [qatorlar_soni]
+"""
+import os
+import random
+import sys
+import tempfile
+import timeit
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.chdir(tempfile.mkdtemp())  # database paketi objects.db ni joriy papkada yaratadi
+
+from handlers.auksion_v2.models import Lot  # noqa: E402
+from handlers.auksion_v2.utils import parse_date  # noqa: E402
+
+
+# ============================================================================
+# ESKI MODEL VA TAHLIL (optimizatsiyadan oldingi nusxa — solishtirish uchun)
+# ============================================================================
+
+@dataclass
+class LegacyLotImage:
+    file_hash: str
+    file_name: Optional[str] = None
+    url: Optional[str] = None
+
+
+@dataclass
+class LegacyLot:
+    id: int
+    name: str
+    lot_number: str
+    start_price: float
+    current_price: float
+    min_increment: float
+    status: str
+    category: str
+    auction_start: Optional[datetime] = None
+    auction_end: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    description: Optional[str] = None
+    location: Optional[str] = None
+    images: List[LegacyLotImage] = field(default_factory=list)
+    bids_count: int = 0
+    participants_count: int = 0
+    views_count: int = 0
+    estimated_value: Optional[float] = None
+    documents: List[str] = field(default_factory=list)
+    properties: Dict[str, Any] = field(default_factory=dict)
+    winner_id: Optional[int] = None
+    is_sold: bool = False
+
+
+def legacy_parse_date(date_str):
+    if not date_str:
+        return None
+    formats = [
+        "%d.%m.%Y %H:%M",
+        "%d.%m.%Y %H:%M:%S",
+        "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%dT%H:%M:%S",
+        "%d.%m.%Y",
+    ]
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str.strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def legacy_from_api_data(data: dict) -> LegacyLot:
+    lot = LegacyLot(
+        id=data.get('id', 0),
+        name=data.get('name', ''),
+        lot_number=data.get('lot_number', ''),
+        start_price=float(data.get('start_price', 0)),
+        current_price=float(data.get('current_price', data.get('start_price', 0))),
+        min_increment=float(data.get('step_summa', data.get('min_increment', 0))),
+        status=(
+            data.get('lot_statuses_name', {}).get('name_uz', 'upcoming')
+            if isinstance(data.get('lot_statuses_name'), dict)
+            else data.get('status', 'upcoming')
+        ),
+        category=(
+            data.get('confiscant_categories_name', {}).get('name_uz', 'other')
+            if isinstance(data.get('confiscant_categories_name'), dict)
+            else data.get('category', 'other')
+        ),
+        auction_start=legacy_parse_date(data.get('start_time_str', data.get('auction_date_str'))),
+        description=data.get('additional_info', data.get('description', '')),
+        location=data.get('joylashgan_manzil', data.get('location', '')),
+        bids_count=data.get('bids_count', 0),
+        participants_count=data.get('participants_count', 0),
+        estimated_value=(
+            float(data.get('baholangan_narx', data.get('estimated_value', 0)))
+            if data.get('baholangan_narx') or data.get('estimated_value') else None
+        ),
+    )
+    if 'confiscant_details_list' in data and isinstance(data['confiscant_details_list'], list):
+        properties = {}
+        for detail in data['confiscant_details_list']:
+            if isinstance(detail, dict):
+                name_dict = detail.get('name', {})
+                prop_name = (
+                    name_dict.get('name_uz', '') if isinstance(name_dict, dict)
+                    else str(detail.get('name', ''))
+                )
+                value = detail.get('detail_value_string', detail.get('detail_value', ''))
+                if prop_name and value and str(value).strip() not in ['', '-', 'null', 'None']:
+                    if 'maydoni' in prop_name.lower():
+                        properties['area'] = value
+                    elif 'qurilgan yili' in prop_name.lower():
+                        properties['year_built'] = value
+                    elif 'balansda saqlovchi' in prop_name.lower() and 'nomi' in prop_name.lower():
+                        properties['balance_holder'] = value
+                    elif 'viloyat' in prop_name.lower():
+                        properties['region'] = value
+                    elif 'tuman' in prop_name.lower():
+                        properties['district'] = value
+                    else:
+                        properties[prop_name[:50]] = str(value)[:200]
+        lot.properties = properties
+    if not lot.location:
+        region = data.get('region_name', {}).get('name_uz', '') if isinstance(data.get('region_name'), dict) else ''
+        area = data.get('area_name', {}).get('name_uz', '') if isinstance(data.get('area_name'), dict) else ''
+        address = data.get('joylashgan_manzil', '')
+        parts = [p for p in [region, area, address] if p]
+        if parts:
+            lot.location = ", ".join(parts)
+    if 'confiscant_images_list' in data and isinstance(data['confiscant_images_list'], list):
+        for img in data['confiscant_images_list']:
+            if isinstance(img, dict) and img.get('file_hash'):
+                lot.images.append(LegacyLotImage(
+                    file_hash=img['file_hash'],
+                    file_name=img.get('description', img.get('image_positions_name', ''))
+                ))
+    return lot
+
+
+# ============================================================================
+# SINOV MA'LUMOTLARI
+# ============================================================================
+
+PROPERTY_NAMES = [
+    "Umumiy maydoni (kv.m)", "Qurilgan yili", "Balansda saqlovchi tashkilot nomi",
+    "Viloyat", "Tuman (shahar)", "Qavatlar soni", "Xonalar soni", "Kadastr raqami",
+    "Yer maydoni (ga)", "Devor materiali", "Isitish tizimi", "Gaz ta'minoti",
+]
+
+
+def make_row(rng: random.Random, i: int) -> dict:
+    day = rng.randint(1, 28)
+    return {
+        "id": 20000000 + i,
+        "name": f"Ko'p qavatli uy, {rng.randint(1, 5)} xonali kvartira #{i}",
+        "lot_number": f"{i:08d}",
+        "start_price": rng.randint(50, 900) * 1_000_000,
+        "step_summa": 1_000_000,
+        "lot_statuses_name": {"name_uz": "Savdoga chiqarilgan"},
+        "confiscant_categories_name": {"name_uz": "Ko'p qavatli uylar"},
+        "start_time_str": f"{day:02d}.03.2026 10:00",
+        "additional_info": "Yaxshi ta'mirlangan, markaziy isitish, hujjatlari tayyor.",
+        "joylashgan_manzil": "" if i % 4 == 0 else "Toshkent sh., Chilonzor t., 12-kvartal",
+        "region_name": {"name_uz": "Toshkent shahri"},
+        "area_name": {"name_uz": "Chilonzor tumani"},
+        "baholangan_narx": rng.randint(50, 900) * 1_000_000,
+        "confiscant_details_list": [
+            {"name": {"name_uz": name}, "detail_value_string": str(rng.randint(1, 500)) if j % 5 else "-"}
+            for j, name in enumerate(PROPERTY_NAMES)
+        ],
+        "confiscant_images_list": [
+            {"file_hash": f"{i:x}{k:02d}", "description": f"Rasm {k}"} for k in range(6)
+        ],
+    }
+
+
+def snapshot(lot) -> dict:
+    """Taqqoslash uchun: konteynerlar (list/tuple, rasm obyektlari) oddiy ko'rinishga"""
+    result = {}
+    for f in fields(LegacyLot):
+        value = getattr(lot, f.name)
+        if f.name == "images":
+            value = [(img.file_hash, img.file_name, img.url) for img in value]
+        elif f.name == "documents":
+            value = list(value)
+        result[f.name] = value
+    return result
+
+
+def check_equivalence(rows):
+    for row in rows:
+        expected = legacy_from_api_data(row)
+        assert snapshot(Lot.from_api_data(row)) == snapshot(expected), row["id"]
+        lazy = Lot.from_api_data(row, lazy=True)
+        assert lazy.property_values() == [str(v) for v in expected.properties.values()], row["id"]
+        assert snapshot(lazy) == snapshot(expected), row["id"]  # materializatsiya qiladi
+
+
+def bench(label, func, rows, number):
+    seconds = min(timeit.repeat(lambda: [func(row) for row in rows], number=number, repeat=5))
+    per_row = seconds / (number * len(rows)) * 1e6
+    print(f"  {label:<34} {per_row:8.2f} µs/qator")
+    return per_row
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rng = random.Random(42)
+    rows = [make_row(rng, i) for i in range(count)]
+    check_equivalence(rows)
+    print(f"✅ Natijalar bir xil ({count} qator)\n")
+
+    print(f"Lot.from_api_data, {count} qatorli sahifa:")
+    legacy = bench("eski (legacy)", legacy_from_api_data, rows, 20)
+    full = bench("yangi, to'liq (detail)", Lot.from_api_data, rows, 20)
+    lazy = bench("yangi, lazy (ro'yxat)", lambda row: Lot.from_api_data(row, lazy=True), rows, 20)
+    print(f"\n  to'liq: {legacy / full:.1f}x tezroq, ro'yxat: {legacy / lazy:.1f}x tezroq")
+
+    dates = [row["start_time_str"] for row in rows]
+    print("\nparse_date:")
+    old = bench("eski (5 format ketma-ket)", legacy_parse_date, dates, 20)
+    new = bench("yangi (format + natija keshi)", parse_date, dates, 20)
+    print(f"\n  {old / new:.1f}x tezroq")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+FSM storage tekshiruvi: SQLiteStorage (kesh, write-behind, TTL) va
+Redis rejimi — fakeredis o'rnatilgan yoki FSM_TEST_REDIS_URL berilgan bo'lsa
+(masalan lokal redis-server / valkey), aks holda o'tkazib yuboriladi.
+
+Ishga tushirish:  python -m pytest tools/test_fsm_storage.py
+"""
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())  # database paketi objects.db ni joriy papkada yaratadi
+
+from aiogram.fsm.state import State, StatesGroup  # noqa: E402
+from aiogram.fsm.storage.base import StorageKey  # noqa: E402
+
+from database.fsm_storage import KEY_BUILDER, SQLiteStorage  # noqa: E402
+
+
+class Wizard(StatesGroup):
+    region = State()
+    phone = State()
+
+
+KEY = StorageKey(bot_id=1, chat_id=10, user_id=10)
+OTHER = StorageKey(bot_id=1, chat_id=20, user_id=20)
+
+
+def _storage(tmp_path, **kwargs) -> SQLiteStorage:
+    return SQLiteStorage(str(tmp_path / "fsm.db"), flush_interval=0.01, **kwargs)
+
+
+async def _exercise(storage):
+    """Har qanday BaseStorage uchun umumiy xatti-harakat"""
+    assert await storage.get_state(KEY) is None
+    assert await storage.get_data(KEY) == {}
+    await storage.set_state(KEY, Wizard.region)
+    await storage.update_data(KEY, {"region": "toshkent"})
+    await storage.update_data(KEY, {"district": None})
+    assert await storage.get_state(KEY) == Wizard.region.state
+    assert await storage.get_data(KEY) == {"region": "toshkent", "district": None}
+    # Qaytarilgan dict nusxa — o'zgartirish storage'ga ta'sir qilmaydi
+    (await storage.get_data(KEY))["region"] = "x"
+    assert (await storage.get_data(KEY))["region"] == "toshkent"
+    assert await storage.get_state(OTHER) is None
+    await storage.set_state(KEY, None)
+    await storage.set_data(KEY, {})
+    assert await storage.get_state(KEY) is None
+
+
+def test_sqlite_roundtrip_and_restart(tmp_path):
+    async def run():
+        storage = _storage(tmp_path)
+        await _exercise(storage)
+        await storage.set_state(KEY, Wizard.phone)
+        await storage.update_data(KEY, {"region": "samarqand", "rooms": 3})
+        await storage.close()
+
+        # Qayta ishga tushgandan keyin holat tiklanadi
+        restored = _storage(tmp_path)
+        assert await restored.get_state(KEY) == Wizard.phone.state
+        assert await restored.get_data(KEY) == {"region": "samarqand", "rooms": 3}
+        await restored.close()
+
+    asyncio.run(run())
+
+
+def test_sqlite_cache_and_coalesced_writes(tmp_path):
+    async def run():
+        storage = _storage(tmp_path)
+        await storage.set_state(KEY, Wizard.region)
+        for i in range(50):
+            await storage.update_data(KEY, {"step": i})
+        await storage.flush()
+        # 51 ta o'zgarish bitta qator bo'lib yoziladi
+        assert storage.written == 1
+        misses = storage.misses
+        for _ in range(100):
+            await storage.get_state(KEY)
+        assert storage.misses == misses
+        # Bo'sh holat ham keshlanadi — holatsiz foydalanuvchi diskka bormaydi
+        await storage.get_state(OTHER)
+        await storage.get_state(OTHER)
+        assert storage.misses == misses + 1
+        # Tozalangan holat jadvaldan o'chadi
+        await storage.set_state(KEY, None)
+        await storage.set_data(KEY, {})
+        await storage.close()
+        rows = sqlite3.connect(str(tmp_path / "fsm.db")).execute("SELECT COUNT(*) FROM fsm_states").fetchone()
+        assert rows == (0,)
+
+    asyncio.run(run())
+
+
+def test_sqlite_read_during_flush(tmp_path):
+    async def run():
+        storage = _storage(tmp_path, cache_size=1)
+        await storage.set_state(KEY, Wizard.region)
+        await storage.set_state(OTHER, Wizard.phone)  # KEY keshdan chiqadi, faqat _dirty da
+        assert KEY_BUILDER.build(KEY) not in storage._cache
+
+        # Yozish commit qilinmasdan turib KEY o'qiladi — diskdagi eski (bo'sh) qator keshlanmasligi kerak
+        started, release = threading.Event(), threading.Event()
+        write_rows = storage._write_rows
+
+        def slow_write(rows):
+            started.set()
+            release.wait(5)
+            write_rows(rows)
+
+        storage._write_rows = slow_write
+        flush = asyncio.create_task(storage.flush())
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        assert await storage.get_state(KEY) == Wizard.region.state
+        release.set()
+        await flush
+        assert await storage.get_state(KEY) == Wizard.region.state
+        assert storage.stats()['pending'] == 0
+        await storage.close()
+
+    asyncio.run(run())
+
+
+def test_sqlite_ttl_cleanup(tmp_path):
+    async def run():
+        storage = _storage(tmp_path, ttl=60)
+        await storage.set_state(KEY, Wizard.region)
+        await storage.set_state(OTHER, Wizard.phone)
+        await storage.flush()
+        # KEY ikki soat oldin tashlab ketilgan
+        old = int(time.time()) - 7200
+        conn = sqlite3.connect(str(tmp_path / "fsm.db"))
+        conn.execute("UPDATE fsm_states SET updated_at = ? WHERE key = ?", (old, KEY_BUILDER.build(KEY)))
+        conn.commit()
+        storage._cache[KEY_BUILDER.build(KEY)].updated_at = old
+
+        assert await storage.cleanup() == 1
+        assert await storage.get_state(KEY) is None
+        assert await storage.get_state(OTHER) == Wizard.phone.state
+        await storage.close()
+
+    asyncio.run(run())
+
+
+def _redis_storage():
+    from aiogram.fsm.storage.redis import RedisStorage
+
+    try:
+        from fakeredis.aioredis import FakeRedis
+        return RedisStorage(FakeRedis(), key_builder=KEY_BUILDER, state_ttl=60, data_ttl=60)
+    except ImportError:
+        url = os.getenv("FSM_TEST_REDIS_URL")
+        if not url:
+            pytest.skip("fakeredis yoki FSM_TEST_REDIS_URL kerak")
+        return RedisStorage.from_url(url, key_builder=KEY_BUILDER, state_ttl=60, data_ttl=60)
+
+
+def test_redis_mode():
+    pytest.importorskip("redis")
+
+    async def run():
+        storage = _redis_storage()
+        try:
+            await storage.set_state(KEY, None)
+            await storage.set_data(KEY, {})
+            await _exercise(storage)
+        finally:
+            await storage.close()
+
+    asyncio.run(run())
@@ -0,0 +1,81 @@
+"""
+Auksion lotlari qidiruv indeksi (FTS5): o'zgarmagan lot qayta yozilmaydi,
+lekin faol bo'lib turgan lot AUKSION_INDEX_MAX_AGE dan keyin ham qidiruvda qoladi.
+
+Ishga tushirish:  python -m pytest tools/test_lot_index.py
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())  # database paketi objects.db ni joriy papkada yaratadi
+
+from database.auksion_store import AuksionStore  # noqa: E402
+from handlers.auksion_v2.models import Lot  # noqa: E402
+
+MAX_AGE = 7 * 24 * 3600
+
+
+def _lot(lot_id: int, name: str) -> Lot:
+    return Lot(
+        id=lot_id, name=name, lot_number=str(lot_id), start_price=1000, current_price=1000,
+        min_increment=0, status="Savdoga chiqarilgan", category="Kvartira",
+    )
+
+
+def _age_index(store: AuksionStore, lot_id: int, seconds: int):
+    """Lot indeksga `seconds` oldin yozilgandek ko'rsatish"""
+    old = int(time.time()) - seconds
+    with store.pool.connection() as conn:
+        conn.execute("UPDATE auksion_lots_fts SET indexed_at = ? WHERE rowid = ?", (old, lot_id))
+    signature, _ = store._indexed[lot_id]
+    store._indexed[lot_id] = (signature, old)
+
+
+def test_unchanged_lot_stays_searchable(tmp_path):
+    store = AuksionStore(str(tmp_path / "index.db"))
+    if not store.fts_enabled:
+        pytest.skip("SQLite FTS5 siz yig'ilgan")
+    try:
+        lot = _lot(1, "Chilonzor tumanidagi kvartira")
+        store.index_lots([lot], max_age=MAX_AGE)
+        store.flush()
+        assert [r["lot_id"] for r in store.search_lots("chilonzor", max_age=MAX_AGE)] == [1]
+
+        # Yaqinda indekslangan o'zgarmagan lot uchun hech narsa yozilmaydi
+        written = store.written
+        store.index_lots([lot], max_age=MAX_AGE)
+        store.flush()
+        assert store.written == written
+
+        # Oyna o'tgan: lot qidiruvdan tushadi, lekin upstreamda hali ko'rinib turibdi
+        _age_index(store, 1, MAX_AGE + 60)
+        assert store.search_lots("chilonzor", max_age=MAX_AGE) == []
+        store.index_lots([_lot(1, "Chilonzor tumanidagi kvartira")], max_age=MAX_AGE)
+        store.flush()
+        assert store.written == written + 1  # to'liq qator emas, faqat indexed_at
+        assert [r["lot_id"] for r in store.search_lots("chilonzor", max_age=MAX_AGE)] == [1]
+    finally:
+        store.close()
+
+
+def test_unseen_lot_expires(tmp_path):
+    store = AuksionStore(str(tmp_path / "index.db"))
+    if not store.fts_enabled:
+        pytest.skip("SQLite FTS5 siz yig'ilgan")
+    try:
+        store.index_lots([_lot(2, "Yunusobod hovli")], max_age=MAX_AGE)
+        store.flush()
+        _age_index(store, 2, MAX_AGE + 60)
+        assert store.search_lots("yunusobod", max_age=MAX_AGE) == []
+        store.prune_lot_index(max_age=MAX_AGE)
+        store.flush()
+        with store.pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM auksion_lots_fts").fetchone()[0] == 0
+    finally:
+        store.close()
@@ -0,0 +1,119 @@
+"""
+Issiq so'rovlar uchun EXPLAIN QUERY PLAN tekshiruvi.
+Agar so'rov to'liq jadval skaneriga (SCAN) yoki vaqtinchalik
+saralashga (TEMP B-TREE) qaytsa — test yiqiladi.
+
+Ishga tushirish:  python -m pytest tools/test_query_plans.py
+"""
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BAD_PLAN = re.compile(r"^SCAN \w+$|USE TEMP B-TREE")
+
+
+def _make_manager(tmp_dir):
+    os.chdir(tmp_dir)  # global `db` objects.db ni shu papkada yaratadi
+    from database.db_manager import DatabaseManager
+
+    manager = DatabaseManager(os.path.join(tmp_dir, "plans.db"))
+    for i in range(20):
+        row = {
+            'user_id': i % 3, 'full_name': 'Test', 'phone': '+998900000000',
+            'region': 'toshkent', 'district': 'Chilonzor', 'property_type': 'kvartira',
+            'action_type': 'sell', 'price': 1000 + i, 'monthly_price': 100 + i,
+        }
+        km_id = manager.add_kochmas_mulk(row)
+        ij_id = manager.add_ijara(dict(row, action_type='rent_out'))
+        manager.add_favorite(1, km_id, 'kochmas')
+        manager.add_favorite(1, ij_id, 'ijara')
+    return manager
+
+
+def _capture_queries(manager, call):
+    """Metod bajargan SQL so'rovlarini (qiymatlari bilan) yig'ish"""
+    queries = []
+    original = manager.get_connection
+
+    @contextmanager
+    def traced():
+        with original() as conn:
+            conn.set_trace_callback(queries.append)
+            try:
+                yield conn
+            finally:
+                conn.set_trace_callback(None)
+
+    manager.get_connection = traced
+    try:
+        call()
+    finally:
+        manager.get_connection = original
+    return [q for q in queries if q.lstrip().upper().startswith("SELECT")]
+
+
+def _plan(manager, sql):
+    conn = sqlite3.connect(manager.db_path)
+    try:
+        return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+    finally:
+        conn.close()
+
+
+_CURSOR = "spk6g0.a"  # 2025-01-05 10:00:00, id=10
+
+HOT_QUERIES = {
+    "kochmas_list": lambda m: m.get_kochmas_mulk_list(
+        region='toshkent', property_type='kvartira', action_type='sell', limit=50),
+    "kochmas_list_district": lambda m: m.get_kochmas_mulk_list(
+        region='toshkent', district='Chilonzor', property_type='kvartira', action_type='sell'),
+    "ijara_list": lambda m: m.get_ijara_list(
+        region='toshkent', property_type='kvartira', action_type='rent_out'),
+    "ijara_list_district": lambda m: m.get_ijara_list(
+        region='toshkent', district='Chilonzor', property_type='kvartira', action_type='rent_out'),
+    "user_kochmas": lambda m: m.get_user_kochmas_mulk(1),
+    "user_ijara": lambda m: m.get_user_ijara(1),
+    "all_kochmas": lambda m: m.get_all_kochmas(limit=100),
+    "all_ijara": lambda m: m.get_all_ijara(limit=100),
+    "favorites_kochmas": lambda m: m.get_user_favorites(1, 'kochmas'),
+    "favorites_ijara": lambda m: m.get_user_favorites(1, 'ijara'),
+    "is_favorite": lambda m: m.is_favorite(1, 1, 'kochmas'),
+    "kochmas_page": lambda m: m.get_kochmas_mulk_page(
+        region='toshkent', property_type='kvartira', action_type='sell', cursor=_CURSOR),
+    "kochmas_page_prev": lambda m: m.get_kochmas_mulk_page(
+        region='toshkent', district='Chilonzor', property_type='kvartira', action_type='sell',
+        cursor=_CURSOR, direction='prev'),
+    "ijara_page": lambda m: m.get_ijara_page(
+        region='toshkent', property_type='kvartira', action_type='rent_out', cursor=_CURSOR),
+    "all_kochmas_page": lambda m: m.get_all_kochmas_page(cursor=_CURSOR),
+    "all_ijara_page": lambda m: m.get_all_ijara_page(cursor=_CURSOR, direction='prev'),
+}
+
+
+def test_hot_queries_use_indexes():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cwd = os.getcwd()
+        try:
+            manager = _make_manager(tmp_dir)
+            failures = []
+            for name, call in HOT_QUERIES.items():
+                queries = _capture_queries(manager, lambda: call(manager))
+                assert queries, f"{name}: SELECT so'rovi topilmadi"
+                for sql in queries:
+                    for detail in _plan(manager, sql):
+                        if BAD_PLAN.search(detail):
+                            failures.append(f"{name}: {detail}\n    {sql.strip()}")
+            manager.close()
+        finally:
+            os.chdir(cwd)
+    assert not failures, "Indekssiz so'rovlar:\n" + "\n".join(failures)
+
+
+if __name__ == "__main__":
+    test_hot_queries_use_indexes()
+    print('done')